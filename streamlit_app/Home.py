@@ -70,7 +70,7 @@ with content_col:
     row4, row5, row6 = st.columns(3)
     row4.page_link("pages/Menu_Items_Trend.py", label="📈 Menu Items Trend")
     row5.page_link("pages/Network.py", label="🌐 Menu Item Network")
-    row6.page_link("pages/Optimization_by_Item.py", label="⚙️ Item Optimization")
+    row6.page_link("pages/Optimization_By_Item.py", label="⚙️ Item Optimization")
     
     # Third row: last link slightly to the right
     row_left, row_center, row_right = st.columns([1.5, 2, 1])
@@ -0,0 +1,188 @@
+# alerts.py — threshold alerts on the forecast/constraint table, evaluated in batch outside Streamlit
+import hashlib
+import json
+import os
+import smtplib
+import urllib.request
+from datetime import datetime
+from email.message import EmailMessage
+
+import numpy as np
+import pandas as pd
+
+from data_loaders import STATE_DIR, load_forecast_data, load_shipments, read_state, state_lock, write_state
+from safety_stock import reorder_table
+
+ALERT_STATE_PATH = STATE_DIR / "alert_state.json"
+ALERT_LOG_PATH = STATE_DIR / "alerts.log"
+
+# Each rule compares one column of the alert inputs (one row per ingredient) with a threshold
+RULES = [
+    {"name": "Shortfall", "column": "Worst Shortfall/Surplus", "op": "<", "threshold": 0.0, "severity": "critical"},
+    {"name": "Excess stock", "column": "Surplus Ratio", "op": ">", "threshold": 2.0, "severity": "warning"},
+    {"name": "Low days of cover", "column": "Cover vs Review Period", "op": "<", "threshold": 1.0, "severity": "warning"},
+]
+OPS = {"<": np.less, "<=": np.less_equal, ">": np.greater, ">=": np.greater_equal}
+
+INPUT_COLUMNS = ["Unit", "Worst Month", "Worst Shortfall/Surplus", "Surplus Ratio",
+                 "Days of Cover", "Review Period (days)", "Cover vs Review Period"]
+FORECAST_COLUMNS = {"ds", "ingredient", "yhat", "unit", "period", "supply", "shortfall"}
+
+
+# --- INPUTS ---
+def alert_inputs(forecast, shipments):
+    """
+    One row per ingredient with everything the rules look at: the worst forecast month's
+    shortfall/surplus, supply relative to the largest forecast month, and days of cover
+    relative to the days until the next delivery (from safety_stock.reorder_table).
+    A forecast without future months with supply (or without the constraint columns) has no inputs.
+    """
+    if not FORECAST_COLUMNS.issubset(forecast.columns):
+        return pd.DataFrame(columns=INPUT_COLUMNS)
+    future = forecast[(forecast["period"] == "Future Forecast") & forecast["supply"].notna()]
+    if future.empty:
+        return pd.DataFrame(columns=INPUT_COLUMNS)
+    worst = future.loc[future.groupby("ingredient")["shortfall"].idxmin(), ["ingredient", "ds", "shortfall", "unit"]]
+    worst = worst.set_index("ingredient")
+    peak = future.groupby("ingredient")["yhat"].max()
+    supply = future.groupby("ingredient")["supply"].first()
+
+    reorder = reorder_table(forecast, shipments).reindex(worst.index)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        inputs = pd.DataFrame({
+            "Unit": worst["unit"],
+            "Worst Month": worst["ds"].dt.strftime("%Y-%m"),
+            "Worst Shortfall/Surplus": worst["shortfall"],
+            "Surplus Ratio": supply / peak,
+            "Days of Cover": reorder["Days of Cover"],
+            "Review Period (days)": reorder["Review Period (days)"],
+            "Cover vs Review Period": reorder["Days of Cover"] / reorder["Review Period (days)"],
+        }, columns=INPUT_COLUMNS)
+    return inputs
+
+def fingerprints(inputs):
+    """Hash of each ingredient's input row, to tell which ingredients changed since the last run."""
+    return {name: hashlib.sha1(row.to_json().encode()).hexdigest() for name, row in inputs.iterrows()}
+
+
+# --- EVALUATION ---
+def evaluate_rules(inputs, rules=RULES):
+    """All rules against all given ingredients at once -> list of active alert dicts."""
+    alerts = []
+    for rule in rules:
+        values = inputs[rule["column"]].to_numpy(dtype=float)
+        hit = OPS[rule["op"]](values, rule["threshold"]) & ~np.isnan(values)
+        for name, value in zip(inputs.index[hit], values[hit]):
+            row = inputs.loc[name]
+            alerts.append({
+                "key": f"{rule['name']}|{name}",
+                "rule": rule["name"],
+                "severity": rule["severity"],
+                "ingredient": name,
+                "month": row["Worst Month"],
+                "value": round(float(value), 2),
+                "message": f"{rule['name']}: {name} ({rule['column']} = {value:,.2f}, threshold {rule['op']} {rule['threshold']}, "
+                           f"worst month {row['Worst Month']})",
+            })
+    return alerts
+
+def load_state(state_path=ALERT_STATE_PATH):
+    return read_state(state_path, {"fingerprints": {}, "active": {}})
+
+def run_alerts(sink, forecast=None, shipments=None, rules=RULES, state_path=ALERT_STATE_PATH):
+    """
+    Evaluates the rules for ingredients whose inputs changed since the last run and delivers
+    alerts that are not already active to `sink` (a callable taking a list of alert dicts).
+    An alert stays suppressed while its condition holds; once it clears it can fire again.
+    Returns (new alerts, number of ingredients evaluated).
+    """
+    forecast = load_forecast_data() if forecast is None else forecast
+    shipments = load_shipments() if shipments is None else shipments
+    inputs = alert_inputs(forecast, shipments)
+    current = fingerprints(inputs)
+
+    with state_lock(state_path):
+        state = load_state(state_path)
+        changed = [name for name, digest in current.items() if state["fingerprints"].get(name) != digest]
+        removed = set(state["fingerprints"]) - set(current)
+
+        # Active alerts of changed or removed ingredients are re-decided; the rest carry over
+        stale = set(changed) | removed
+        active = {k: a for k, a in state["active"].items() if a["ingredient"] not in stale}
+        new = []
+        for alert in evaluate_rules(inputs.loc[changed], rules):
+            if alert["key"] not in state["active"]:
+                alert["raised_at"] = datetime.now().isoformat(timespec="seconds")
+                new.append(alert)
+                active[alert["key"]] = alert
+            else:
+                active[alert["key"]] = state["active"][alert["key"]]
+
+        if new:
+            sink(new)
+        write_state(state_path, {"fingerprints": current, "active": active})
+    return new, len(changed)
+
+
+# --- SINKS ---
+def file_sink(path=ALERT_LOG_PATH):
+    """Appends each alert as one JSON line."""
+    def send(alerts):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            for alert in alerts:
+                f.write(json.dumps(alert) + "\n")
+    return send
+
+def smtp_sink(host="localhost", port=1025, sender="alerts@localhost", recipients=("manager@localhost",)):
+    """One email per run, e.g. to a local debugging server: python -m aiosmtpd -n -l localhost:1025"""
+    def send(alerts):
+        msg = EmailMessage()
+        msg["Subject"] = f"[Inventory] {len(alerts)} new alert(s)"
+        msg["From"] = sender
+        msg["To"] = ", ".join(recipients)
+        msg.set_content("\n".join(f"[{a['severity'].upper()}] {a['message']}" for a in alerts))
+        with smtplib.SMTP(host, port, timeout=10) as smtp:
+            smtp.send_message(msg)
+    return send
+
+def webhook_sink(url):
+    """POSTs {"alerts": [...]} as JSON."""
+    def send(alerts):
+        request = urllib.request.Request(url, data=json.dumps({"alerts": alerts}).encode(),
+                                         headers={"Content-Type": "application/json"}, method="POST")
+        with urllib.request.urlopen(request, timeout=10) as response:
+            response.read()
+    return send
+
+def print_sink(alerts):
+    for a in alerts:
+        print(f"[{a['severity'].upper()}] {a['message']}")
+
+
+if __name__ == "__main__":
+    # python alerts.py [--sink file|smtp|webhook|print] [--target PATH|HOST:PORT|URL]  (from streamlit_app/, e.g. from cron)
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Evaluate inventory alert rules and deliver new alerts.")
+    parser.add_argument("--sink", choices=["file", "smtp", "webhook", "print"], default="file")
+    parser.add_argument("--target", default=None)
+    parser.add_argument("--reset", action="store_true", help="forget previous runs and re-raise every active alert")
+    args = parser.parse_args()
+
+    if args.reset and os.path.exists(ALERT_STATE_PATH):
+        os.remove(ALERT_STATE_PATH)
+    if args.sink == "file":
+        sink = file_sink(args.target or ALERT_LOG_PATH)
+    elif args.sink == "smtp":
+        host, _, port = (args.target or "localhost:1025").partition(":")
+        sink = smtp_sink(host, int(port or 1025))
+    elif args.sink == "webhook":
+        if not args.target:
+            parser.error("--sink webhook needs --target URL")
+        sink = webhook_sink(args.target)
+    else:
+        sink = print_sink
+
+    new, evaluated = run_alerts(sink)
+    print(f"Evaluated {evaluated} ingredient(s); {len(new)} new alert(s) sent via {args.sink}.")
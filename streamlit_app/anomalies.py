@@ -0,0 +1,164 @@
+# anomalies.py — streaming anomaly detection on item and ingredient series with rolling Welford statistics
+import os
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from data_loaders import STATE_DIR, data_version, load_monthly_sales, read_state, state_lock, write_state
+from pages.Predictive_Analysis.forecast_models import month_start_dates
+from recipes import ingredient_usage
+
+ANOMALY_STATE_PATH = STATE_DIR / "anomaly_state.pkl"
+
+WINDOW = 6          # observations in each series' rolling baseline
+MIN_OBS = 4         # a series is scored once its baseline has this many observations
+Z_THRESHOLD = 3.0   # |value - rolling mean| / rolling std that counts as unusual
+
+FLAG_COLUMNS = ["Level", "Series", "Period", "Value", "Expected", "Z", "Direction"]
+
+
+def period_key(label):
+    """
+    pd.Period for a column label. 'YYYY-MM' and 'YYYY-MM-DD' keep their year; bare month names
+    from the Data_Matrix workbooks ('May') fall in forecast_models.HISTORY_YEAR. Keying on the
+    year means next year's May is a new period, not one already seen.
+    """
+    if isinstance(label, pd.Period):
+        return label
+    text = str(label)
+    if text[:4].isdigit():
+        return pd.Period(text, freq="D" if len(text) > 7 else "M")
+    return month_start_dates([text])[0].to_period("M")
+
+def new_detector(window=WINDOW):
+    """Empty detector: per-series rolling count, mean and M2 plus a ring buffer of the window; periods seen as pd.Period."""
+    return {
+        "series": [], "index": {}, "periods": set(),
+        "seen": np.zeros(0, dtype=int), "mean": np.zeros(0), "m2": np.zeros(0),
+        "ring": np.zeros((0, window)), "window": window,
+    }
+
+def _series_index(detector, names):
+    new = [n for n in dict.fromkeys(names) if n not in detector["index"]]
+    if new:
+        for n in new:
+            detector["index"][n] = len(detector["series"])
+            detector["series"].append(n)
+        k = len(new)
+        detector["seen"] = np.concatenate([detector["seen"], np.zeros(k, dtype=int)])
+        detector["mean"] = np.concatenate([detector["mean"], np.zeros(k)])
+        detector["m2"] = np.concatenate([detector["m2"], np.zeros(k)])
+        detector["ring"] = np.vstack([detector["ring"], np.zeros((k, detector["window"]))])
+    return np.array([detector["index"][n] for n in names], dtype=int)
+
+def observe(detector, period, values, level="", z_threshold=Z_THRESHOLD, min_obs=MIN_OBS):
+    """
+    Scores one period of observations (a Series indexed by series name) against each
+    series' rolling baseline, then folds them into it. Work is O(1) per series:
+
+        growing window:  n += 1; mean += d / n; M2 += d * (x - mean)            (Welford)
+        full window:     mean += (x - old) / W; M2 += (x - old) * (x - mean' + old - mean)
+
+    where `old` is the observation leaving the window. NaN observations are skipped.
+    Returns the flagged observations as a frame with FLAG_COLUMNS (Period as 'YYYY-MM' text).
+    """
+    period = period_key(period)
+    values = values.dropna()
+    idx = _series_index(detector, list(values.index))
+    x = values.to_numpy(dtype=float)
+    window = detector["window"]
+
+    seen, mean, m2 = detector["seen"][idx], detector["mean"][idx], detector["m2"][idx]
+    n = np.minimum(seen, window)
+
+    # Score against the baseline before this observation
+    with np.errstate(invalid="ignore", divide="ignore"):
+        std = np.sqrt(np.where(n > 1, m2 / (n - 1), np.nan))
+        z = np.where((n >= min_obs) & (std > 0), (x - mean) / std, 0.0)
+    flagged = np.abs(z) > z_threshold
+
+    # Fold the observation into the rolling statistics
+    pos = seen % window
+    full = seen >= window
+    old = detector["ring"][idx, pos]
+    grow_n = n + 1
+    grow_mean = mean + (x - mean) / grow_n
+    grow_m2 = m2 + (x - mean) * (x - grow_mean)
+    slide_mean = mean + (x - old) / window
+    slide_m2 = m2 + (x - old) * (x - slide_mean + old - mean)
+
+    detector["mean"][idx] = np.where(full, slide_mean, grow_mean)
+    detector["m2"][idx] = np.maximum(np.where(full, slide_m2, grow_m2), 0.0)
+    detector["ring"][idx, pos] = x
+    detector["seen"][idx] = seen + 1
+    detector["periods"].add(period)
+
+    return pd.DataFrame({
+        "Level": level,
+        "Series": values.index[flagged],
+        "Period": str(period),
+        "Value": x[flagged],
+        "Expected": mean[flagged],
+        "Z": z[flagged],
+        "Direction": np.where(z[flagged] > 0, "Spike", "Drop"),
+    }, columns=FLAG_COLUMNS)
+
+def feed(detector, frame, level=""):
+    """Observes every column (period) of a series x periods frame the detector has not seen yet, oldest first."""
+    periods = sorted((period_key(c), c) for c in frame.columns)
+    flags = [observe(detector, key, frame[column], level) for key, column in periods if key not in detector["periods"]]
+    return pd.concat(flags, ignore_index=True) if flags else pd.DataFrame(columns=FLAG_COLUMNS)
+
+def load_state(state_path=ANOMALY_STATE_PATH):
+    state = read_state(state_path, {"detectors": {}, "flags": pd.DataFrame(columns=FLAG_COLUMNS)})
+    for detector in state["detectors"].values():
+        detector["periods"] = {period_key(p) for p in detector["periods"]}  # state saved with bare month names
+    return state
+
+def update_anomalies(series_by_level, state_path=ANOMALY_STATE_PATH):
+    """
+    Feeds the new periods of each {level: series x periods frame} into the stored detectors
+    and persists them. Returns every flag raised so far.
+    """
+    with state_lock(state_path):
+        state = load_state(state_path)
+        new_flags = [feed(state["detectors"].setdefault(level, new_detector()), frame, level)
+                     for level, frame in series_by_level.items()]
+        state["flags"] = pd.concat([state["flags"], *[f for f in new_flags if not f.empty]], ignore_index=True)
+        write_state(state_path, state)
+    return state["flags"]
+
+def monthly_series():
+    """{level: series x months frame} for item sales and ingredient usage, read from the workbooks now; {} when none parse."""
+    sales = load_monthly_sales.__wrapped__()
+    return {} if sales is None else {"Item": sales, "Ingredient": ingredient_usage(sales, version=data_version())}
+
+@st.cache_data(show_spinner=False)
+def load_anomalies(version=None):
+    """
+    Flags for monthly item sales and ingredient usage. Pass data_version() as version: each new
+    version hands the workbooks to update_anomalies(), which scores only the periods not seen before.
+    """
+    return update_anomalies(monthly_series())
+
+
+if __name__ == "__main__":
+    # python anomalies.py [--reset] [--daily]  (from streamlit_app/)
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Score new periods for unusual item and ingredient usage.")
+    parser.add_argument("--reset", action="store_true", help="forget stored state and rescore all history")
+    parser.add_argument("--daily", action="store_true", help="also score daily item sales from the sales store")
+    args = parser.parse_args()
+
+    if args.reset and os.path.exists(ANOMALY_STATE_PATH):
+        os.remove(ANOMALY_STATE_PATH)
+    series = monthly_series()
+    if args.daily:
+        from sales_store import aggregate_sales
+        daily = aggregate_sales("D")
+        if not daily.empty:
+            series["Item (daily)"] = daily.rename(columns=str)
+    flags = update_anomalies(series)
+    print(flags.round(2).to_string(index=False) if not flags.empty else "No anomalies flagged.")
@@ -0,0 +1,187 @@
+# api.py — read-only HTTP API (JSON or Arrow IPC) over the aggregates the pages show, with ETags per data version
+import hashlib
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlparse
+
+import pandas as pd
+
+import data_loaders as dl
+from recipes import ingredient_usage
+from safety_stock import reorder_table
+from sales_store import store_version
+
+DEFAULT_LIMIT = 1000
+MAX_LIMIT = 50000
+ARROW_MIME = "application/vnd.apache.arrow.stream"
+
+
+# --- DATASETS ---
+# Each builder reads the input files itself: sales through the undecorated loaders, passed down
+# explicitly, and the recipe matrix keyed on the data version. The API keeps its own cache keyed
+# on that version, so changed input files are picked up without restarting it.
+def _ingredient_usage():
+    usage = ingredient_usage(dl.load_monthly_sales.__wrapped__(), version=dl.data_version())
+    return usage.rename_axis("Ingredient").reset_index().melt("Ingredient", var_name="Month", value_name="Usage")
+
+def _monthly_income(loader):
+    months = dl.discover_month_files()
+    return pd.concat([loader.__wrapped__(path, month) for month, path in months.items()], ignore_index=True)
+
+def _forecast():
+    return dl.load_forecast_data.__wrapped__()
+
+def _shortfalls():
+    forecast = dl.load_forecast_data.__wrapped__()
+    future = forecast[forecast["period"] == "Future Forecast"]
+    return future[["ds", "ingredient", "unit", "yhat", "yhat_lower", "yhat_upper", "supply", "shortfall"]].reset_index(drop=True)
+
+def _reorder():
+    return reorder_table(dl.load_forecast_data.__wrapped__(), dl.load_shipments.__wrapped__()).reset_index()
+
+DATASETS = {
+    "ingredient-usage": _ingredient_usage,
+    "ingredient-totals": lambda: dl.ingredient_totals(dl.load_monthly_sales.__wrapped__(), version=dl.data_version())
+                                   .rename_axis("Ingredient").reset_index(),
+    "item-sales": lambda: dl.load_monthly_sales.__wrapped__().rename_axis("Item Name").reset_index(),
+    "category-income": lambda: _monthly_income(dl.load_data2_for_month),
+    "group-income": lambda: _monthly_income(dl.load_data1_for_month),
+    "forecast": _forecast,
+    "shortfalls": _shortfalls,
+    "reorder-points": _reorder,
+}
+
+
+# --- VERSIONS & CACHE ---
+def data_version():
+    """Input files (data_loaders.data_version) plus the daily sales partitions."""
+    return hashlib.sha1(f"{dl.data_version()}|{store_version()}".encode()).hexdigest()[:12]
+
+_frames = {}
+_frames_lock = threading.Lock()
+
+def dataset(name, version):
+    """The dataset's frame for this data version; computed once per version, older versions dropped."""
+    with _frames_lock:
+        cached = _frames.get(name)
+        if cached and cached[0] == version:
+            return cached[1]
+    frame = DATASETS[name]()
+    with _frames_lock:
+        _frames[name] = (version, frame)
+    return frame
+
+def etag(*parts):
+    return '"' + hashlib.sha1("|".join(map(str, parts)).encode()).hexdigest()[:20] + '"'
+
+
+# --- RESPONSES ---
+def to_json(frame):
+    return json.loads(frame.to_json(orient="records", date_format="iso"))
+
+def to_arrow(frame):
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+class Handler(BaseHTTPRequestHandler):
+    """
+    GET /                         -> datasets and the current data version
+    GET /datasets/<name>          -> one page of a dataset: ?offset=0&limit=1000[&format=arrow]
+    Arrow IPC is returned for format=arrow or Accept: application/vnd.apache.arrow.stream.
+    Every response carries an ETag; a matching If-None-Match gets 304 without recomputation.
+    """
+    server_version = "MSYDataAPI/1.0"
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        version = data_version()
+        try:
+            if url.path in ("", "/"):
+                self._index(version)
+            elif url.path.startswith("/datasets/"):
+                self._dataset(url.path.removeprefix("/datasets/"), query, version)
+            else:
+                self._send_json(404, {"error": f"Unknown path {url.path}"})
+        except Exception as e:
+            self._send_json(500, {"error": f"{type(e).__name__}: {e}"})
+
+    def _index(self, version):
+        tag = etag("index", version)
+        if self._not_modified(tag):
+            return
+        self._send_json(200, {"version": version, "datasets": {name: f"/datasets/{name}" for name in DATASETS}}, tag)
+
+    def _dataset(self, name, query, version):
+        if name not in DATASETS:
+            return self._send_json(404, {"error": f"Unknown dataset {name!r}", "datasets": list(DATASETS)})
+        try:
+            offset = max(int(query.get("offset", 0)), 0)
+            limit = min(max(int(query.get("limit", DEFAULT_LIMIT)), 1), MAX_LIMIT)
+        except ValueError:
+            return self._send_json(400, {"error": "offset and limit must be integers"})
+        arrow = query.get("format") == "arrow" or ARROW_MIME in self.headers.get("Accept", "")
+
+        tag = etag(name, version, offset, limit, "arrow" if arrow else "json")
+        if self._not_modified(tag):
+            return
+        frame = dataset(name, version)
+        page = frame.iloc[offset:offset + limit]
+        following = offset + limit if offset + limit < len(frame) else None
+        next_url = f"/datasets/{name}?{urlencode({**query, 'offset': following, 'limit': limit})}" if following is not None else None
+        headers = {"X-Total-Count": len(frame), "X-Data-Version": version}
+        if next_url:
+            headers["Link"] = f'<{next_url}>; rel="next"'
+
+        if arrow:
+            self._send(200, to_arrow(page), ARROW_MIME, tag, headers)
+        else:
+            self._send_json(200, {
+                "dataset": name, "version": version, "total": len(frame), "offset": offset, "limit": limit,
+                "next": next_url, "columns": list(page.columns), "data": to_json(page),
+            }, tag, headers)
+
+    def _not_modified(self, tag):
+        if tag in [t.strip() for t in self.headers.get("If-None-Match", "").split(",")]:
+            self._send(304, b"", None, tag)
+            return True
+        return False
+
+    def _send_json(self, status, payload, tag=None, headers=None):
+        self._send(status, json.dumps(payload).encode(), "application/json", tag, headers)
+
+    def _send(self, status, body, content_type, tag=None, headers=None):
+        self.send_response(status)
+        if content_type:
+            self.send_header("Content-Type", content_type)
+        if tag:
+            self.send_header("ETag", tag)
+            self.send_header("Cache-Control", "no-cache")  # clients revalidate with If-None-Match
+        for key, value in (headers or {}).items():
+            self.send_header(key, str(value))
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+def serve(host="127.0.0.1", port=8600):
+    server = ThreadingHTTPServer((host, port), Handler)
+    print(f"Serving {', '.join(DATASETS)} on http://{host}:{port}/")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    # python api.py [--host 0.0.0.0] [--port 8600]  (from streamlit_app/)
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Read-only JSON/Arrow API over the dashboard aggregates.")
+    parser.add_argument("--host", default=os.environ.get("MSY_API_HOST", "127.0.0.1"))
+    parser.add_argument("--port", type=int, default=int(os.environ.get("MSY_API_PORT", 8600)))
+    args = parser.parse_args()
+    serve(args.host, args.port)
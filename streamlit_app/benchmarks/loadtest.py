@@ -0,0 +1,326 @@
+# benchmarks/loadtest.py — N concurrent manager sessions against a real `streamlit run` server over its websocket
+import argparse
+import asyncio
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ClientState_pb2 import ClientState
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState, WidgetStates
+from websockets.asyncio.client import connect
+
+from cache_memory import rss_mb
+
+APP_DIR = Path(__file__).resolve().parent.parent
+
+# A manager's Monday-morning route through the app
+PAGES = [
+    "Home.py",
+    "pages/Shipment_Dashboard.py",
+    "pages/Monthly_Category_Income.py",
+    "pages/Menu_Items_Trend.py",
+    "pages/Ingredient_Insights.py",
+    "pages/Optimization_By_Item.py",
+    "pages/Network.py",
+    "pages/Forecasting_Ingredient_Analysis.py",
+]
+
+SERVER_START_TIMEOUT = 60  # seconds to wait for /_stcore/health
+PAGE_TIMEOUT = 300         # seconds one script run may take
+SAMPLE_INTERVAL = 0.05     # seconds between memory samples
+
+# Page -> widget changes a manager makes there, each followed by a rerun:
+# (widget kind, label prefix, value) with value None for a random valid one.
+# The Gemini chat on Home is left out so a load test never calls the external API.
+ACTIONS = {
+    "pages/Shipment_Dashboard.py": [
+        ("selectbox", "frequency", None),
+        ("selectbox", "Sort by", "Lowest Monthly Total"),
+        ("slider", "Show top N", None),
+        ("slider", "Days to simulate", None),
+        ("multiselect", "Ingredients", None),
+    ],
+    "pages/Monthly_Category_Income.py": [
+        ("select_slider", "Month Range", None),
+        ("multiselect", "Months", None),
+        ("checkbox", "Use all categories", False),
+        ("multiselect", "Categories", None),
+    ],
+    "pages/Menu_Items_Trend.py": [
+        ("slider", "Number of top items", None),
+        ("selectbox", "Granularity", None),
+    ],
+    "pages/Ingredient_Insights.py": [
+        ("selectbox", "Select ingredient", None),
+        ("selectbox", "Select ingredient", None),
+    ],
+    "pages/Optimization_By_Item.py": [
+        ("selectbox", "Select month", None),
+        ("selectbox", "Choose Optimization Type", "Ingredient Optimization"),
+        ("selectbox", "Select month", None),
+    ],
+    "pages/Forecasting_Ingredient_Analysis.py": [
+        ("selectbox", "Select Ingredient", None),
+        ("slider", "Target service level", None),
+        ("multiselect", "Ingredients to overlay", None),
+    ],
+}
+
+
+# --- SERVER ---
+def free_port():
+    with socket.socket() as s:
+        s.bind(("localhost", 0))
+        return s.getsockname()[1]
+
+def start_server(port, timeout=SERVER_START_TIMEOUT):
+    """`streamlit run Home.py` headless on `port`; returns the process once /_stcore/health answers."""
+    server = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", "Home.py", "--server.headless=true", f"--server.port={port}",
+         "--server.fileWatcherType=none", "--browser.gatherUsageStats=false", "--logger.level=error"],
+        cwd=APP_DIR,
+    )
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"streamlit run exited with code {server.returncode}")
+        try:
+            with urllib.request.urlopen(f"http://localhost:{port}/_stcore/health", timeout=1) as response:
+                if response.status == 200:
+                    return server
+        except OSError:
+            time.sleep(0.2)
+    server.terminate()
+    raise TimeoutError(f"Server on port {port} did not answer within {timeout}s")
+
+def stop_server(server):
+    server.terminate()
+    try:
+        server.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        server.kill()
+
+
+# --- MEMORY ---
+class MemorySampler(threading.Thread):
+    """Samples the RSS of process `pid` every `interval` seconds until stopped -> array of MB."""
+
+    def __init__(self, pid, interval=SAMPLE_INTERVAL):
+        super().__init__(name="memory-sampler", daemon=True)
+        self.pid = pid
+        self.interval = interval
+        self.samples = []
+        self._done = threading.Event()
+
+    def run(self):
+        while not self._done.is_set():
+            self.samples.append(rss_mb(self.pid))
+            self._done.wait(self.interval)
+
+    def stop(self):
+        self._done.set()
+        self.join()
+        return np.array(self.samples)
+
+
+# --- SESSIONS ---
+WIDGET_KINDS = ("selectbox", "slider", "multiselect", "checkbox")
+
+def _widget_kind(element):
+    kind = element.WhichOneof("type")
+    if kind == "slider" and element.slider.options:
+        return "select_slider"
+    return kind if kind in WIDGET_KINDS else None
+
+class Session:
+    """
+    One browser tab: the same websocket messages the frontend sends (BackMsg.rerun_script with
+    the page and every widget value) and the ForwardMsgs it reads back until the run finishes.
+    """
+
+    def __init__(self, websocket):
+        self.websocket = websocket
+        self.pages = {}    # file stem -> page_script_hash
+        self.page_hash = ""
+        self.widgets = {}  # id -> (kind, proto) of the last run
+        self.states = {}   # id -> WidgetState set on this page
+
+    async def run(self, timeout=PAGE_TIMEOUT):
+        """Reruns the current page with the current widget values -> list of exception messages."""
+        live = [self.states[i] for i in self.widgets if i in self.states]
+        msg = BackMsg(rerun_script=ClientState(page_script_hash=self.page_hash, widget_states=WidgetStates(widgets=live)))
+        await self.websocket.send(msg.SerializeToString())
+        self.widgets, errors = {}, []
+        async with asyncio.timeout(timeout):
+            while True:
+                fwd = ForwardMsg()
+                fwd.ParseFromString(await self.websocket.recv())
+                kind = fwd.WhichOneof("type")
+                if kind == "new_session":
+                    self._read_pages(fwd.new_session.app_pages)
+                elif kind == "navigation":
+                    self._read_pages(fwd.navigation.app_pages)
+                elif kind == "delta" and fwd.delta.WhichOneof("type") == "new_element":
+                    element = fwd.delta.new_element
+                    if element.WhichOneof("type") == "exception":
+                        errors.append(element.exception.message)
+                    elif _widget_kind(element):
+                        proto = getattr(element, element.WhichOneof("type"))
+                        self.widgets[proto.id] = (_widget_kind(element), proto)
+                elif kind == "script_finished" and fwd.script_finished != ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                    if fwd.script_finished == ForwardMsg.FINISHED_WITH_COMPILE_ERROR:
+                        errors.append("compile error")
+                    return errors
+
+    def _read_pages(self, app_pages):
+        for page in app_pages:
+            self.pages[page.url_pathname or "Home"] = page.page_script_hash
+            self.pages[page.page_name.replace(" ", "_")] = page.page_script_hash
+
+    def switch_page(self, page):
+        stem = Path(page).stem
+        if stem not in self.pages:
+            raise LookupError(f"No page {stem!r} in the app")
+        self.page_hash = self.pages[stem]
+        self.states = {}
+
+    def change(self, kind, label, value, rng):
+        """Sets the first `kind` widget whose label starts with `label` to `value` (random valid one when None)."""
+        for widget_id, (k, proto) in self.widgets.items():
+            if k == kind and proto.label.replace("*", "").startswith(label):
+                self.states[widget_id] = _widget_state(widget_id, kind, proto, value, rng)
+                return
+        raise LookupError(f"No {kind} labelled {label!r}")
+
+def _widget_state(widget_id, kind, proto, value, rng):
+    if kind == "selectbox":
+        return WidgetState(id=widget_id, string_value=value if value is not None else str(rng.choice(list(proto.options))))
+    if kind == "multiselect":
+        options = list(proto.options)
+        picked = value if value is not None else list(rng.choice(options, size=min(3, len(options)), replace=False))
+        state = WidgetState(id=widget_id)
+        state.string_array_value.data.extend(picked)
+        return state
+    if kind == "select_slider":
+        options = list(proto.options)
+        picked = value if value is not None else [options[i] for i in sorted(rng.choice(len(options), size=min(2, len(options)), replace=False))]
+        state = WidgetState(id=widget_id)
+        state.string_array_value.data.extend(picked)
+        return state
+    if kind == "slider":
+        steps = np.arange(proto.min, proto.max + proto.step / 2, proto.step)
+        picked = value if value is not None else sorted(rng.choice(steps, size=len(proto.default), replace=False))
+        state = WidgetState(id=widget_id)
+        state.double_array_value.data.extend(float(v) for v in np.atleast_1d(picked))
+        return state
+    return WidgetState(id=widget_id, bool_value=bool(value))
+
+async def run_session(url, session, pages=PAGES, think=0.5, seed=0, start_delay=0.0):
+    """
+    One manager in one tab: lands on Home, then switches to each page and makes that page's
+    widget changes one at a time, with a random pause before each.
+    Returns a record per script run: session, page, step, seconds, error.
+    """
+    rng = np.random.default_rng(seed + session)
+    records = []
+    await asyncio.sleep(start_delay)
+
+    async with connect(url, subprotocols=["streamlit"], max_size=None, open_timeout=PAGE_TIMEOUT) as websocket:
+        tab = Session(websocket)
+
+        async def timed_run(page, step):
+            start = time.perf_counter()
+            errors = await tab.run()
+            error = "; ".join(e.splitlines()[0] for e in errors) or None
+            records.append({"session": session, "page": page, "step": step, "seconds": time.perf_counter() - start, "error": error})
+            return error
+
+        await timed_run(PAGES[0], "open")
+        for page in pages:
+            try:
+                if page != PAGES[0]:
+                    tab.switch_page(page)
+                    if await timed_run(page, "open"):
+                        continue
+                for step, (kind, label, value) in enumerate(ACTIONS.get(page, []), 1):
+                    await asyncio.sleep(rng.uniform(0, 2 * think))
+                    tab.change(kind, label, value, rng)
+                    if await timed_run(page, f"change {step}"):
+                        break
+            except (LookupError, ValueError) as e:
+                records.append({"session": session, "page": page, "step": "widget", "seconds": np.nan,
+                                "error": f"{type(e).__name__}: {e}"})
+    return records
+
+async def _run_sessions(url, n_sessions, pages, think, ramp_up, seed):
+    runs = await asyncio.gather(*[
+        run_session(url, i, pages, think, seed, ramp_up * i / max(n_sessions, 1)) for i in range(n_sessions)])
+    return [r for rs in runs for r in rs]
+
+def run_load_test(port, n_sessions=8, pages=PAGES, think=0.5, ramp_up=2.0, seed=0):
+    """
+    Runs `n_sessions` managers concurrently against the server on `port`, with session starts
+    spread over `ramp_up` seconds. Returns the runs frame.
+    """
+    url = f"ws://localhost:{port}/_stcore/stream"
+    return pd.DataFrame(asyncio.run(_run_sessions(url, n_sessions, pages, think, ramp_up, seed)))
+
+def summarize(runs):
+    """Per page: runs, errors and p50/p95/p99 rerun latency."""
+    rows = []
+    for page, group in runs.groupby("page", sort=False):
+        ok = group.loc[group["error"].isna(), "seconds"].to_numpy()
+        p50, p95, p99 = np.percentile(ok, [50, 95, 99]) if len(ok) else (np.nan,) * 3
+        rows.append({
+            "Page": Path(page).stem,
+            "Runs": len(group),
+            "Errors": int(group["error"].notna().sum()),
+            "p50 (s)": p50, "p95 (s)": p95, "p99 (s)": p99,
+        })
+    return pd.DataFrame(rows).set_index("Page")
+
+
+if __name__ == "__main__":
+    # From streamlit_app/: python -m benchmarks.loadtest --sessions 20 [--cold] [--port 8501]
+    parser = argparse.ArgumentParser(description="Concurrent browser sessions against a real streamlit server.")
+    parser.add_argument("--sessions", type=int, default=8)
+    parser.add_argument("--think", type=float, default=0.5, help="mean pause between widget changes (s)")
+    parser.add_argument("--ramp-up", type=float, default=2.0, help="seconds over which sessions start")
+    parser.add_argument("--pages", nargs="*", default=None, help="page file names (default: the full route)")
+    parser.add_argument("--port", type=int, default=None, help="server port (default: a free one)")
+    parser.add_argument("--cold", action="store_true", help="skip the priming session so the first sessions fill the caches")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    pages = [p for p in PAGES if args.pages is None or Path(p).stem in args.pages or p in args.pages]
+    port = args.port or free_port()
+    server = start_server(port)
+    try:
+        if not args.cold:
+            run_load_test(port, 1, PAGES, think=0, ramp_up=0, seed=args.seed)
+        start_mb = rss_mb(server.pid)
+        sampler = MemorySampler(server.pid)
+        sampler.start()
+        runs = run_load_test(port, args.sessions, pages, args.think, args.ramp_up, args.seed)
+        samples = sampler.stop()
+        end_mb = rss_mb(server.pid)
+    finally:
+        stop_server(server)
+
+    print(f"{args.sessions} sessions, {len(runs)} script runs")
+    print(f"Server RSS: before {start_mb:.0f} MB, peak {samples.max():.0f} MB, after {end_mb:.0f} MB\n")
+    print(summarize(runs).round(3).to_string())
+
+    errors = runs[runs["error"].notna()]
+    if not errors.empty:
+        print("\nErrors:")
+        print(errors.drop_duplicates(["page", "error"])[["page", "step", "error"]].to_string(index=False))
+        sys.exit(1)
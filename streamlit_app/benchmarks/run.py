@@ -0,0 +1,159 @@
+# benchmarks/run.py — times the loaders and transforms on synthetic data and fails on regressions
+import argparse
+import contextlib
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import streamlit as st
+
+import data_loaders as dl
+from benchmarks.synthetic_data import generate_dataset
+
+BASELINE_PATH = Path(__file__).parent / "baseline.json"
+
+# A benchmark fails when it is this much slower than the baseline at the same scale...
+REGRESSION_TOLERANCE = 0.5
+# ...or when its time grows faster than items ** MAX_SCALING_EXPONENT across the scales run
+MAX_SCALING_EXPONENT = 1.3
+
+
+@contextlib.contextmanager
+def _cwd(path):
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+def _month_files(data_dir):
+    """MONTH_FILES for a synthetic folder (item sheet is 'data 2' in October, 'data 3' otherwise)."""
+    return tuple((str(path), "data 2" if month == "October" else "data 3", month)
+                 for month, path in dl.discover_month_files(data_dir).items())
+
+def _run_forecasting(root):
+    from pages.Predictive_Analysis.forecasting_w_shipment import run_forecasting_with_shipments
+
+    # It reads cleaned_item_sales.csv and data/*.csv relative to the working directory
+    with _cwd(root):
+        run_forecasting_with_shipments()
+
+def _aggregate_stores(data_dir):
+    import stores
+
+    stores.aggregate_all_stores(stores.discover_stores(data_dir / "stores"))
+
+def benchmarks(root, data_dir):
+    """
+    Name -> zero-argument callable. Cached loaders run undecorated; the cached calls nested
+    inside them (monthly sales, recipe matrix, item matching) are cleared by time_call before
+    every run, so every repeat does the work.
+    """
+    recipes = data_dir / dl.INGREDIENTS_PATH.name
+    month_paths = dl.discover_month_files(data_dir)
+    suite = {
+        "load_ingredient_totals": lambda: dl.load_ingredient_totals.__wrapped__(data_dir, recipes),
+        "load_monthly_sales": lambda: dl.load_monthly_sales.__wrapped__(data_dir),
+        "load_ingredient_data": lambda: dl.load_ingredient_data.__wrapped__(_month_files(data_dir), recipes),
+        "load_data1_for_month": lambda: [dl.load_data1_for_month.__wrapped__(p, m) for m, p in month_paths.items()],
+        "load_data2_for_month": lambda: [dl.load_data2_for_month.__wrapped__(p, m) for m, p in month_paths.items()],
+        "run_forecasting_with_shipments": lambda: _run_forecasting(root),
+    }
+    if (data_dir / "stores").exists():
+        suite["aggregate_all_stores"] = lambda: _aggregate_stores(data_dir)
+    return suite
+
+def time_call(func, repeat, setup=st.cache_data.clear):
+    """Best of `repeat` wall-clock runs, in seconds; `setup` runs untimed before each one."""
+    best = np.inf
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def run_suite(item_scales, n_months=6, n_ingredients=18, n_stores=1, repeat=3, only=None, skip=()):
+    """
+    Generates one synthetic dataset per item count and times every benchmark on it.
+    Returns {benchmark: {n_items: seconds}}; a benchmark that raises is recorded as its error.
+    """
+    results = {}
+    for n_items in item_scales:
+        with tempfile.TemporaryDirectory(prefix="msy_bench_") as root:
+            data_dir = generate_dataset(root, n_months, n_items, n_ingredients, n_stores)
+            for name, func in benchmarks(Path(root), data_dir).items():
+                if (only and name not in only) or name in skip:
+                    continue
+                try:
+                    seconds = time_call(func, 1 if name == "run_forecasting_with_shipments" else repeat)
+                except Exception as e:
+                    seconds = f"{type(e).__name__}: {e}"
+                results.setdefault(name, {})[n_items] = seconds
+                print(f"  {name:<32} items={n_items:<6} {seconds if isinstance(seconds, str) else f'{seconds:8.3f}s'}", flush=True)
+    return results
+
+def scaling_exponent(timings):
+    """Slope of log(seconds) against log(items): 1.0 is linear, 2.0 quadratic."""
+    points = [(n, s) for n, s in timings.items() if not isinstance(s, str) and s > 0]
+    if len(points) < 2:
+        return np.nan
+    x, y = np.log([p[0] for p in points]), np.log([p[1] for p in points])
+    return float(np.polyfit(x, y, 1)[0])
+
+def check(results, baseline, tolerance=REGRESSION_TOLERANCE, max_exponent=MAX_SCALING_EXPONENT):
+    """List of failure messages: errors, slowdowns against the baseline and super-linear scaling."""
+    failures = []
+    for name, timings in results.items():
+        for n_items, seconds in timings.items():
+            if isinstance(seconds, str):
+                failures.append(f"{name} failed at {n_items} items: {seconds}")
+                continue
+            reference = baseline.get(name, {}).get(str(n_items))
+            if reference and seconds > reference * (1 + tolerance):
+                failures.append(f"{name} at {n_items} items: {seconds:.3f}s vs baseline {reference:.3f}s")
+        exponent = scaling_exponent(timings)
+        if exponent > max_exponent:
+            failures.append(f"{name} scales as items^{exponent:.2f} (limit {max_exponent})")
+    return failures
+
+
+if __name__ == "__main__":
+    # From streamlit_app/: python -m benchmarks.run [--items 50 100 200] [--save-baseline]
+    parser = argparse.ArgumentParser(description="Loader and transform benchmarks on synthetic Data_Matrix data.")
+    parser.add_argument("--items", type=int, nargs="+", default=[50, 100, 200])
+    parser.add_argument("--months", type=int, default=6)
+    parser.add_argument("--ingredients", type=int, default=18)
+    parser.add_argument("--stores", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", nargs="*", default=None, help="benchmark names to run")
+    parser.add_argument("--skip", nargs="*", default=[], help="benchmark names to leave out")
+    parser.add_argument("--tolerance", type=float, default=REGRESSION_TOLERANCE)
+    parser.add_argument("--save-baseline", action="store_true", help="write these timings as the new baseline")
+    args = parser.parse_args()
+
+    results = run_suite(args.items, args.months, args.ingredients, args.stores, args.repeat, args.only, args.skip)
+
+    print("\nScaling (time ~ items^k):")
+    for name, timings in results.items():
+        print(f"  {name:<32} k = {scaling_exponent(timings):.2f}")
+
+    if args.save_baseline:
+        BASELINE_PATH.write_text(json.dumps(
+            {name: {str(n): s for n, s in t.items() if not isinstance(s, str)} for name, t in results.items()}, indent=2))
+        print(f"Baseline written to {BASELINE_PATH}")
+        sys.exit(0)
+
+    baseline = json.loads(BASELINE_PATH.read_text()) if BASELINE_PATH.exists() else {}
+    failures = check(results, baseline, args.tolerance)
+    if failures:
+        print("\nREGRESSIONS:")
+        print("\n".join(f"  {f}" for f in failures))
+        sys.exit(1)
+    print("\nNo regressions." + ("" if baseline else " (no baseline yet: run with --save-baseline)"))
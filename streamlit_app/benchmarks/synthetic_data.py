@@ -0,0 +1,138 @@
+# benchmarks/synthetic_data.py — synthetic Data_Matrix workbooks, recipe and shipment CSVs at any scale
+import calendar
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from data_loaders import COUNT_INGREDIENTS, INGREDIENTS_PATH, SHIPMENT_PATH
+
+MONTH_NAMES = list(calendar.month_name)[1:]
+PROTEINS = ["Beef", "Chicken", "Pork", "Shrimp", "Vegetable", "Tofu", "Duck", "Lamb"]
+DISHES = ["Ramen", "Tossed Ramen", "Rice Noodle Soup", "Tossed Rice Noodles", "Fried Rice", "Bao", "Dumplings", "Wonton"]
+GROUPS = ["All Day Menu", "Gift Card", "Lunch Menu", "Open Food", "Signature Drinks"]
+
+
+def _money(values):
+    return [f"${v:,.2f}" for v in values]
+
+def _counts(values):
+    return [f"{int(v):,}" for v in values]
+
+def _sheet(label_col, labels, counts, amounts):
+    """Same columns as the exported workbooks: counts with thousands separators, amounts as $ strings."""
+    return pd.DataFrame({
+        "source_page": 1, "source_table": 1,
+        label_col: labels, "Count": _counts(counts), "Amount": _money(amounts),
+    })
+
+def item_names(n_items):
+    """'Beef Ramen', 'Chicken Ramen', ... then numbered variants ('Beef Ramen 2') past 64 items."""
+    base = [f"{p} {d}" for d in DISHES for p in PROTEINS]
+    return [base[i % len(base)] + (f" {i // len(base) + 1}" if i >= len(base) else "") for i in range(n_items)]
+
+def ingredient_names(n_ingredients):
+    """The real recipe columns first, then 'Ingredient N(g)'."""
+    real = [c.strip() for c in pd.read_csv(INGREDIENTS_PATH, nrows=0).columns[1:]]
+    return real[:n_ingredients] + [f"Ingredient {k}(g)" for k in range(len(real), n_ingredients)]
+
+def month_sequence(n_months, start="May"):
+    """Month names from `start`, wrapping around the calendar. File names only carry month names, so at most 12."""
+    if n_months > 12:
+        raise ValueError("Data_Matrix files are named by month only; at most 12 months fit in one folder.")
+    first = MONTH_NAMES.index(start)
+    return [MONTH_NAMES[(first + k) % 12] for k in range(n_months)]
+
+def write_month_workbook(path, month, items, counts, prices, rng):
+    """
+    One <Month>_Data_Matrix.xlsx: 'data 1' groups, 'data 2' categories, 'data 3' items,
+    except October, whose export has categories in 'data 1', items in 'data 2' and groups in 'data 3'.
+    """
+    amounts = counts * prices
+    categories = [name.split(" ", 1)[1] for name in items]
+    by_category = pd.DataFrame({"c": categories, "n": counts, "a": amounts}).groupby("c", sort=False).sum()
+    group_share = rng.dirichlet(np.ones(len(GROUPS)))
+
+    item_sheet = _sheet("Item Name", items, counts, amounts)
+    category_sheet = _sheet("Category", list(by_category.index), by_category["n"], by_category["a"])
+    group_sheet = _sheet("Group", GROUPS, np.round(group_share * counts.sum()), group_share * amounts.sum())
+
+    sheets = ({"data 1": category_sheet, "data 2": item_sheet, "data 3": group_sheet} if month == "October"
+              else {"data 1": group_sheet, "data 2": category_sheet, "data 3": item_sheet})
+    with pd.ExcelWriter(path, engine="openpyxl") as writer:
+        for name, frame in sheets.items():
+            frame.to_excel(writer, sheet_name=name, index=False)
+
+def write_recipes(path, items, ingredients, rng, density=0.3):
+    """Recipe matrix CSV: grams (or counts) per serving, blank where an item does not use an ingredient."""
+    amounts = rng.uniform(10, 150, (len(items), len(ingredients)))
+    counts = np.array([c in COUNT_INGREDIENTS for c in ingredients])
+    amounts[:, counts] = rng.integers(1, 4, (len(items), counts.sum()))
+    amounts[rng.random(amounts.shape) > density] = np.nan
+    recipes = pd.DataFrame(np.round(amounts, 1), columns=ingredients)
+    recipes.insert(0, "Item name", items)
+    recipes.to_csv(path, index=False)
+
+def write_shipments(path, monthly_usage_lbs):
+    """
+    Shipment schedule with one weekly line per ingredient sized to roughly cover usage.
+    'Shipment Weight (lbs)' is extra: run_forecasting_with_shipments reads it.
+    """
+    lines = pd.read_csv(SHIPMENT_PATH)
+    names = list(monthly_usage_lbs.index)
+    real = dict(zip(lines["Ingredient"].str.strip(), lines["Unit of shipment"]))
+    per_week = np.maximum(np.ceil(monthly_usage_lbs.to_numpy() / 4 / 50), 1)
+    pd.DataFrame({
+        "Ingredient": names,
+        "Quantity per shipment": 50,
+        "Unit of shipment": [real.get(n, "lbs") for n in names],
+        "Number of shipments": per_week.astype(int),
+        "frequency": "weekly",
+        "Shipment Weight (lbs)": 50 * per_week,
+    }).to_csv(path, index=False)
+
+def generate_dataset(out_dir, n_months=6, n_items=100, n_ingredients=18, n_stores=1, seed=0):
+    """
+    Writes a complete data folder under out_dir:
+        data/<Month>_Data_Matrix.xlsx, data/MSY Data - Ingredient.csv, data/MSY Data - Shipment.csv,
+        data/stores/Store N/<Month>_Data_Matrix.xlsx   (when n_stores > 1)
+        cleaned_item_sales.csv                          (input of run_forecasting_with_shipments)
+    Returns the data folder path.
+    """
+    rng = np.random.default_rng(seed)
+    data_dir = Path(out_dir) / "data"
+    data_dir.mkdir(parents=True, exist_ok=True)
+
+    items = item_names(n_items)
+    ingredients = ingredient_names(n_ingredients)
+    months = month_sequence(n_months)
+    write_recipes(data_dir / INGREDIENTS_PATH.name, items, ingredients, rng)
+
+    popularity = rng.gamma(1.5, 60, n_items)
+    prices = np.round(rng.uniform(4, 18, n_items), 2)
+    trend = 1 + 0.05 * np.arange(n_months)
+
+    folders = [data_dir] if n_stores == 1 else [data_dir / "stores" / f"Store {s + 1}" for s in range(n_stores)]
+    chain_counts = np.zeros((n_items, n_months))
+    for folder in folders:
+        folder.mkdir(parents=True, exist_ok=True)
+        counts = rng.poisson(popularity[:, None] * trend[None, :] * rng.uniform(0.7, 1.3))
+        chain_counts += counts
+        for m, month in enumerate(months):
+            write_month_workbook(folder / f"{month}_Data_Matrix.xlsx", month, items, counts[:, m], prices, rng)
+    if n_stores > 1:
+        # The top-level folder holds the chain totals so single-folder loaders see every store's sales
+        for m, month in enumerate(months):
+            write_month_workbook(data_dir / f"{month}_Data_Matrix.xlsx", month, items, chain_counts[:, m], prices, rng)
+
+    recipes = pd.read_csv(data_dir / INGREDIENTS_PATH.name).set_index("Item name").fillna(0)
+    usage = recipes.T @ chain_counts.mean(axis=1)
+    write_shipments(data_dir / SHIPMENT_PATH.name, usage * 0.00220462)
+
+    periods = pd.period_range(f"2025-{MONTH_NAMES.index(months[0]) + 1:02d}", periods=n_months, freq="M")
+    pd.DataFrame({
+        "Item Name": np.repeat(items, n_months),
+        "Month": np.tile(periods.strftime("%Y-%m"), n_items),
+        "Sales Count": chain_counts.ravel(),
+    }).to_csv(Path(out_dir) / "cleaned_item_sales.csv", index=False)
+    return data_dir
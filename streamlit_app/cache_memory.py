@@ -0,0 +1,265 @@
+# cache_memory.py — memory footprint of every st.cache_data / st.cache_resource entry, per loader, page and session
+import logging
+import os
+import pickle
+import sys
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from streamlit.runtime import Runtime
+from streamlit.runtime.caching import cache_data_api, cache_resource_api
+
+import anomalies
+import data_loaders as dl
+import heavy_hitters
+import margins
+import procurement
+import recipes
+import safety_stock
+import sales_store
+import stores
+import what_if
+from data_loaders import STATE_DIR, state_lock, write_state
+
+MEMORY_REPORT_PATH = STATE_DIR / "memory_report.json"
+
+# Cached loaders, by the name Streamlit gives their cache (module.function)
+CACHED_LOADERS = {f"{f.__module__}.{f.__qualname__}": f for f in [
+    dl.load_ingredient_totals, dl.load_monthly_sales, dl.load_data1_for_month, dl.load_data2_for_month,
+    dl.load_month_data, dl.load_ingredient_data, dl.build_network_html, dl.load_forecast_data,
+    dl.load_forecast_store, dl.load_shipments, recipes.load_recipe_matrix, recipes.match_items,
+    margins.load_margins, safety_stock.load_reorder_table, procurement.recommend_orders,
+    anomalies.load_anomalies, sales_store.load_sales_by_period, sales_store.load_usage_by_period, stores.load_store_aggregates,
+    what_if.load_what_if_model, heavy_hitters.load_heavy_hitters, recipes.load_usage_by_line,
+]}
+
+# Page -> caches it reads, directly or through another loader. A cache shared by several pages counts for each.
+PAGE_CACHES = {
+    "Ingredient_Insights": ["data_loaders.load_ingredient_totals", "data_loaders.load_monthly_sales", "recipes.load_recipe_matrix",
+                            "recipes.match_items", "anomalies.load_anomalies", "stores.load_store_aggregates",
+                            "sales_store.load_usage_by_period"],
+    "Menu_Items_Trend": ["data_loaders.load_monthly_sales", "sales_store.load_sales_by_period", "anomalies.load_anomalies",
+                         "heavy_hitters.load_heavy_hitters"],
+    "Shipment_Dashboard": ["recipes.load_usage_by_line", "recipes.load_recipe_matrix", "recipes.match_items"],
+    "Monthly_Category_Income": ["data_loaders.load_data1_for_month", "data_loaders.load_data2_for_month"],
+    "Optimization_By_Item": ["margins.load_margins", "data_loaders.load_month_data", "data_loaders.load_monthly_sales",
+                             "recipes.load_recipe_matrix", "recipes.match_items"],
+    "Network": ["data_loaders.build_network_html"],
+    "Forecasting_Ingredient_Analysis": ["data_loaders.load_forecast_store", "data_loaders.load_forecast_data",
+                                        "data_loaders.load_shipments", "safety_stock.load_reorder_table",
+                                        "procurement.recommend_orders"],
+    "What_If_Simulator": ["what_if.load_what_if_model"],
+}
+
+# Budgets in MB of cache memory: "total" for all caches together, otherwise per loader.
+# BUDGET_ACTION "warn" only reports; "evict" also clears the loaders over budget (largest first).
+MEMORY_BUDGETS_MB = {
+    "total": 1024,
+    "data_loaders.build_network_html": 50,
+    "data_loaders.load_data1_for_month": 100,
+    "data_loaders.load_data2_for_month": 100,
+    "sales_store.load_sales_by_period": 200,
+}
+BUDGET_ACTION = "warn"
+MONITOR_INTERVAL = 300  # seconds between background checks
+
+MB = 2**20
+
+logger = logging.getLogger(__name__)
+
+
+# --- SIZES ---
+def deep_size(obj, _seen=None):
+    """Bytes held by obj: pandas deep memory_usage, numpy nbytes, containers walked recursively."""
+    seen = set() if _seen is None else _seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(deep=True).sum())
+    if isinstance(obj, (pd.Series, pd.Index)):
+        return int(obj.memory_usage(deep=True))
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes
+    if isinstance(obj, dict):
+        return sys.getsizeof(obj) + sum(deep_size(k, seen) + deep_size(v, seen) for k, v in obj.items())
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return sys.getsizeof(obj) + sum(deep_size(v, seen) for v in obj)
+    return sys.getsizeof(obj)
+
+def rss_mb(pid="self"):
+    """Current resident set size of process pid (Linux /proc), else this process's peak so far from getrusage."""
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / MB
+    except OSError:
+        if pid != "self":
+            return np.nan
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / MB if sys.platform == "darwin" else peak / 1024
+
+
+# --- STREAMLIT INTERNALS ---
+_internals_missing = False
+
+def streamlit_internals():
+    """
+    The one place this module reads Streamlit's private state, which has no public listing:
+    (loader, kind, stored) per cached value - the stored pickle bytes of st.cache_data, the
+    object of st.cache_resource - and {session id: session state} of the active sessions.
+    When a Streamlit release moves any of it, logs once and returns empty listings, so the page
+    and the monitor keep running without these figures.
+    """
+    global _internals_missing
+    try:
+        entries = []
+        for kind, caches in (("data", cache_data_api._data_caches), ("resource", cache_resource_api._resource_caches)):
+            with caches._caches_lock:
+                function_caches = [c for per_session in caches._function_caches.values() for c in per_session.values()]
+            for cache in function_caches:
+                store = cache.storage if kind == "data" else cache
+                if getattr(store, "_mem_cache", None) is None:  # nothing held in memory
+                    continue
+                with store._mem_cache_lock:
+                    values = list(store._mem_cache.values())
+                entries += [(cache.display_name, kind, v if kind == "data" else v.value) for v in values]
+        sessions = {}
+        if Runtime.exists():
+            sessions = {info.session.id: info.session.session_state.filtered_state
+                        for info in Runtime.instance()._session_mgr.list_active_sessions()}
+        return entries, sessions
+    except AttributeError as e:
+        if not _internals_missing:
+            _internals_missing = True
+            logger.warning("Cache and session sizes unavailable with this Streamlit version: %s", e)
+        return [], {}
+
+
+# --- CACHE ENTRIES ---
+def cache_entries(deep=False):
+    """
+    One row per cached value: loader, kind and Resident, the bytes the cache holds (the stored
+    pickle of st.cache_data, the object itself for st.cache_resource). With deep=True, also
+    Deep: the pandas deep memory of the value a call returns. st.cache_data hands every call
+    (each rerun of each session) a freshly unpickled copy, so measuring it unpickles every
+    cached value once; that is for on-demand checks, not the background monitor.
+    """
+    entries, _ = streamlit_internals()
+    rows = []
+    for loader, kind, stored in entries:
+        resident = len(stored) if kind == "data" else deep_size(stored)
+        row = {"Loader": loader, "Kind": kind, "Resident": resident}
+        if deep:
+            row["Deep"] = deep_size(pickle.loads(stored).value) if kind == "data" else resident  # a pickled CachedResult
+        rows.append(row)
+    return pd.DataFrame(rows, columns=["Loader", "Kind", "Resident", *(["Deep"] if deep else [])])
+
+def session_sizes():
+    """Deep bytes of each active session's st.session_state (empty outside a running server)."""
+    _, sessions = streamlit_internals()
+    return {sid: deep_size(state) for sid, state in sessions.items()}
+
+
+# --- REPORT ---
+def memory_report(deep=False):
+    """
+    Loader, page and session totals in MB, as plain dicts so the report can be written as JSON.
+    A page's figure is the cache memory it keeps alive; with deep=True (see cache_entries) also
+    one rerun's worth of unpickled copies.
+    """
+    entries = cache_entries(deep)
+    sizes = ["Resident", "Deep"] if deep else ["Resident"]
+    by_loader = (entries.groupby(["Loader", "Kind"])
+                        .agg(Entries=("Resident", "size"), **{c: (c, "sum") for c in sizes})
+                        .reset_index())
+    by_loader[sizes] /= MB
+    by_loader["Pages"] = by_loader["Loader"].map(
+        lambda name: ", ".join(p for p, loaders in PAGE_CACHES.items() if name in loaders))
+
+    loaders = by_loader.set_index("Loader")
+    pages = {}
+    for page, names in PAGE_CACHES.items():
+        used = loaders.reindex([n for n in names if n in loaders.index])
+        pages[page] = {"Cache MB": round(float(used["Resident"].sum()), 3)}
+        if deep:
+            pages[page]["Per-rerun copies MB"] = round(float(used.loc[used["Kind"] == "data", "Deep"].sum()), 3)
+
+    return {
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "process_rss_mb": round(rss_mb(), 1),
+        "cache_total_mb": round(float(by_loader["Resident"].sum()), 3),
+        "loaders": by_loader.round(3).to_dict(orient="records"),
+        "pages": pages,
+        "sessions": {sid: round(size / MB, 3) for sid, size in session_sizes().items()},
+    }
+
+
+# --- BUDGETS ---
+def check_budgets(report, budgets=MEMORY_BUDGETS_MB, action=BUDGET_ACTION):
+    """
+    Compares cache memory with the budgets. With action="evict", clears loaders over their own
+    budget, then the largest loaders until the total fits. Returns a list of messages.
+    """
+    resident = pd.Series({row["Loader"]: row["Resident"] for row in report["loaders"]}, dtype=float)
+    messages, evicted = [], []
+    for name, limit in budgets.items():
+        if name != "total" and resident.get(name, 0.0) > limit:
+            messages.append(f"{name} holds {resident[name]:.1f} MB (budget {limit} MB)")
+            evicted.append(name)
+    total = resident.sum()
+    if total > budgets.get("total", np.inf):
+        messages.append(f"All caches hold {total:.1f} MB (budget {budgets['total']} MB)")
+        remaining = total - resident[evicted].sum()
+        for name in resident.drop(evicted).sort_values(ascending=False).index:
+            if remaining <= budgets["total"]:
+                break
+            evicted.append(name)
+            remaining -= resident[name]
+
+    if action == "evict":
+        for name in evicted:
+            if name in CACHED_LOADERS:
+                CACHED_LOADERS[name].clear()
+                messages.append(f"Evicted {name}")
+    return messages
+
+def write_report(report, path=MEMORY_REPORT_PATH):
+    with state_lock(path):
+        write_state(path, report)
+
+def check_memory(budgets=MEMORY_BUDGETS_MB, action=BUDGET_ACTION, path=MEMORY_REPORT_PATH):
+    """Measures, enforces the budgets and writes the JSON report (with the budget messages)."""
+    report = memory_report()
+    report["budget_messages"] = check_budgets(report, budgets, action)
+    write_report(report, path)
+    for message in report["budget_messages"]:
+        logger.warning("Cache memory: %s", message)
+    return report
+
+def monitor(interval=MONITOR_INTERVAL, budgets=MEMORY_BUDGETS_MB, action=BUDGET_ACTION, path=MEMORY_REPORT_PATH):
+    """check_memory every `interval` seconds; a failed check is logged and the next one runs on schedule."""
+    while True:
+        try:
+            check_memory(budgets, action, path)
+        except Exception:
+            logger.exception("Cache memory check failed")
+        time.sleep(interval)
+
+def start_memory_monitor(interval=MONITOR_INTERVAL):
+    """Starts monitor() in a daemon thread of the Streamlit process and returns the thread."""
+    thread = threading.Thread(target=monitor, args=(interval,), name="cache-memory", daemon=True)
+    thread.start()
+    return thread
+
+
+if __name__ == "__main__":
+    # python cache_memory.py (from streamlit_app/) -> the last report the running app wrote, as JSON.
+    # Caches live inside the Streamlit process, so a separate process can only read its report.
+    if not os.path.exists(MEMORY_REPORT_PATH):
+        raise SystemExit(f"No report at {MEMORY_REPORT_PATH}; it is written by the running app every {MONITOR_INTERVAL}s.")
+    with open(MEMORY_REPORT_PATH, encoding="utf-8") as f:
+        print(f.read())
@@ -0,0 +1,143 @@
+# charts.py — chart layer: pre-aggregated, downsampled series and an LRU of built charts per (page, selection, data version)
+import json
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+import plotly.io as pio
+import streamlit as st
+
+import data_loaders as dl
+from stores import stores_version
+
+CHART_CACHE_SIZE = 256  # built charts kept across sessions, least recently used dropped first
+MAX_POINTS = 500        # points per drawn series before LTTB downsampling kicks in
+
+
+# --- DOWNSAMPLING ---
+def lttb(x, y, n_out):
+    """
+    Largest-Triangle-Three-Buckets: indices of n_out points that keep the visual shape of (x, y).
+    First and last points are always kept; every bucket in between keeps the point forming the
+    largest triangle with the previous pick and the next bucket's average.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    edges = np.floor(np.linspace(1, n - 1, n_out - 1)).astype(int)
+    picked = np.empty(n_out, dtype=int)
+    picked[0], picked[-1] = 0, n - 1
+    a = 0
+    for b in range(n_out - 2):
+        lo, hi = edges[b], max(edges[b + 1], edges[b] + 1)
+        if b + 2 < len(edges):
+            nxt = slice(edges[b + 1], max(edges[b + 2], edges[b + 1] + 1))
+            cx, cy = x[nxt].mean(), y[nxt].mean()
+        else:
+            cx, cy = x[-1], y[-1]
+        area = np.abs((x[a] - cx) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (cy - y[a]))
+        a = lo + int(np.nanargmax(area)) if np.isfinite(area).any() else lo
+        picked[b + 1] = a
+    return picked
+
+def downsample(frame, x, y, by=None, max_points=MAX_POINTS):
+    """Rows of a long frame reduced with LTTB on (x, y), per `by` group when given; short series pass through."""
+    def reduce(group):
+        if len(group) <= max_points:
+            return group
+        xs = group[x].astype("int64") if pd.api.types.is_datetime64_any_dtype(group[x]) else group[x]
+        return group.iloc[lttb(xs.to_numpy(), group[y].fillna(0).to_numpy(), max_points)]
+
+    if by is None:
+        return reduce(frame.sort_values(x))
+    return pd.concat([reduce(g.sort_values(x)) for _, g in frame.groupby(by, sort=False)], ignore_index=True)
+
+def downsample_columns(frame, max_points=MAX_POINTS):
+    """Wide frame (series x periods) cut to at most max_points columns: the union of each row's LTTB picks."""
+    if frame.shape[1] <= max_points:
+        return frame
+    positions = np.arange(frame.shape[1])
+    keep = set()
+    for values in frame.fillna(0).to_numpy(dtype=float):
+        keep.update(lttb(positions, values, max(3, max_points // max(len(frame), 1))).tolist())
+    return frame.iloc[:, sorted(keep)]
+
+
+# --- MEMOIZED CHARTS ---
+# Altair charts are kept as their Vega-Lite spec (data inlined, no validation pass) and drawn with
+# st.vega_lite_chart; Plotly charts are kept as the built Figure, since st.plotly_chart re-validates
+# any dict or JSON it is handed but takes a Figure as-is.
+_charts = OrderedDict()
+_charts_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0, "build_s": 0.0}
+
+def _freeze(selection):
+    if isinstance(selection, (list, tuple, set, frozenset)):
+        return tuple(_freeze(s) for s in selection)
+    if isinstance(selection, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in selection.items()))
+    return selection
+
+def _altair_spec(chart):
+    spec = chart.to_dict(validate=False)
+    # Altair's default theme pins a 300px view, which would override the container width
+    view = spec.get("config", {}).get("view", {})
+    for key in ("continuousWidth", "continuousHeight"):
+        view.pop(key, None)
+    return spec
+
+def _payload_bytes(chart):
+    if isinstance(chart, dict):
+        return len(json.dumps(chart, default=str))
+    return len(pio.to_json(chart, validate=False))
+
+def chart_version():
+    """Default data version of a chart: the input files and the per-store folders."""
+    return f"{dl.data_version()}|{stores_version()}"
+
+def cached_chart(page, selection, build, version=None):
+    """The chart build() returns for this (page, selection, data version), built once and shared by every session."""
+    key = (page, _freeze(selection), version or chart_version())
+    with _charts_lock:
+        if key in _charts:
+            _charts.move_to_end(key)
+            _stats["hits"] += 1
+            return _charts[key][0]
+    start = time.perf_counter()
+    chart = build()
+    if not hasattr(chart, "to_plotly_json"):
+        chart = _altair_spec(chart)
+    entry = (chart, _payload_bytes(chart))
+    with _charts_lock:
+        _stats["misses"] += 1
+        _stats["build_s"] += time.perf_counter() - start
+        _charts[key] = entry
+        _charts.move_to_end(key)
+        while len(_charts) > CHART_CACHE_SIZE:
+            _charts.popitem(last=False)
+    return chart
+
+def show_chart(page, selection, build, version=None, **kwargs):
+    """Draws the memoized chart; kwargs go to st.vega_lite_chart / st.plotly_chart."""
+    chart = cached_chart(page, selection, build, version)
+    if isinstance(chart, dict):
+        st.vega_lite_chart(chart, **kwargs)
+    else:
+        st.plotly_chart(chart, **kwargs)
+
+def chart_cache_stats():
+    """Entries, hit/miss counts, total build time and payload bytes held, per page."""
+    with _charts_lock:
+        sizes = pd.Series({key: size for key, (_, size) in _charts.items()}, dtype=float)
+        stats = dict(_stats)
+    per_page = sizes.groupby(level=0).agg(["size", "sum"]).rename(columns={"size": "Charts", "sum": "Payload bytes"}) \
+        if len(sizes) else pd.DataFrame(columns=["Charts", "Payload bytes"])
+    return {**stats, "entries": int(len(sizes)), "payload_bytes": int(sizes.sum()), "pages": per_page}
+
+def clear_charts():
+    with _charts_lock:
+        _charts.clear()
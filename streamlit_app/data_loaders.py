@@ -0,0 +1,486 @@
+# data_loaders.py — cached dataset loaders shared by the dashboard pages
+import hashlib
+import json
+import os
+import pickle
+import re
+import tempfile
+import threading
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+# --- PATHS ---
+APP_DIR = Path(__file__).parent.resolve()
+DATA_DIR = APP_DIR / "data"
+INGREDIENTS_PATH = DATA_DIR / "MSY Data - Ingredient.csv"
+SHIPMENT_PATH = DATA_DIR / "MSY Data - Shipment.csv"
+FORECAST_CSV = APP_DIR / "pages" / "Predictive_Analysis" / "ingredient_forecast_with_constraints.csv"
+# Runtime state written by the app and its CLIs (model / detector state, reports, logs); not part of the source tree
+STATE_DIR = Path(os.environ.get("MSY_STATE_DIR", APP_DIR / "state"))
+
+# --- PARAMETERS ---
+MONTH_ORDER = ["May", "June", "July", "August", "September", "October"]
+
+# Ingredients that are counts
+COUNT_INGREDIENTS = ['Egg(count)', 'Ramen (count)', 'Chicken Wings (pcs)', 'chicken thigh (pcs)', 'White onion']
+
+# Assuming 6 historical data points (May through October 2025); only used for forecast CSVs
+# without an Action_Required column, whose history rows are marked "Historical Data"
+HISTORICAL_MONTHS = 6
+HISTORY_ACTION = "Historical Data"
+
+MONTH_FILE_RE = re.compile(r"^([A-Za-z]+)_Data_Matrix\.(xlsx|xls|csv)$", re.I)
+
+MONTH_FILES = [
+    (str(DATA_DIR / "May_Data_Matrix.xlsx"), "data 3", "May"),
+    (str(DATA_DIR / "June_Data_Matrix.xlsx"), "data 3", "June"),
+    (str(DATA_DIR / "July_Data_Matrix.xlsx"), "data 3", "July"),
+    (str(DATA_DIR / "August_Data_Matrix.xlsx"), "data 3", "August"),
+    (str(DATA_DIR / "September_Data_Matrix.xlsx"), "data 3", "September"),
+    (str(DATA_DIR / "October_Data_Matrix.xlsx"), "data 2", "October"),
+]
+
+
+# --- INGREDIENT INSIGHTS ---
+def ingredient_totals(sales, ingredients_path=INGREDIENTS_PATH, version=None):
+    """
+    Ingredient usage per month (lbs or count) for an item x month sales frame (None: all zero),
+    attributed through the resolved recipe matrix; version is passed on to load_recipe_matrix.
+    """
+    from recipes import ingredient_usage, load_recipe_matrix
+
+    if sales is None:
+        return pd.DataFrame(0.0, index=load_recipe_matrix(ingredients_path, version=version)[1], columns=MONTH_ORDER)
+    return ingredient_usage(sales, ingredients_path, version).reindex(columns=MONTH_ORDER, fill_value=0.0)
+
+@st.cache_data
+def load_ingredient_totals(dataset_folder=DATA_DIR, ingredients_path=INGREDIENTS_PATH):
+    """Total ingredient usage per month (lbs or count), attributed from item sales through the resolved recipe matrix."""
+    return ingredient_totals(load_monthly_sales(dataset_folder), ingredients_path)
+
+
+# --- MENU ITEMS TREND ---
+@st.cache_data
+def load_monthly_sales(dataset_folder=DATA_DIR):
+    """Item x month sales counts (rows are lower-cased item names)."""
+    monthly_sales = {}
+
+    for file in sorted(os.listdir(dataset_folder)):
+        if not file.endswith(".xlsx"):
+            continue
+        file_path = os.path.join(dataset_folder, file)
+        sheet = "data 2" if "October" in file else "data 3"
+        try:
+            sales_df = pd.read_excel(file_path, sheet_name=sheet)
+        except:
+            continue
+
+        sales_df.columns = [c.strip() for c in sales_df.columns]
+        item_col = next((c for c in sales_df.columns if 'item' in c.lower() and 'name' in c.lower()), None)
+        count_col = next((c for c in sales_df.columns if 'count' in c.lower()), None)
+        if item_col is None or count_col is None:
+            continue
+
+        sales_df[item_col] = sales_df[item_col].astype(str).str.strip().str.lower()
+        sales_df[count_col] = pd.to_numeric(sales_df[count_col], errors='coerce').fillna(0)
+        month_name = file.split("_")[0]
+
+        for _, row in sales_df.iterrows():
+            item = row[item_col]
+            count = row[count_col]
+            monthly_sales.setdefault(item, {})[month_name] = monthly_sales.get(item, {}).get(month_name, 0) + count
+
+    if not monthly_sales:
+        return None
+
+    monthly_df = pd.DataFrame(monthly_sales).fillna(0).T
+    monthly_df = monthly_df.reindex(columns=MONTH_ORDER, fill_value=0)
+    return monthly_df
+
+
+# --- DATA VERSION ---
+def data_version(data_dir=DATA_DIR, forecast_csv=FORECAST_CSV):
+    """Short hash of the input files' names, sizes and mtimes; changes whenever a workbook or CSV does."""
+    files = sorted(p for p in Path(data_dir).iterdir() if p.suffix.lower() in {".xlsx", ".xls", ".csv"})
+    if Path(forecast_csv).exists():
+        files.append(Path(forecast_csv))
+    stamp = [(p.name, p.stat().st_size, p.stat().st_mtime) for p in files]
+    return hashlib.sha1(repr(stamp).encode()).hexdigest()[:12]
+
+
+# --- MONTHLY CATEGORY INCOME ---
+def month_key(m: str) -> int:
+    return pd.to_datetime(m, format="%B").month
+
+def discover_month_files(data_dir: Path = DATA_DIR) -> dict[str, Path]:
+    """Return {MonthName -> Path} for files that match *_Data_Matrix.* (calendar order)."""
+    mapping: dict[str, Path] = {}
+    for p in Path(data_dir).glob("*_Data_Matrix.*"):
+        m = MONTH_FILE_RE.match(p.name)
+        if not m:
+            continue
+        month_name = m.group(1).capitalize()
+        mapping[month_name] = p
+    return dict(sorted(mapping.items(), key=lambda kv: month_key(kv[0])))
+
+@st.cache_data(show_spinner=False)
+def load_data1_for_month(path: Path, month_label: str) -> pd.DataFrame:
+    """Load Data 1, except for October where we take 'data 3'."""
+    sheet_name = "data 3" if month_label.lower() == "october" else "data 1"
+    if path.suffix.lower() == ".csv":
+        df = pd.read_csv(path)  # CSV: assume correct format
+    else:
+        df = pd.read_excel(path, sheet_name=sheet_name, engine="openpyxl")
+    df.columns = [c.strip() for c in df.columns]
+
+    required = {"Group", "Amount"}
+    if not required.issubset(df.columns):
+        raise ValueError(f"Missing one of {required} in {path.name} ({sheet_name})")
+
+    out = df[["Group", "Amount"]].copy()
+    out["Amount"] = (
+        out["Amount"].astype("string")
+        .str.replace(r"[\$,]", "", regex=True)
+        .replace({"": "0", pd.NA: "0"})
+    ).astype(float)
+    out["Group"] = out["Group"].astype("string").fillna("").str.strip()
+    out["Month"] = month_label
+    return out
+
+@st.cache_data(show_spinner=False)
+def load_data2_for_month(path: Path, month_label: str) -> pd.DataFrame:
+    """Load Data 2, except for October where we take 'data 1'."""
+    sheet_name = "data 1" if month_label.lower() == "october" else "data 2"
+    if path.suffix.lower() == ".csv":
+        df = pd.read_csv(path)
+    else:
+        df = pd.read_excel(path, sheet_name=sheet_name, engine="openpyxl")
+    df.columns = [c.strip() for c in df.columns]
+
+    required = {"Category", "Count", "Amount"}
+    if not required.issubset(df.columns):
+        missing = required - set(df.columns)
+        raise ValueError(f"Missing one of {required} in {path.name} ({sheet_name}). Missing: {missing}")
+
+    out = df[["Category", "Count", "Amount"]].copy()
+    out["Category"] = out["Category"].astype("string").fillna("").str.strip()
+    out["Count"] = pd.to_numeric(out["Count"], errors="coerce").fillna(0)
+    out["Amount"] = (
+        out["Amount"].astype("string")
+        .str.replace(r"[\$,]", "", regex=True)
+        .replace({"": "0", pd.NA: "0"})
+    )
+    out["Amount"] = pd.to_numeric(out["Amount"], errors="coerce").fillna(0.0)
+    out["Month"] = month_label
+    return out
+
+
+# --- OPTIMIZATION BY ITEM ---
+# Recipe items whose sales names differ; the rest are found by their own name (substring)
+SPECIAL_MATCHES = {
+    "fried wings": ["chicken wings", "fried chicken", "crunch chicken"],
+    "chicken cutlet": ["chicken cutlet"],
+    "beef tossed rice noodles": ["beef tossed rice noodle"],
+    "pork tossed rice noodles": ["pork tossed rice noodle"],
+    "chicken tossed rice noodles": ["chicken tossed rice noodle"]
+}
+
+@st.cache_data
+def load_month_data(file_path, sheet_name, month_name):
+    """Loads Excel data for one month and cleans it."""
+    try:
+        df = pd.read_excel(file_path, sheet_name=sheet_name)
+    except Exception as e:
+        st.warning(f"⚠️ Could not load {file_path}: {e}")
+        return None
+
+    item_col = next((col for col in df.columns if 'item' in col.lower()), None)
+    amount_col = next((col for col in df.columns if 'amount' in col.lower()), None)
+    if not item_col or not amount_col:
+        st.warning(f"⚠️ Missing columns in {file_path}")
+        return None
+
+    df[amount_col] = pd.to_numeric(df[amount_col].replace(r'[\$,]', '', regex=True), errors='coerce')
+    df = df[df[amount_col].notna() & (df[amount_col] != 0)]
+    df = df[[item_col, amount_col]].rename(columns={item_col: 'Item Name', amount_col: 'Amount'})
+    df['Month'] = month_name
+    return df
+
+@st.cache_data
+def load_ingredient_data(month_files=tuple(MONTH_FILES), ingredients_path=INGREDIENTS_PATH):
+    """Loads and processes ingredient-level optimization."""
+    ingredient_df = pd.read_csv(ingredients_path)
+    ingredient_df.columns = ingredient_df.columns.str.strip()
+    ingredient_df['Item name'] = ingredient_df['Item name'].str.strip().str.lower()
+
+    monthly_dfs = []
+    for file_path, sheet_name, month_name in month_files:
+        if not os.path.exists(file_path):
+            continue
+        df = pd.read_excel(file_path, sheet_name=sheet_name)
+        item_col = next((col for col in df.columns if 'item' in col.lower()), None)
+        amount_col = next((col for col in df.columns if 'amount' in col.lower()), None)
+        if not item_col or not amount_col:
+            continue
+        df[amount_col] = pd.to_numeric(df[amount_col].replace(r'[\$,]', '', regex=True), errors='coerce')
+        df = df[df[amount_col].notna() & (df[amount_col] != 0)]
+        df = df[[item_col, amount_col]].rename(columns={item_col: 'Item Name', amount_col: 'Amount'})
+        df['Month'] = month_name
+        df['Item Name'] = df['Item Name'].str.strip().str.lower()
+        monthly_dfs.append(df)
+
+    combined_df = pd.concat(monthly_dfs, ignore_index=True)
+
+    ingredient_profit_per_month = {month: {} for month in combined_df['Month'].unique()}
+    month_total_profit = {}
+
+    for month in combined_df['Month'].unique():
+        month_df = combined_df[combined_df['Month'] == month]
+        month_total = month_df['Amount'].sum()
+        month_total_profit[month] = month_total
+
+        for ingredient in ingredient_df.columns[1:]:
+            ingredient_clean = ingredient.strip()
+            used_in_items = ingredient_df.loc[
+                ingredient_df[ingredient].notna() & (ingredient_df[ingredient] != 0),
+                'Item name'
+            ].dropna().tolist()
+
+            total_profit = 0.0
+            for item in used_in_items:
+                patterns = SPECIAL_MATCHES.get(item, [item])
+                for p in patterns:
+                    matched = month_df[month_df['Item Name'].str.contains(p, case=False, na=False)]
+                    if not matched.empty:
+                        total_profit += matched['Amount'].sum()
+
+            ingredient_profit_per_month[month][ingredient_clean] = total_profit
+
+    return ingredient_profit_per_month, month_total_profit
+
+
+# --- NETWORK ---
+@st.cache_data
+def build_network_html(excel_file=str(DATA_DIR / "May_Data_Matrix.xlsx"), sheet_name='data 3',
+                       ingredient_file=INGREDIENTS_PATH, min_qty=10, top_n_items=10):
+    """Renders the menu item -> ingredient pyvis network to an HTML string."""
+    import networkx as nx
+    from pyvis.network import Network
+
+    sales_df = pd.read_excel(excel_file, sheet_name=sheet_name)
+    sales_df['Count'] = pd.to_numeric(sales_df['Count'], errors='coerce')
+    sales_df['item_name'] = sales_df['Item Name'].str.lower().str.strip()
+
+    top_items = sales_df.sort_values('Count', ascending=False).head(top_n_items)
+
+    ingredients_df = pd.read_csv(ingredient_file)
+    ingredients_df['item_name'] = ingredients_df['Item name'].str.lower().str.strip()
+
+    merged_df = pd.merge(top_items, ingredients_df, on='item_name', how='left')
+
+    ingredient_cols = [col for col in ingredients_df.columns if col.lower() not in ['item name', 'item_name']]
+
+    G = nx.Graph()
+
+    for _, row in merged_df.iterrows():
+        item = row['item_name']
+        G.add_node(item, color='orange', size=25, title=f"{item}")
+
+        for ing in ingredient_cols:
+            qty = pd.to_numeric(row[ing], errors='coerce')
+            if pd.notnull(qty) and qty >= min_qty:
+                if not G.has_node(ing):
+                    G.add_node(ing, color='lightblue', size=15, title=f"{ing}")
+                G.add_edge(item, ing, value=qty, title=f"{qty} units")
+
+    net = Network(height="750px", width="100%", notebook=False, bgcolor="#ffffff", font_color="black")
+    net.from_nx(G)
+
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".html") as tmp_file:
+        tmp_path = tmp_file.name
+    net.write_html(tmp_path)
+    with open(tmp_path, 'r', encoding='utf-8') as f:
+        html = f.read()
+    os.remove(tmp_path)
+    return html
+
+
+# --- FORECASTING INGREDIENT ANALYSIS ---
+@st.cache_data
+def load_forecast_data(csv_filepath=FORECAST_CSV, version=None):
+    """Loads, cleans, and pre-processes the ingredient forecast data; version (data_version()) is only a cache key."""
+    try:
+        df = pd.read_csv(csv_filepath)
+
+        # Rename columns to standardized, easier-to-use names
+        df = df.rename(columns={
+            'Date' : 'ds', # Prophet's date column
+            'Forecast_LBS_or_Count': 'yhat', # Standardized forecast (LBS/Count) - Use this for plotting
+            'Forecasted_Usage_Original_Unit': 'yhat_raw_unit', # Original forecast (Grams/Count)
+            'Forecast_Lower': 'yhat_lower', # 80% interval (LBS/Count), hierarchical forecasts only
+            'Forecast_Upper': 'yhat_upper',
+            'Ingredient' : 'ingredient',
+            'Monthly_Supply_Constraint': 'supply',
+            'Constraint_Unit': 'unit',
+            'Shortfall_Surplus': 'shortfall',
+            'Action_Required': 'action_required'
+        })
+
+        # Drop columns not needed for visualization to keep dataframe clean
+        df = df.drop(columns=['Month_Label'])
+
+        # Convert date column to datetime objects
+        df['ds'] = pd.to_datetime(df['ds'])
+
+        # Determine the period for visualization from the CSV's history marker; older files without
+        # one have HISTORICAL_MONTHS history rows per ingredient
+        if 'action_required' in df:
+            history = df['action_required'].astype(str).str.strip().eq(HISTORY_ACTION)
+        else:
+            history = df.groupby('ingredient').cumcount() < HISTORICAL_MONTHS
+        df['period'] = np.where(history, 'Historical Proxy', 'Future Forecast')
+
+        return df
+    except FileNotFoundError:
+        st.error(f"Error: The file '{csv_filepath}' was not found. Please ensure it is available.")
+        return pd.DataFrame()
+    except Exception as e:
+        st.error(f"Error loading or processing data: {e}")
+        return pd.DataFrame()
+
+def build_forecast_store(df):
+    """
+    Indexes a load_forecast_data frame by ingredient. Rows are sorted once so every
+    ingredient is one contiguous block, and its bounds are stored as (start, split, stop),
+    where rows [start, split) are history and [split, stop) forecast.
+    Returns a dict: ingredients (first-seen order), bounds {ingredient: (start, split, stop)},
+    frame (sorted) and columns {name: contiguous numpy array}.
+    """
+    if df.empty:
+        return {'ingredients': [], 'bounds': {}, 'frame': df, 'columns': {}}
+
+    codes, ingredients = pd.factorize(df['ingredient'])
+    order = np.lexsort((df['ds'].to_numpy(), codes))
+    frame = df.iloc[order].reset_index(drop=True)
+    sorted_codes = codes[order]
+
+    starts = np.searchsorted(sorted_codes, np.arange(len(ingredients)))
+    stops = np.append(starts[1:], len(frame))
+    history = np.add.reduceat((frame['period'] == 'Historical Proxy').to_numpy(), starts)
+    bounds = {name: (int(a), int(a + h), int(b)) for name, a, h, b in zip(ingredients, starts, history, stops)}
+
+    return {
+        'ingredients': list(ingredients),
+        'bounds': bounds,
+        'frame': frame,
+        'columns': {c: np.ascontiguousarray(frame[c].to_numpy()) for c in frame.columns},
+    }
+
+@st.cache_resource
+def load_forecast_store(csv_filepath=FORECAST_CSV, version=None):
+    """
+    Forecast store for the forecast file, shared read-only across sessions. Pass data_version()
+    as version so a regenerated CSV is reloaded by a running server.
+    """
+    return build_forecast_store(load_forecast_data(csv_filepath, version))
+
+def ingredient_frame(store, ingredient, period=None):
+    """Rows for one ingredient ('Historical Proxy' / 'Future Forecast' for one period only)."""
+    start, split, stop = store['bounds'][ingredient]
+    if period == 'Historical Proxy':
+        stop = split
+    elif period == 'Future Forecast':
+        start = split
+    return store['frame'].iloc[start:stop]
+
+def ingredient_values(store, ingredient, column):
+    """One column for one ingredient as an array view (no copy)."""
+    start, _, stop = store['bounds'][ingredient]
+    return store['columns'][column][start:stop]
+
+
+# --- SHIPMENTS ---
+# Shipments per month for each order frequency
+FREQ_MAP = {"weekly": 4, "biweekly": 2, "monthly": 1}
+
+@st.cache_data
+def load_shipments(path=SHIPMENT_PATH):
+    """Shipment schedule with a 'Total monthly shipment' column (quantity x shipments x frequency)."""
+    df = pd.read_csv(path)
+    freq = df["frequency"].astype(str).str.strip().str.lower().map(FREQ_MAP)
+    df["quantityshipment"] = df["Quantity per shipment"] * df["Number of shipments"]
+    df["Total monthly shipment"] = (df["quantityshipment"] * freq).fillna(0)
+    return df
+
+
+# --- RUNTIME STATE ---
+_state_locks = {}
+_state_locks_guard = threading.Lock()
+
+def state_lock(path):
+    """Lock for one state file, shared by every thread of the process; hold it around read-modify-write."""
+    with _state_locks_guard:
+        return _state_locks.setdefault(str(Path(path).resolve()), threading.RLock())
+
+def read_state(path, default=None):
+    """The state stored at path (JSON for .json files, else pickle), or default when there is none yet."""
+    path = Path(path)
+    if not path.exists():
+        return default
+    if path.suffix == ".json":
+        return json.loads(path.read_text(encoding="utf-8"))
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+def write_state(path, state):
+    """Writes state to a temp file next to path, then swaps it in with os.replace: readers never see half a file."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        if path.suffix == ".json":
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(state, f, indent=2)
+        else:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(state, f)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+# --- SERVER START ---
+# Every page imports this module (directly or through the page's helpers), so whichever page a
+# visitor opens first - Home or a deep link - starts the memory monitor and the background
+# warm-up for the process.
+_server_start_lock = threading.Lock()
+_server_started = False
+
+def _run_server_jobs():
+    from cache_memory import start_memory_monitor
+    from warmup import warm_up
+
+    start_memory_monitor()
+    warm_up()
+
+def on_server_start(job=_run_server_jobs):
+    """Runs job in a daemon thread once per Streamlit server process; no-op outside a running server (CLIs, pool workers)."""
+    global _server_started
+    from streamlit import runtime
+
+    if not runtime.exists():
+        return None
+    with _server_start_lock:
+        if _server_started:
+            return None
+        _server_started = True
+    thread = threading.Thread(target=job, name="server-start", daemon=True)
+    thread.start()
+    return thread
+
+on_server_start()
@@ -0,0 +1,112 @@
+# feature_store.py — calendar and exogenous features (holidays, academic terms, game days, events, weather) per date grain
+import re
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+from pandas.tseries.holiday import USFederalHolidayCalendar
+
+from data_loaders import DATA_DIR, data_version
+
+# Optional local files. Events: one row per day or date range, [Date] or [Start, End], plus Event;
+# every distinct Event (e.g. "Game Day", "Ring Day") becomes a feature counting its days.
+# Weather: [Date, <numeric columns>], e.g. temp_max_f, precip_in; averaged over each period.
+EVENTS_PATH = DATA_DIR / "calendar_events.csv"
+WEATHER_PATH = DATA_DIR / "weather.csv"
+
+# Texas A&M class periods as (month, day) ranges. These are typical dates; put a year's exact
+# term dates in the events file (Event "Class Day") when they matter.
+TAMU_TERMS = {
+    "class_days": [((1, 13), (5, 6)), ((8, 25), (12, 10))],  # spring and fall, classes through finals
+    "summer_days": [((6, 2), (8, 12))],
+}
+
+# Date grain -> pandas period frequency; weeks start on Monday like the sales store
+GRAINS = {"D": "D", "W": "W-SUN", "MS": "M"}
+
+
+# --- DAILY FEATURES ---
+def _slug(text):
+    return re.sub(r"[^a-z0-9]+", "_", str(text).strip().lower()).strip("_")
+
+def _term_days(days, ranges):
+    md = days.month * 100 + days.day
+    inside = np.zeros(len(days), dtype=bool)
+    for (m0, d0), (m1, d1) in ranges:
+        inside |= (md >= m0 * 100 + d0) & (md <= m1 * 100 + d1)
+    return inside.astype(float)
+
+def _event_days(days, events_path=EVENTS_PATH):
+    if not events_path.exists():
+        return pd.DataFrame(index=days)
+    events = pd.read_csv(events_path)
+    start = pd.to_datetime(events["Start"] if "Start" in events else events["Date"]).dt.normalize()
+    end = pd.to_datetime(events["End"]).dt.normalize().fillna(start) if "End" in events else start
+    out = pd.DataFrame(0.0, index=days, columns=sorted({f"event_{_slug(e)}" for e in events["Event"]}))
+    for s, e, name in zip(start, end, events["Event"]):
+        out.loc[s:e, f"event_{_slug(name)}"] = 1.0
+    return out
+
+def _weather(days, weather_path=WEATHER_PATH):
+    if not weather_path.exists():
+        return pd.DataFrame(index=days)
+    weather = pd.read_csv(weather_path)
+    weather["Date"] = pd.to_datetime(weather["Date"]).dt.normalize()
+    weather = weather.groupby("Date").mean(numeric_only=True)
+    weather.columns = [f"weather_{_slug(c)}" for c in weather.columns]
+    # Gaps (and future days without a forecast) take the same calendar day's average, else the overall mean
+    filled = weather.reindex(days)
+    by_doy = weather.groupby(weather.index.dayofyear).mean().reindex(days.dayofyear).set_axis(days)
+    return filled.fillna(by_doy).fillna(weather.mean())
+
+def daily_features(start, end, events_path=EVENTS_PATH, weather_path=WEATHER_PATH):
+    """One row per day in [start, end]: 0/1 calendar indicators plus the weather columns."""
+    days = pd.date_range(pd.Timestamp(start).normalize(), pd.Timestamp(end).normalize(), freq="D")
+    holidays = USFederalHolidayCalendar().holidays(days[0], days[-1])
+    calendar = pd.DataFrame({
+        "holiday_days": days.isin(holidays).astype(float),
+        "weekend_days": (days.dayofweek >= 5).astype(float),
+        **{name: _term_days(days, ranges) for name, ranges in TAMU_TERMS.items()},
+    }, index=days)
+    return pd.concat([calendar, _event_days(days, events_path), _weather(days, weather_path)], axis=1)
+
+
+# --- FEATURE MATRIX ---
+def build_feature_matrix(start, end, grain="MS", events_path=EVENTS_PATH, weather_path=WEATHER_PATH):
+    """
+    Periods x features for the grain ("D", "W" or "MS"), indexed by each period's first day
+    (Monday for weeks). Day indicators are summed over the period (days with a holiday, with
+    classes, ...), weather is averaged.
+    """
+    first = pd.Timestamp(start).to_period(GRAINS[grain]).start_time
+    last = pd.Timestamp(end).to_period(GRAINS[grain]).end_time
+    days = daily_features(first, last, events_path, weather_path)
+    periods = days.index.to_period(GRAINS[grain]).start_time
+    weather = [c for c in days.columns if c.startswith("weather_")]
+    matrix = pd.concat([days.drop(columns=weather).groupby(periods).sum(),
+                        days[weather].groupby(periods).mean()], axis=1)
+    return matrix.rename_axis("ds")
+
+@st.cache_data(show_spinner=False)
+def load_feature_matrix(start, end, grain="MS", version=None):
+    """Cached build_feature_matrix(); version defaults to data_version(), which covers the events and weather files."""
+    return build_feature_matrix(start, end, grain)
+
+def features_for(ds, horizon, grain="MS"):
+    """The shared matrix covering history dates `ds` and the `horizon` periods after them."""
+    ds = pd.DatetimeIndex(ds)
+    step = {"D": pd.offsets.Day(), "W": pd.offsets.Week(), "MS": pd.offsets.MonthBegin()}[grain]
+    end = ds[-1] + horizon * step
+    return load_feature_matrix(ds[0], end, grain, version=data_version())
+
+
+if __name__ == "__main__":
+    # python feature_store.py [--grain MS|W|D] [--start 2025-05-01] [--end 2026-01-31]  (from streamlit_app/)
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Print the calendar / exogenous feature matrix.")
+    parser.add_argument("--grain", choices=list(GRAINS), default="MS")
+    parser.add_argument("--start", default="2025-05-01")
+    parser.add_argument("--end", default="2026-01-31")
+    args = parser.parse_args()
+    print(build_feature_matrix(args.start, args.end, args.grain).round(2).to_string())
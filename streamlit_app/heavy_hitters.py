@@ -0,0 +1,155 @@
+# heavy_hitters.py — bounded-memory top items over the daily sales stream (weighted SpaceSaving sketches per window)
+import heapq
+import os
+from collections import OrderedDict
+
+import pandas as pd
+import streamlit as st
+
+from data_loaders import STATE_DIR, read_state, state_lock, write_state
+from sales_store import GRANULARITIES, SALES_STORE_DIR, _period_label, list_partitions
+
+HEAVY_HITTERS_STATE_PATH = STATE_DIR / "heavy_hitters_state.pkl"
+
+CAPACITY = 64      # counters per sketch: every item above total / CAPACITY sales is guaranteed to be tracked
+MAX_WINDOWS = 60   # most recent windows (days, weeks or months) kept per granularity
+
+
+# --- SKETCH ---
+def new_sketch(capacity=CAPACITY):
+    """Empty SpaceSaving sketch: at most `capacity` counters, each with its overestimation error."""
+    return {"capacity": capacity, "counts": {}, "errors": {}, "heap": [], "total": 0.0}
+
+def _pop_min(sketch):
+    # The heap holds (count, item) entries; entries whose count has since changed are stale and skipped
+    heap, counts = sketch["heap"], sketch["counts"]
+    while True:
+        count, item = heapq.heappop(heap)
+        if counts.get(item) == count:
+            return item, count
+
+def update(sketch, counts):
+    """
+    Folds weighted observations ({item: count}) into the sketch. A tracked item's counter grows
+    by its weight; an untracked one takes over the smallest counter m, starting at m + w with
+    error m. Every counter then satisfies count - error <= true count <= count, and error is
+    at most total / capacity.
+    """
+    tracked, errors, heap = sketch["counts"], sketch["errors"], sketch["heap"]
+    for item, w in counts.items():
+        if not w > 0:
+            continue
+        sketch["total"] += w
+        if item in tracked:
+            tracked[item] += w
+        elif len(tracked) < sketch["capacity"]:
+            tracked[item], errors[item] = w, 0.0
+        else:
+            victim, floor = _pop_min(sketch)
+            del tracked[victim], errors[victim]
+            tracked[item], errors[item] = floor + w, floor
+        heapq.heappush(heap, (tracked[item], item))
+    if len(heap) > 4 * sketch["capacity"]:
+        sketch["heap"] = [(c, i) for i, c in tracked.items()]
+        heapq.heapify(sketch["heap"])
+    return sketch
+
+def top_k(sketch, k=None):
+    """Tracked items by estimated count: Count (upper bound), Error and Guaranteed (lower bound)."""
+    top = pd.DataFrame({"Count": pd.Series(sketch["counts"], dtype=float),
+                        "Error": pd.Series(sketch["errors"], dtype=float)})
+    top["Guaranteed"] = top["Count"] - top["Error"]
+    top = top.sort_values("Count", ascending=False)
+    return top.head(k) if k else top
+
+def error_bound(sketch):
+    """Largest possible overcount of any estimate, and the count above which an item cannot be missed."""
+    return sketch["total"] / sketch["capacity"]
+
+
+# --- WINDOWED STREAM ---
+def new_stream(freq, capacity=CAPACITY, max_windows=MAX_WINDOWS):
+    """One sketch over all history plus one per window, and the partitions already folded in (day -> mtime)."""
+    return {"freq": freq, "capacity": capacity, "max_windows": max_windows,
+            "overall": new_sketch(capacity), "windows": OrderedDict(), "seen": {}}
+
+def feed_partitions(stream, store_dir=SALES_STORE_DIR):
+    """
+    Folds every daily partition not seen before into the overall and window sketches.
+    Returns the stream, rebuilt from scratch when a partition already folded in was rewritten
+    or removed (sketches cannot subtract). Memory stays at capacity x (max_windows + 1) counters.
+    """
+    partitions = list_partitions(store_dir=store_dir)
+    current = {day: os.path.getmtime(path) for day, path in partitions}
+    if any(current.get(day) != mtime for day, mtime in stream["seen"].items()):
+        stream = new_stream(stream["freq"], stream["capacity"], stream["max_windows"])
+
+    for day, path in partitions:
+        if day in stream["seen"]:
+            continue
+        part = pd.read_csv(path)
+        names = part["Item Name"].astype(str).str.strip().str.lower()
+        counts = pd.to_numeric(part["Sales Count"], errors="coerce").fillna(0).groupby(names.to_numpy()).sum().to_dict()
+        label = _period_label(day, stream["freq"])
+        update(stream["overall"], counts)
+        if label not in stream["windows"]:
+            stream["windows"][label] = new_sketch(stream["capacity"])
+        update(stream["windows"][label], counts)
+        stream["seen"][day] = current[day]
+
+    windows = stream["windows"]
+    for label in sorted(windows)[:-stream["max_windows"]]:
+        del windows[label]
+    stream["windows"] = OrderedDict(sorted(windows.items()))
+    return stream
+
+def window_frame(stream, items=None):
+    """Items x windows estimated counts; an item a window does not track reads 0 (at most that window's error bound)."""
+    items = list(items) if items is not None else list(top_k(stream["overall"]).index)
+    frame = pd.DataFrame({label: pd.Series(s["counts"], dtype=float).reindex(items)
+                          for label, s in stream["windows"].items()}, index=items)
+    return frame.fillna(0.0)
+
+def update_heavy_hitters(freq, state_path=HEAVY_HITTERS_STATE_PATH, store_dir=SALES_STORE_DIR):
+    """Feeds new partitions into the stored stream for this granularity and persists it."""
+    with state_lock(state_path):
+        state = read_state(state_path, {})
+        state[freq] = feed_partitions(state.get(freq) or new_stream(freq), store_dir)
+        write_state(state_path, state)
+    return state[freq]
+
+@st.cache_data(show_spinner=False)
+def load_heavy_hitters(granularity="Daily", version=None):
+    """
+    Approximate top items and per-window counts for the pages; pass store_version() as version.
+    Only partitions added since the last call are read.
+    """
+    stream = update_heavy_hitters(GRANULARITIES[granularity])
+    overall = stream["overall"]
+    return {
+        "top": top_k(overall),
+        "windows": window_frame(stream),
+        "bound": error_bound(overall),
+        "total": overall["total"],
+        "capacity": overall["capacity"],
+    }
+
+
+if __name__ == "__main__":
+    # python heavy_hitters.py [--granularity Daily|Weekly|Monthly] [--top 10] [--reset]  (from streamlit_app/)
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Approximate top items over the daily sales partitions.")
+    parser.add_argument("--granularity", choices=list(GRANULARITIES), default="Daily")
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--reset", action="store_true", help="forget stored sketches and re-read every partition")
+    args = parser.parse_args()
+
+    if args.reset and os.path.exists(HEAVY_HITTERS_STATE_PATH):
+        os.remove(HEAVY_HITTERS_STATE_PATH)
+    stream = update_heavy_hitters(GRANULARITIES[args.granularity])
+    overall = stream["overall"]
+    if not overall["total"]:
+        raise SystemExit(f"No daily sales partitions in {SALES_STORE_DIR}.")
+    print(f"{overall['total']:,.0f} sales over {len(stream['seen'])} days; estimates overcount by at most {error_bound(overall):,.1f}")
+    print(top_k(overall, args.top).round(1).to_string())
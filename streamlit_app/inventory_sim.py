@@ -0,0 +1,153 @@
+# inventory_sim.py — daily on-hand stock for every shipment line from deliveries and usage
+import numpy as np
+import pandas as pd
+
+# Days between deliveries for each order frequency
+DELIVERY_INTERVAL_DAYS = {"weekly": 7, "biweekly": 14, "monthly": None}  # monthly = 1st of the month
+
+# Default shelf life in days (None = does not spoil within the horizon). Adjust to actual storage.
+SHELF_LIFE_DAYS = {
+    "Beef": 5, "Chicken": 5, "Chicken Wings": 5,
+    "Green Onion": 7, "Cilantro": 5, "Bokchoy": 5,
+    "Egg": 30, "White Onion": 30,
+}
+
+# Days between placing an extra order and receiving it
+REORDER_LEAD_DAYS = 3
+
+
+def delivery_schedule(shipments, days):
+    """
+    Expands the shipment schedule into a lines x days array of delivered quantity.
+    A delivery is 'Quantity per shipment' x 'Number of shipments'; weekly/biweekly lines arrive
+    every 7/14 days from the first day, monthly lines on the 1st.
+    """
+    days = pd.DatetimeIndex(days)
+    qty = (shipments["Quantity per shipment"] * shipments["Number of shipments"]).to_numpy(dtype=float)
+    freq = shipments["frequency"].astype(str).str.strip().str.lower()
+
+    interval = freq.map(DELIVERY_INTERVAL_DAYS).to_numpy(dtype=float)  # NaN for monthly/unknown
+    offset = np.arange(len(days))
+    periodic = np.zeros((len(qty), len(days)), dtype=bool)
+    has_interval = ~np.isnan(interval)
+    periodic[has_interval] = (offset[None, :] % interval[has_interval, None].astype(int)) == 0
+    monthly = (freq == "monthly").to_numpy()
+    periodic[monthly] = (days.day == 1)[None, :]
+    return periodic * qty[:, None]
+
+def daily_usage_from_monthly(usage, days):
+    """
+    Spreads a lines x months usage frame over `days` as a constant daily rate per line.
+    Uses the average month of history, which is what a forward-looking simulation needs
+    when the history has no year attached (May..October).
+    """
+    days = pd.DatetimeIndex(days)
+    rate = usage.mean(axis=1).to_numpy(dtype=float) / 30.44
+    return np.repeat(rate[:, None], len(days), axis=1)
+
+def simulate_inventory(deliveries, usage, initial_stock=0.0, shelf_life=None, reorder_point=None):
+    """
+    Projects on-hand stock for all lines at once. Arrays are lines x days.
+
+    Without shelf lives this is a single cumulative sum of (deliveries - usage), reflected at
+    zero (unmet usage is lost, not back-ordered). With shelf lives, stock is kept in age
+    buckets and consumed oldest-first; each day is one vectorized step over all lines, and a
+    bucket is written off when it reaches its line's shelf life.
+
+    Returns a dict of lines x days arrays: on_hand, spoiled, shortfall, below_reorder.
+    """
+    deliveries = np.asarray(deliveries, dtype=float)
+    usage = np.broadcast_to(np.asarray(usage, dtype=float), deliveries.shape)
+    n_lines, n_days = deliveries.shape
+    initial_stock = np.broadcast_to(np.asarray(initial_stock, dtype=float), (n_lines,))
+
+    life = np.full(n_lines, np.nan) if shelf_life is None else np.asarray(shelf_life, dtype=float)
+    perishable = ~np.isnan(life)
+
+    if not perishable.any():
+        level = initial_stock[:, None] + np.cumsum(deliveries - usage, axis=1)
+        floor = np.minimum(np.minimum.accumulate(level, axis=1), 0.0)
+        on_hand = level - floor
+        lost = -np.diff(floor, axis=1, prepend=0.0)
+        spoiled = np.zeros_like(on_hand)
+    else:
+        # Age buckets 0..n_ages-1 (newest first); the last bucket also holds anything older
+        life_idx = np.where(perishable, np.maximum(life, 1), 0).astype(int) - 1
+        n_ages = int(life_idx[perishable].max()) + 2
+        buckets = np.zeros((n_lines, n_ages))
+        buckets[:, 0] = initial_stock
+        rows = np.flatnonzero(perishable)
+        ages = np.arange(n_ages)
+
+        on_hand = np.empty((n_lines, n_days))
+        spoiled = np.zeros((n_lines, n_days))
+        lost = np.empty((n_lines, n_days))
+        for t in range(n_days):
+            buckets[:, 0] += deliveries[:, t]
+
+            # Consume oldest-first across every line at once
+            oldest_first = buckets[:, ::-1]
+            before = np.cumsum(oldest_first, axis=1) - oldest_first
+            taken = np.clip(usage[:, t, None] - before, 0.0, oldest_first)
+            buckets = (oldest_first - taken)[:, ::-1]
+            lost[:, t] = usage[:, t] - taken.sum(axis=1)
+
+            # Write off whatever reached its shelf life today
+            expired = ages[None, :] >= life_idx[rows, None]
+            spoiled[rows, t] = (buckets[rows] * expired).sum(axis=1)
+            buckets[rows] = np.where(expired, 0.0, buckets[rows])
+            on_hand[:, t] = buckets.sum(axis=1)
+
+            aged = np.zeros_like(buckets)
+            aged[:, 1:] = buckets[:, :-1]
+            aged[:, -1] += buckets[:, -1]
+            buckets = aged
+
+    below_reorder = np.zeros_like(on_hand, dtype=bool)
+    if reorder_point is not None:
+        below_reorder = on_hand < np.asarray(reorder_point, dtype=float).reshape(-1, 1)
+
+    return {"on_hand": on_hand, "spoiled": spoiled, "shortfall": lost, "below_reorder": below_reorder}
+
+def default_reorder_points(daily_rate, lead_days=REORDER_LEAD_DAYS):
+    """Usage over the order lead time — stock needed to last until an extra order arrives."""
+    return np.asarray(daily_rate, dtype=float) * lead_days
+
+def project_stock(shipments, monthly_usage, start, n_days=365, shelf_life_days=SHELF_LIFE_DAYS,
+                  initial_stock=0.0, lead_days=REORDER_LEAD_DAYS):
+    """
+    Convenience wrapper for the dashboard: aligns the shipment schedule with per-line monthly
+    usage (see recipes.usage_by_shipment_line), simulates `n_days` from `start` and returns
+    (long frame [Ingredient, Date, On Hand, Spoiled, Shortfall, Below Reorder], summary frame).
+    """
+    days = pd.date_range(start, periods=n_days, freq="D")
+    shipments = shipments.reset_index(drop=True)
+    lines = shipments["Ingredient"].astype(str).str.strip()
+    usage = monthly_usage.reindex(lines).fillna(0.0)
+
+    deliveries = delivery_schedule(shipments, days)
+    daily = daily_usage_from_monthly(usage, days)
+    life = np.array([shelf_life_days.get(l) or np.nan for l in lines], dtype=float)
+    reorder = default_reorder_points(daily[:, 0], lead_days)
+    sim = simulate_inventory(deliveries, daily, initial_stock, life, reorder)
+
+    long = pd.DataFrame({
+        "Ingredient": np.repeat(lines.to_numpy(), n_days),
+        "Date": np.tile(days.to_numpy(), len(lines)),
+        "On Hand": sim["on_hand"].ravel(),
+        "Spoiled": sim["spoiled"].ravel(),
+        "Shortfall": sim["shortfall"].ravel(),
+        "Below Reorder": sim["below_reorder"].ravel(),
+    })
+    summary = pd.DataFrame({
+        "Ingredient": lines,
+        "Unit": shipments["Unit of shipment"],
+        "Daily Usage": daily[:, 0],
+        "Reorder Point": reorder,
+        "Shelf Life (days)": life,
+        "Avg On Hand": sim["on_hand"].mean(axis=1),
+        "Stockout Days": (sim["shortfall"] > 1e-9).sum(axis=1),
+        "Total Spoiled": sim["spoiled"].sum(axis=1),
+        "Days Below Reorder": sim["below_reorder"].sum(axis=1),
+    })
+    return long, summary
@@ -0,0 +1,149 @@
+# margins.py — ingredient cost per item and true margin per item and month, in matrix form
+import os
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from data_loaders import COUNT_INGREDIENTS, DATA_DIR, MONTH_FILES, SPECIAL_MATCHES, load_month_data, load_monthly_sales
+from pages.Predictive_Analysis.forecast_models import month_start_dates
+from recipes import G_TO_LBS, load_recipe_matrix, match_items
+
+# Optional. Columns: Ingredient (recipe column name), Unit, Cost per Unit, Effective From (YYYY-MM-DD).
+# Several rows for one ingredient are cost revisions; each month uses the latest one in effect.
+COSTS_PATH = DATA_DIR / "MSY Data - Ingredient Costs.csv"
+
+# Cost units -> the recipe matrix unit (lbs for weighed ingredients, count otherwise)
+UNIT_IN_LBS = {"g": G_TO_LBS, "kg": 1000 * G_TO_LBS, "oz": 1 / 16, "lb": 1.0, "lbs": 1.0}
+COUNT_UNITS = {"count", "pcs", "each", "ea"}
+
+# Drinks and sides score 60 or less against every recipe; below this they carry no ingredient cost
+MIN_MATCH_SCORE = 80
+
+
+def load_costs(path=COSTS_PATH):
+    """Ingredient cost revisions, or None when no cost file is present."""
+    if not os.path.exists(path):
+        return None
+    costs = pd.read_csv(path)
+    costs.columns = [c.strip() for c in costs.columns]
+    costs["Ingredient"] = costs["Ingredient"].astype(str).str.strip()
+    costs["Unit"] = costs["Unit"].astype(str).str.strip().str.lower()
+    costs["Cost per Unit"] = pd.to_numeric(costs["Cost per Unit"].replace(r"[\$,]", "", regex=True), errors="coerce")
+    if "Effective From" in costs:
+        costs["Effective From"] = pd.to_datetime(costs["Effective From"], errors="coerce").fillna(pd.Timestamp.min)
+    else:
+        costs["Effective From"] = pd.Timestamp.min
+    return costs.dropna(subset=["Cost per Unit"])
+
+def cost_matrix(costs, ingredients, months):
+    """
+    ingredients x months cost per recipe unit ($/lb or $/count). Every revision is converted
+    to the recipe unit, then each month takes the latest revision effective by its first day
+    ('YYYY-MM' labels keep their year; bare month names are in forecast_models.HISTORY_YEAR).
+    Ingredients without a cost are 0.
+    """
+    recipe_counts = np.array([i in COUNT_INGREDIENTS for i in ingredients])
+    lbs = costs["Unit"].map(UNIT_IN_LBS)
+    is_count = costs["Unit"].isin(COUNT_UNITS)
+    unknown = costs.loc[lbs.isna() & ~is_count, "Unit"].unique()
+    if len(unknown):
+        raise ValueError(f"Unknown cost unit(s): {', '.join(unknown)}")
+
+    # A count-priced ingredient in a weighed recipe column (or the reverse) has no common unit
+    count_priced = is_count.groupby(costs["Ingredient"]).all()
+    for i, name in enumerate(ingredients):
+        if name in count_priced and count_priced[name] != recipe_counts[i]:
+            raise ValueError(f"Cost unit for {name} does not match its recipe unit ({'count' if recipe_counts[i] else 'weight'})")
+    per_unit = costs["Cost per Unit"] / lbs.where(~is_count, 1.0)
+
+    revisions = (costs.assign(per_unit=per_unit)
+                      .sort_values("Effective From")
+                      .pivot_table(index="Effective From", columns="Ingredient", values="per_unit", aggfunc="last")
+                      .reindex(columns=ingredients))
+    month_starts = month_start_dates(months)
+    in_effect = revisions.ffill().reindex(revisions.index.union(month_starts)).ffill().loc[month_starts]
+    return in_effect.fillna(0.0).to_numpy(dtype=float).T
+
+def item_revenue(month_files=tuple(MONTH_FILES)):
+    """Item x month sales amount ($), lower-cased item names like load_monthly_sales."""
+    dfs = [load_month_data(path, sheet, name) for path, sheet, name in month_files if os.path.exists(path)]
+    combined = pd.concat([df for df in dfs if df is not None], ignore_index=True)
+    combined["Item Name"] = combined["Item Name"].astype(str).str.strip().str.lower()
+    months = [name for _, _, name in month_files if name in set(combined["Month"])]
+    return combined.pivot_table(index="Item Name", columns="Month", values="Amount", aggfunc="sum", fill_value=0.0)[months]
+
+def margin_table(revenue, sales, costs=None):
+    """
+    Revenue, ingredient cost and margin as item x month frames, plus the per-serving cost.
+        unit cost (recipe items x months) = recipe matrix @ cost matrix
+        cost (sold items x months)        = servings * unit cost of each item's recipe row
+    Items without a recipe (drinks, sides) carry no ingredient cost. With no costs at all,
+    margin equals revenue.
+    """
+    items, ingredients, recipe = load_recipe_matrix()
+    months = list(revenue.columns)
+    servings = sales.reindex(index=revenue.index, columns=months).fillna(0.0).to_numpy(dtype=float)
+
+    if costs is None or costs.empty:
+        unit_cost = np.zeros((len(items), len(months)))
+    else:
+        unit_cost = recipe @ cost_matrix(costs, ingredients, months)
+
+    row = match_items(tuple(revenue.index), tuple(items), MIN_MATCH_SCORE)
+    has_recipe = row >= 0
+    item_unit_cost = np.where(has_recipe[:, None], unit_cost[np.where(has_recipe, row, 0)], 0.0)
+    cost = servings * item_unit_cost
+    margin = revenue.to_numpy(dtype=float) - cost
+
+    frame = lambda values: pd.DataFrame(values, index=revenue.index, columns=months)
+    return {
+        "revenue": revenue,
+        "cost": frame(cost),
+        "margin": frame(margin),
+        "unit_cost": frame(item_unit_cost),
+        "has_recipe": pd.Series(has_recipe, index=revenue.index),
+        "recipe_row": pd.Series(row, index=revenue.index),
+    }
+
+def pattern_hits(names, items, special_matches=SPECIAL_MATCHES):
+    """
+    Recipe items x sales names: how many of each recipe item's patterns (its own name, or its
+    SPECIAL_MATCHES) the sales name contains. The item -> sales mapping of load_ingredient_data.
+    """
+    names = pd.Series(list(names), dtype=str)
+    hits = np.zeros((len(items), len(names)))
+    for r, item in enumerate(items):
+        for pattern in special_matches.get(item, [item]):
+            hits[r] += names.str.contains(pattern, case=False, na=False).to_numpy()
+    return hits
+
+def ingredient_margin(margins):
+    """
+    Ingredient x month margin of the items that use each ingredient, attributed the way
+    load_ingredient_data does it (substring patterns, a sale counted once per matching
+    pattern), as two matrix products: uses (ingredients x recipe items) @ hits @ margin.
+    Without costs this equals load_ingredient_data's revenue per ingredient.
+    """
+    items, ingredients, recipe = load_recipe_matrix()
+    uses = (recipe != 0).T.astype(float)
+    hits = pattern_hits(margins["margin"].index, items)
+    values = uses @ (hits @ margins["margin"].to_numpy(dtype=float))
+    return pd.DataFrame(values, index=ingredients, columns=margins["margin"].columns)
+
+@st.cache_data
+def load_margins(costs_path=COSTS_PATH):
+    """Margin tables for the Data_Matrix months; `has_costs` tells whether a cost file was found."""
+    costs = load_costs(costs_path)
+    margins = margin_table(item_revenue(), load_monthly_sales(), costs)
+    margins["ingredient_margin"] = ingredient_margin(margins)
+    margins["has_costs"] = costs is not None and not costs.empty
+    return margins
+
+
+if __name__ == "__main__":
+    # python margins.py (from streamlit_app/) -> margin per item, all months
+    m = load_margins()
+    if not m["has_costs"]:
+        print(f"No cost file at {COSTS_PATH}; margins equal revenue.")
+    print(m["margin"].assign(Total=m["margin"].sum(axis=1)).sort_values("Total", ascending=False).round(2).head(30).to_string())
@@ -2,60 +2,22 @@ import streamlit as st
 import pandas as pd
 import altair as alt
 import re
+from data_loaders import FORECAST_CSV as CSV_FILEPATH, data_version, load_forecast_store, ingredient_frame
+from procurement import recommend_orders
+from safety_stock import SERVICE_LEVEL, load_reorder_table
+from charts import downsample, show_chart
 
 # PAGE CONFIGURATION
 st.set_page_config(layout="wide", page_title="Ingredient Demand Forecast Viewer")
 
-# --- Configuration ---
-# Updated to match the name of the file created by the forecasting script
-CSV_FILEPATH = r"C:\Users\emily\Documents\Datathon\tamu-datathon-project\streamlit_app\pages\Predictive_Analysis\ingredient_forecast_with_constraints.csv"
-# Assuming 6 historical data points (May through October 2025)
-HISTORICAL_MONTHS = 6 
-
-
-# --- DATA LOADING AND PREPROCESSING ---
-@st.cache_data
-def load_data():
-    """Loads, cleans, and pre-processes the ingredient forecast data."""
-    try:
-        df = pd.read_csv(CSV_FILEPATH)
-
-        # Rename columns to standardized, easier-to-use names
-        df = df.rename(columns={
-            'Date' : 'ds', # Prophet's date column
-            'Forecast_LBS_or_Count': 'yhat', # Standardized forecast (LBS/Count) - Use this for plotting
-            'Forecasted_Usage_Original_Unit': 'yhat_raw_unit', # Original forecast (Grams/Count)
-            'Ingredient' : 'ingredient',
-            'Monthly_Supply_Constraint': 'supply',
-            'Constraint_Unit': 'unit',
-            'Shortfall_Surplus': 'shortfall',
-            'Action_Required': 'action_required'
-        })
-       
-        # Drop columns not needed for visualization to keep dataframe clean
-        df = df.drop(columns=['Month_Label'])
-
-        # Convert date column to datetime objects
-        df['ds'] = pd.to_datetime(df['ds'])
-
-        # Determine the period for visualization
-        df['period'] = df.groupby('ingredient').cumcount()
-        df['period'] = df['period'].apply(lambda x: 'Historical Proxy' if x < HISTORICAL_MONTHS else 'Future Forecast')
-        
-        return df
-    except FileNotFoundError:
-        st.error(f"Error: The file '{CSV_FILEPATH}' was not found. Please ensure it is available.")
-        return pd.DataFrame()
-    except Exception as e:
-        st.error(f"Error loading or processing data: {e}")
-        return pd.DataFrame()
-
-
 # --- CHART GENERATION FUNCTIONS ---
 
-def create_trend_chart(df, ingredient_name, unit):
+def create_trend_chart(store, ingredient_name, unit):
     """Creates the interactive time series Altair chart for a single ingredient."""
-    df_filtered = df[df['ingredient'] == ingredient_name].sort_values('ds')
+    df_filtered = ingredient_frame(store, ingredient_name)
+    # Only the drawn columns go into the spec, and long histories are downsampled
+    drawn = [c for c in ['ds', 'yhat', 'yhat_lower', 'yhat_upper', 'period'] if c in df_filtered.columns]
+    df_filtered = downsample(df_filtered[drawn], 'ds', 'yhat')
     
     # Base chart setup
     base = alt.Chart(df_filtered).encode(
@@ -71,6 +33,11 @@ def create_trend_chart(df, ingredient_name, unit):
     # 1. Continuous Line
     line = base.mark_line(color="#750e2b", strokeWidth=3) 
 
+    # Forecast interval band, when the forecast carries one
+    if {'yhat_lower', 'yhat_upper'}.issubset(df_filtered.columns):
+        band = base.mark_area(color="#750e2b", opacity=0.15).encode(y='yhat_lower', y2='yhat_upper')
+        line = band + line
+
     # 2. Colored Points: Used to visually encode the period (Historical vs Future).
     points = base.mark_circle(size=80).encode(
         color=alt.Color('period', 
@@ -82,10 +49,10 @@ def create_trend_chart(df, ingredient_name, unit):
 
     
     # Add a rule/line for the transition point (end of historical data)
-    transition_df = df_filtered[df_filtered['period'] == 'Future Forecast']
-    if not transition_df.empty:
+    historical_data = ingredient_frame(store, ingredient_name, 'Historical Proxy')
+    if len(historical_data) < len(df_filtered):
         # Get the date just before the forecast starts (end of historical period)
-        historical_end_date = df_filtered[df_filtered['period'] == 'Historical Proxy']['ds'].max()
+        historical_end_date = historical_data['ds'].max()
         rule = alt.Chart(pd.DataFrame({'date': [historical_end_date]})).mark_rule(
             strokeDash=[5, 5], 
             color='#94a3b8',
@@ -102,13 +69,13 @@ def create_trend_chart(df, ingredient_name, unit):
     ).interactive()
 
 
-def calculate_metrics(df_filtered):
+def calculate_metrics(store, ingredient_name):
     """Calculates key metrics for the selected ingredient."""
-    if df_filtered.empty:
+    if ingredient_name not in store['bounds']:
         return None
 
-    historical_data = df_filtered[df_filtered['period'] == 'Historical Proxy']
-    forecast_data = df_filtered[df_filtered['period'] == 'Future Forecast']
+    historical_data = ingredient_frame(store, ingredient_name, 'Historical Proxy')
+    forecast_data = ingredient_frame(store, ingredient_name, 'Future Forecast')
     
     metrics = {}
     
@@ -135,28 +102,55 @@ def calculate_metrics(df_filtered):
     return metrics
 
 
+def create_comparison_chart(store, ingredient_names, indexed):
+    """Overlays the forecast trend of several ingredients; optionally indexed to their first month = 100."""
+    frames = []
+    for name in ingredient_names:
+        data = ingredient_frame(store, name)[['ds', 'yhat', 'period', 'unit']].assign(ingredient=name)
+        if indexed and len(data) and data['yhat'].iloc[0]:
+            data['yhat'] = data['yhat'] / data['yhat'].iloc[0] * 100
+        frames.append(data)
+    compare_df = downsample(pd.concat(frames, ignore_index=True), 'ds', 'yhat', by='ingredient')
+
+    return alt.Chart(compare_df).mark_line(point=True).encode(
+        x=alt.X('ds', title='Date', axis=alt.Axis(format="%b", tickCount="month")),
+        y=alt.Y('yhat', title='Index (first month = 100)' if indexed else 'Forecasted Quantity', scale=alt.Scale(zero=False)),
+        color=alt.Color('ingredient', title='Ingredient'),
+        strokeDash=alt.StrokeDash('period', title='Forecast Period'),
+        tooltip=[
+            'ingredient',
+            alt.Tooltip('ds', title='Date', format='%Y-%m-%d'),
+            alt.Tooltip('yhat', title='Quantity' if not indexed else 'Index', format=',.1f'),
+            'unit',
+            'period'
+        ]
+    ).properties(title='Ingredient Comparison').interactive()
+
+
 # --- STREAMLIT APP LAYOUT ---
 if __name__ == "__main__":
-    df = load_data()
+    store = load_forecast_store(version=data_version())
+    df = store['frame']
+    ingredients = store['ingredients']
 
     st.title("Ingredient Demand Forecast & Constraint Analysis")
     st.markdown("Use this dashboard to check future demand for ingredients and see if your current shipment schedule is sufficient to cover it.")
 
     if not df.empty:
         # Ingredient Selection (The Dropdown) 
-        default_ingredient = 'braised beef used (g)' if 'braised beef used (g)' in df['ingredient'].unique() else df['ingredient'].iloc[0]
+        default_ingredient = 'braised beef used (g)' if 'braised beef used (g)' in store['bounds'] else ingredients[0]
         
         selected_ingredient = st.selectbox(
             "**Select Ingredient to Analyze:**", 
-            df['ingredient'].unique().tolist(),
-            index=df['ingredient'].unique().tolist().index(default_ingredient) if default_ingredient in df['ingredient'].unique() else 0
+            ingredients,
+            index=ingredients.index(default_ingredient)
         )
 
         st.markdown("---")
         
         # Calculate Metrics and get Unit
-        metrics_df = df[df['ingredient'] == selected_ingredient]
-        metrics = calculate_metrics(metrics_df)
+        metrics_df = ingredient_frame(store, selected_ingredient)
+        metrics = calculate_metrics(store, selected_ingredient)
         unit = metrics.get('Unit', 'Units')
 
         if selected_ingredient and metrics:
@@ -165,8 +159,8 @@ if __name__ == "__main__":
             clean_ingredient = re.sub(r"\s*\(.*?\)", "", selected_ingredient).strip().title()
             st.subheader(f"1. Demand Trend for {clean_ingredient}")
             st.markdown(f"Shows the monthly usage trend, standardized to **{unit}** for supply comparison.")
-            trend_chart = create_trend_chart(df, selected_ingredient, unit)
-            st.altair_chart(trend_chart, use_container_width=True)
+            show_chart("Forecasting_Ingredient_Analysis", ("trend", selected_ingredient),
+                       lambda: create_trend_chart(store, selected_ingredient, unit), use_container_width=True)
 
             
             # --- Section 2: Constraint Summary and Metrics ---
@@ -209,6 +203,25 @@ if __name__ == "__main__":
             st.markdown(f"**{metrics.get('Action Required', 'N/A')}**")
 
 
+            # --- Section 3: Safety Stock & Reorder Point (one table for all ingredients) ---
+            st.markdown("---")
+            st.subheader("Safety Stock & Reorder Point")
+            service_level = st.slider("Target service level (%)", 80.0, 99.9, SERVICE_LEVEL * 100, step=0.5) / 100
+            reorder = load_reorder_table(service_level)
+            if selected_ingredient in reorder.index and pd.notna(reorder.at[selected_ingredient, 'Review Period (days)']):
+                row = reorder.loc[selected_ingredient]
+                col1, col2, col3, col4 = st.columns(4)
+                col1.metric("Safety Stock", f"{row['Safety Stock']:,.1f} {unit}")
+                col2.metric("Reorder Point", f"{row['Reorder Point']:,.1f} {unit}")
+                col3.metric("Days of Cover (per delivery)", f"{row['Days of Cover']:,.1f}")
+                col4.metric("Days Between Deliveries", f"{row['Review Period (days)']:,.1f}")
+            else:
+                st.info("This ingredient is not on the shipment schedule, so it has no reorder point.")
+
+            with st.expander("Reorder report (all ingredients)"):
+                st.dataframe(reorder.round(2), use_container_width=True)
+
+
             # --- Section 4: Raw Data ---
             st.markdown("---")
             st.subheader("Raw Data Points")
@@ -217,6 +230,29 @@ if __name__ == "__main__":
                 use_container_width=True
             )
 
+        # --- Section 5: Compare Ingredients ---
+        st.markdown("---")
+        st.subheader("Compare Ingredients")
+        compared = st.multiselect(
+            "**Ingredients to overlay:**",
+            ingredients,
+            default=[selected_ingredient]
+        )
+        indexed = st.checkbox("Index each series to its first month (= 100), for ingredients in different units", value=True)
+        if compared:
+            show_chart("Forecasting_Ingredient_Analysis", ("compare", compared, indexed),
+                       lambda: create_comparison_chart(store, compared, indexed), use_container_width=True)
+
+        # --- Section 6: Recommended Orders (all ingredients, one optimization) ---
+        st.markdown("---")
+        st.subheader("Recommended Orders")
+        st.markdown("Order quantities for every shipped ingredient and forecast month, solved jointly to minimize shortfall and over-stock in whole packs.")
+        try:
+            plan = recommend_orders()
+            st.dataframe(plan.round(1), use_container_width=True, hide_index=True)
+        except Exception as e:
+            st.warning(f"Order recommendations are unavailable: {e}")
+
     elif df.empty:
         st.warning(f"Data could not be loaded. Please ensure the required CSV file ('{CSV_FILEPATH}') is correctly formatted and available.")
     else:
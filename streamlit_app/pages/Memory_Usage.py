@@ -0,0 +1,77 @@
+import json
+import streamlit as st
+import pandas as pd
+from cache_memory import BUDGET_ACTION, CACHED_LOADERS, MEMORY_BUDGETS_MB, MEMORY_REPORT_PATH, check_budgets, memory_report
+from charts import CHART_CACHE_SIZE, chart_cache_stats, clear_charts
+
+st.set_page_config(page_title="Memory Usage", layout="wide")
+st.title("Cache Memory Usage")
+st.markdown("What each cached loader holds in this server process, which pages keep it alive, and how much each open session stores.")
+
+deep = st.sidebar.checkbox("Measure deep size", value=False,
+                           help="Unpickles every st.cache_data value once to measure the copy each rerun receives.")
+report = memory_report(deep)
+
+# --- TOTALS ---
+c1, c2, c3 = st.columns(3)
+c1.metric("Process memory (RSS)", f"{report['process_rss_mb']:,.0f} MB")
+c2.metric("All caches", f"{report['cache_total_mb']:,.1f} MB", help=f"Budget {MEMORY_BUDGETS_MB.get('total', '—')} MB")
+c3.metric("Open sessions", len(report["sessions"]))
+
+# --- BUDGETS ---
+for message in check_budgets(report, action="warn"):
+    st.warning(message)
+
+# --- BY LOADER ---
+st.subheader("By cached loader")
+st.caption("Resident: memory the cache holds (st.cache_data stores pickles). Deep, when measured: pandas deep memory of the value each call returns; st.cache_data hands every rerun its own copy.")
+loaders = pd.DataFrame(report["loaders"])
+if loaders.empty:
+    st.info("Nothing is cached yet. Open a page or wait for the start-up warm-up.")
+else:
+    loaders["Budget (MB)"] = loaders["Loader"].map(MEMORY_BUDGETS_MB)
+    st.dataframe(loaders.sort_values("Resident", ascending=False).rename(columns={"Resident": "Resident (MB)", "Deep": "Deep (MB)"}),
+                 hide_index=True, use_container_width=True)
+
+# --- BY PAGE / SESSION ---
+left, right = st.columns(2)
+with left:
+    st.subheader("By page")
+    st.dataframe(pd.DataFrame(report["pages"]).T.sort_values("Cache MB", ascending=False), use_container_width=True)
+with right:
+    st.subheader("By session")
+    if report["sessions"]:
+        st.dataframe(pd.Series(report["sessions"], name="Session state MB").sort_values(ascending=False), use_container_width=True)
+    else:
+        st.info("No session information outside a running server.")
+
+# --- CHART CACHE ---
+st.subheader("Chart cache")
+charts = chart_cache_stats()
+k1, k2, k3 = st.columns(3)
+k1.metric("Charts kept", f"{charts['entries']} / {CHART_CACHE_SIZE}")
+k2.metric("Hit rate", f"{charts['hits'] / max(charts['hits'] + charts['misses'], 1):.0%}")
+k3.metric("Payload held", f"{charts['payload_bytes'] / 1024:,.1f} KB", help=f"{charts['build_s']:.2f}s spent building charts so far")
+if not charts["pages"].empty:
+    st.dataframe(charts["pages"], use_container_width=True)
+
+# --- ACTIONS ---
+st.subheader("Actions")
+a1, a2 = st.columns(2)
+with a1:
+    to_clear = st.selectbox("Clear one loader's cache", sorted(CACHED_LOADERS))
+    if st.button("Clear cache"):
+        CACHED_LOADERS[to_clear].clear()
+        st.rerun()
+    if st.button("Clear chart cache"):
+        clear_charts()
+        st.rerun()
+    if st.button("Evict everything over budget"):
+        for message in check_budgets(memory_report(), action="evict"):
+            st.toast(message)
+        st.rerun()
+with a2:
+    st.caption(f"The app writes this report to `{MEMORY_REPORT_PATH.name}` in the background (budget action: {BUDGET_ACTION}).")
+    st.download_button("Download report (JSON)", json.dumps(report, indent=2), file_name="memory_report.json", mime="application/json")
+    with st.expander("Report as JSON"):
+        st.json(report)
@@ -1,9 +1,9 @@
 # pages/Monthly_Shipments.py
-import re
-from pathlib import Path
 import pandas as pd
 import streamlit as st
 import altair as alt
+from data_loaders import DATA_DIR, discover_month_files, load_data1_for_month, load_data2_for_month
+from charts import show_chart
 
 st.set_page_config(page_title="Monthly Matrix • Data 1 & Data 2", layout="wide")
 
@@ -23,76 +23,6 @@ D2_CATEGORIES = [
     "Tossed Rice Noodle", "Wonton"
 ]
 
-# Resolve ../data relative to this page
-DATA_DIR = (Path(__file__).parent.parent / "data").resolve()
-MONTH_FILE_RE = re.compile(r"^([A-Za-z]+)_Data_Matrix\.(xlsx|xls|csv)$", re.I)
-
-def _month_key(m: str) -> int:
-    return pd.to_datetime(m, format="%B").month
-
-def discover_month_files() -> dict[str, Path]:
-    """Return {MonthName -> Path} for files that match *_Data_Matrix.* (calendar order)."""
-    mapping: dict[str, Path] = {}
-    for p in DATA_DIR.glob("*_Data_Matrix.*"):
-        m = MONTH_FILE_RE.match(p.name)
-        if not m:
-            continue
-        month_name = m.group(1).capitalize()
-        mapping[month_name] = p
-    return dict(sorted(mapping.items(), key=lambda kv: _month_key(kv[0])))
-
-# ---------- Loaders with October swap ----------
-@st.cache_data(show_spinner=False)
-def load_data1_for_month(path: Path, month_label: str) -> pd.DataFrame:
-    """Load Data 1, except for October where we take 'data 3'."""
-    sheet_name = "data 3" if month_label.lower() == "october" else "data 1"
-    if path.suffix.lower() == ".csv":
-        df = pd.read_csv(path)  # CSV: assume correct format
-    else:
-        df = pd.read_excel(path, sheet_name=sheet_name, engine="openpyxl")
-    df.columns = [c.strip() for c in df.columns]
-
-    required = {"Group", "Amount"}
-    if not required.issubset(df.columns):
-        raise ValueError(f"Missing one of {required} in {path.name} ({sheet_name})")
-
-    out = df[["Group", "Amount"]].copy()
-    out["Amount"] = (
-        out["Amount"].astype("string")
-        .str.replace(r"[\$,]", "", regex=True)
-        .replace({"": "0", pd.NA: "0"})
-    ).astype(float)
-    out["Group"] = out["Group"].astype("string").fillna("").str.strip()
-    out["Month"] = month_label
-    return out
-
-@st.cache_data(show_spinner=False)
-def load_data2_for_month(path: Path, month_label: str) -> pd.DataFrame:
-    """Load Data 2, except for October where we take 'data 1'."""
-    sheet_name = "data 1" if month_label.lower() == "october" else "data 2"
-    if path.suffix.lower() == ".csv":
-        df = pd.read_csv(path)
-    else:
-        df = pd.read_excel(path, sheet_name=sheet_name, engine="openpyxl")
-    df.columns = [c.strip() for c in df.columns]
-
-    required = {"Category", "Count", "Amount"}
-    if not required.issubset(df.columns):
-        missing = required - set(df.columns)
-        raise ValueError(f"Missing one of {required} in {path.name} ({sheet_name}). Missing: {missing}")
-
-    out = df[["Category", "Count", "Amount"]].copy()
-    out["Category"] = out["Category"].astype("string").fillna("").str.strip()
-    out["Count"] = pd.to_numeric(out["Count"], errors="coerce").fillna(0)
-    out["Amount"] = (
-        out["Amount"].astype("string")
-        .str.replace(r"[\$,]", "", regex=True)
-        .replace({"": "0", pd.NA: "0"})
-    )
-    out["Amount"] = pd.to_numeric(out["Amount"], errors="coerce").fillna(0.0)
-    out["Month"] = month_label
-    return out
-
 # ---------- UI ----------
 tabs = st.tabs(["Data 1 — Stacked Revenue", "Data 2 — Category Pies"])
 
@@ -143,24 +73,25 @@ with tabs[0]:
     tot = long.groupby("Month", as_index=False)["Amount"].sum().rename(columns={"Amount": "Total"})
     long = long.merge(tot, on="Month", how="left")
 
-    chart = (
-        alt.Chart(long)
-        .mark_bar()
-        .encode(
-            x=alt.X("Month:N", sort=months_d1, axis=alt.Axis(labelAngle=0), title=None),
-            y=alt.Y("Amount:Q", stack="zero", title="Total ($)"),
-            color=alt.Color("Group:N", scale=color_scale, title="Group"),
-            order=alt.Order("Group:N"),
-            tooltip=[
-                alt.Tooltip("Month:N"),
-                alt.Tooltip("Group:N"),
-                alt.Tooltip("Amount:Q", format=",.2f", title="Group Amount ($)"),
-                alt.Tooltip("Total:Q", format=",.2f", title="Month Total ($)"),
-            ],
+    def build_stacked_chart():
+        return (
+            alt.Chart(long)
+            .mark_bar()
+            .encode(
+                x=alt.X("Month:N", sort=months_d1, axis=alt.Axis(labelAngle=0), title=None),
+                y=alt.Y("Amount:Q", stack="zero", title="Total ($)"),
+                color=alt.Color("Group:N", scale=color_scale, title="Group"),
+                order=alt.Order("Group:N"),
+                tooltip=[
+                    alt.Tooltip("Month:N"),
+                    alt.Tooltip("Group:N"),
+                    alt.Tooltip("Amount:Q", format=",.2f", title="Group Amount ($)"),
+                    alt.Tooltip("Total:Q", format=",.2f", title="Month Total ($)"),
+                ],
+            )
+            .properties(height=430)
         )
-        .properties(height=430)
-    )
-    st.altair_chart(chart, use_container_width=True)
+    show_chart("Monthly_Category_Income", ("stacked", months_d1, d1_groups), build_stacked_chart, use_container_width=True)
 
     with st.expander("Show totals table"):
         st.dataframe(
@@ -210,17 +141,18 @@ with tabs[1]:
         if cats_selected:
             color_scale = alt.Scale(domain=cats_selected, scheme="tableau10")
             legend_df = pd.DataFrame({"Category": cats_selected})
-            legend_chart = (
-                alt.Chart(legend_df)
-                .mark_rect(width=14, height=14)
-                .encode(
-                    y=alt.Y("Category:N", sort=cats_selected, axis=alt.Axis(title=None)),
-                    color=alt.Color("Category:N", scale=color_scale, legend=None),
+            def build_legend_chart():
+                return (
+                    alt.Chart(legend_df)
+                    .mark_rect(width=14, height=14)
+                    .encode(
+                        y=alt.Y("Category:N", sort=cats_selected, axis=alt.Axis(title=None)),
+                        color=alt.Color("Category:N", scale=color_scale, legend=None),
+                    )
+                    .properties(width=200, height=min(24 * len(cats_selected), 360))
                 )
-                .properties(width=200, height=min(24 * len(cats_selected), 360))
-            )
             st.markdown("**Legend**")
-            st.altair_chart(legend_chart, use_container_width=False)
+            show_chart("Monthly_Category_Income", ("legend", cats_selected), build_legend_chart, use_container_width=False)
         else:
             color_scale = alt.Scale(domain=[], scheme="tableau10")
         per_row = 2
@@ -242,27 +174,28 @@ with tabs[1]:
             for i in range(0, len(m_sel), per_row):
                 row = st.columns(per_row, gap="large")
                 for col, month in zip(row, m_sel[i:i+per_row]):
-                    dfm = agg[agg["Month"] == month]
+                    dfm = agg.loc[agg["Month"] == month, ["Category", "Amount", "Count"]]
                     if dfm.empty:
                         continue
                     total_amt = dfm["Amount"].sum()
                     title = f"{month} • ${total_amt:,.0f}"
-                    pie = (
-                        alt.Chart(dfm, title=title)
-                        .mark_arc(outerRadius=110, innerRadius=0)
-                        .encode(
-                            theta=alt.Theta("Amount:Q", stack=True),
-                            color=alt.Color("Category:N", scale=color_scale, legend=None),
-                            tooltip=[
-                                alt.Tooltip("Category:N"),
-                                alt.Tooltip("Count:Q", format=",.0f", title="Units"),
-                                alt.Tooltip("Amount:Q", format=",.2f", title="Sales ($)"),
-                            ],
+                    def build_pie_chart():
+                        return (
+                            alt.Chart(dfm, title=title)
+                            .mark_arc(outerRadius=110, innerRadius=0)
+                            .encode(
+                                theta=alt.Theta("Amount:Q", stack=True),
+                                color=alt.Color("Category:N", scale=color_scale, legend=None),
+                                tooltip=[
+                                    alt.Tooltip("Category:N"),
+                                    alt.Tooltip("Count:Q", format=",.0f", title="Units"),
+                                    alt.Tooltip("Amount:Q", format=",.2f", title="Sales ($)"),
+                                ],
+                            )
+                            .properties(width=300, height=300)
                         )
-                        .properties(width=300, height=300)
-                    )
                     with col:
-                        st.altair_chart(pie, use_container_width=False)
+                        show_chart("Monthly_Category_Income", ("pie", month, cats_selected), build_pie_chart, use_container_width=False)
 
     with st.expander("Show raw table (Data 2)"):
         st.dataframe(d2.sort_values(["Month", "Category"]), use_container_width=True)
@@ -0,0 +1,130 @@
+# predictive_analysis/backtest.py
+
+import argparse
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from pages.Predictive_Analysis.forecast_models import (
+    FIT_ERRORS, MODEL_CONFIGS, check_config, config_name, fit_predict, month_start_dates)
+from shared_arrays import init_worker, published, split_frames, worker_data
+
+LEADERBOARD_CSV = Path(__file__).parent / "backtest_leaderboard.csv"
+
+logger = logging.getLogger(__name__)
+
+
+def rolling_origins(n_periods, min_train=3, horizon=1):
+    """Cutoffs for rolling-origin evaluation: train on [0, c), score [c, c + horizon)."""
+    return list(range(min_train, n_periods - horizon + 1))
+
+def _backtest_task(series, row, config, cutoffs, horizon):
+    """
+    One series x one configuration over every cutoff -> (cutoffs x horizon) forecasts and the
+    number of folds whose fit failed (left as NaN). Only FIT_ERRORS count as failed folds;
+    anything else is a bug and stops the backtest.
+    """
+    shared = worker_data()
+    ds, y = shared["ds"], shared["values"][row]
+    features = shared["features"] if config.get("exog") else None
+    preds = np.full((len(cutoffs), horizon), np.nan)
+    failed = 0
+    for k, cutoff in enumerate(cutoffs):
+        try:
+            preds[k] = fit_predict(config, ds[:cutoff], y[:cutoff], horizon, features=features)
+        except FIT_ERRORS as e:
+            failed += 1
+            logger.warning("%s / %s: fit failed at cutoff %d: %s", series, config_name(config), cutoff, e)
+    return series, config_name(config), preds, failed
+
+def score(actual, predicted):
+    """
+    Vectorized error metrics over the last two axes (cutoffs x horizon) of same-shaped arrays.
+    Returns MAPE and WAPE in percent and bias as (forecast - actual) / actual in percent.
+    """
+    valid = ~np.isnan(predicted) & ~np.isnan(actual)
+    err = np.where(valid, predicted - actual, 0.0)
+    abs_actual = np.where(valid, np.abs(actual), 0.0)
+    axes = (-2, -1)
+
+    nonzero = valid & (abs_actual > 0)
+    ape = np.where(nonzero, np.abs(err) / np.where(nonzero, abs_actual, 1.0), 0.0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mape = ape.sum(axis=axes) / nonzero.sum(axis=axes)
+        wape = np.abs(err).sum(axis=axes) / abs_actual.sum(axis=axes)
+        bias = err.sum(axis=axes) / abs_actual.sum(axis=axes)
+    return {"MAPE": mape * 100, "WAPE": wape * 100, "Bias": bias * 100, "Folds": valid.any(axis=-1).sum(axis=-1)}
+
+def run_backtest(history, configs=MODEL_CONFIGS, min_train=3, horizon=1, max_workers=None, features=None):
+    """
+    Rolling-origin cross-validation of every configuration on every row of `history`
+    (series x periods; columns are month names or 'YYYY-MM'). Each (series, config) pair is
+    one task on a process pool; metrics are computed for all tasks at once afterwards.
+    Configurations with "exog" share one feature matrix (feature_store), built once here.
+    The history and feature values are published once in shared memory; tasks only name a row.
+    Returns a leaderboard frame sorted by series, then failed folds (a config whose fits failed
+    is scored on fewer folds, so it ranks behind every config that completed), then WAPE.
+    """
+    for config in configs:
+        check_config(config)
+    ds = month_start_dates(history.columns)
+    values = history.to_numpy(dtype=float)
+    cutoffs = rolling_origins(len(ds), min_train, horizon)
+    if not cutoffs:
+        raise ValueError(f"Need more than {min_train + horizon - 1} periods to backtest; got {len(ds)}.")
+    if features is None and any(c.get("exog") for c in configs):
+        from feature_store import features_for
+        features = features_for(ds, horizon)
+
+    tasks = [(series, i, config, cutoffs, horizon) for i, series in enumerate(history.index) for config in configs]
+    skeleton, arrays = split_frames({"ds": ds, "values": values, "features": features})
+    with published(arrays) as manifest, \
+            ProcessPoolExecutor(max_workers=max_workers or os.cpu_count(), initializer=init_worker,
+                                initargs=(manifest, skeleton)) as pool:
+        results = list(pool.map(_backtest_task, *zip(*tasks), chunksize=max(1, len(tasks) // (4 * (os.cpu_count() or 1)))))
+
+    row_of = {s: i for i, s in enumerate(history.index)}
+    predicted = np.stack([preds for _, _, preds, _ in results])
+    target = np.arange(horizon)[None, :] + np.array(cutoffs)[:, None]
+    actual = values[[row_of[s] for s, _, _, _ in results]][:, target]
+
+    metrics = score(actual, predicted)
+    board = pd.DataFrame({
+        "Series": [s for s, _, _, _ in results],
+        "Config": [c for _, c, _, _ in results],
+        **metrics,
+        "Failed": [failed for _, _, _, failed in results],
+    })
+    board = board.sort_values(["Series", "Failed", "WAPE"], na_position="last")
+    board["Rank"] = board.groupby("Series").cumcount() + 1
+    return board.reset_index(drop=True)
+
+def best_configs(board):
+    """Winning configuration per series (rank 1 on WAPE)."""
+    return board[board["Rank"] == 1].set_index("Series")["Config"]
+
+
+if __name__ == "__main__":
+    # From streamlit_app/: python -m pages.Predictive_Analysis.backtest [--level ingredient|item]
+    from data_loaders import load_monthly_sales
+    from recipes import ingredient_usage
+
+    parser = argparse.ArgumentParser(description="Rolling-origin backtest of the forecast models.")
+    parser.add_argument("--level", choices=["ingredient", "item"], default="ingredient")
+    parser.add_argument("--min-train", type=int, default=3)
+    parser.add_argument("--horizon", type=int, default=1)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    sales = load_monthly_sales()
+    history = ingredient_usage(sales) if args.level == "ingredient" else sales
+    board = run_backtest(history, min_train=args.min_train, horizon=args.horizon, max_workers=args.workers)
+    board.to_csv(LEADERBOARD_CSV, index=False)
+    print(board[board["Rank"] == 1].round(2).to_string(index=False))
+    if board["Failed"].any():
+        print(f"{int(board['Failed'].sum())} fold fits failed; see the Failed column")
+    print(f"Leaderboard written to {LEADERBOARD_CSV}")
@@ -1,15 +1,35 @@
 # predictive_analysis/combined_prev_months.py
 
 import pandas as pd
+import logging
 import os
+import re
 
-def combine_previous_months():
+logger = logging.getLogger(__name__)
+
+# Rows per chunk when streaming transaction-level POS exports
+STREAM_CHUNKSIZE = 200_000
+
+# Header names tried in order (after lower-casing and collapsing punctuation to spaces), then
+# whole-word keywords; "Discount" or "Updated" never match "count" / "date"
+COUNT_COLUMNS = (("sales count", "count", "qty", "quantity"), ("count", "qty", "quantity"))
+DATE_COLUMNS = (("date", "sale date", "order date", "transaction date", "datetime"), ("date", "time"))
+
+def combine_previous_months(streaming=False, chunksize=STREAM_CHUNKSIZE):
     """
     Combines all monthly sales CSV files from the 'dataset' folder into one cleaned DataFrame.
+    With streaming=True the files are read in chunks and aggregated to item x month on the fly
+    (see stream_previous_months), so line-item exports never have to fit in memory.
     """
     dataset_folder = "data"
     output_file = "cleaned_item_sales.csv"
 
+    if streaming:
+        daily, monthly = stream_previous_months(dataset_folder, chunksize=chunksize)
+        daily.to_csv("cleaned_item_daily_sales.csv", index=False)
+        monthly.to_csv(output_file, index=False)
+        return monthly
+
     all_data = []
 
     for file in sorted(os.listdir(dataset_folder)):
@@ -28,3 +48,103 @@ def combine_previous_months():
     # Save
     combined.to_csv(output_file, index=False)
     return combined
+
+
+def _normalize(name):
+    return re.sub(r"[^a-z0-9]+", " ", str(name).lower()).strip()
+
+def _pick_column(columns, names, keywords):
+    """
+    The column whose normalized header equals one of `names` (first name wins), else the one
+    containing a keyword as a whole word. Raises ValueError when several columns match a keyword.
+    """
+    normalized = {c: _normalize(c) for c in columns}
+    for name in names:
+        exact = next((c for c, n in normalized.items() if n == name), None)
+        if exact is not None:
+            return exact
+    matches = [c for c, n in normalized.items() if set(n.split()) & set(keywords)]
+    if len(matches) > 1:
+        raise ValueError(f"Ambiguous columns {matches}: expected one of {list(names)}")
+    return matches[0] if matches else None
+
+def _parse_dates(values):
+    # The format is inferred from the first value; rows written differently are re-parsed one by one
+    days = pd.to_datetime(values, errors='coerce')
+    retry = days.isna() & values.notna()
+    if retry.any():
+        days[retry] = pd.to_datetime(values[retry], errors='coerce', format='mixed')
+    return days
+
+def stream_previous_months(dataset_folder="data", chunksize=STREAM_CHUNKSIZE):
+    """
+    Streams every sales CSV in dataset_folder in chunks of `chunksize` rows and returns
+    (daily, monthly) aggregates: [Item Name, Date, Sales Count] and [Item Name, Month, Sales Count].
+
+    Item names are mapped to integer IDs per chunk, and only the running item x day and
+    item x month sums are kept between chunks, so peak memory depends on the chunk size and
+    the number of distinct items/days, not on the number of transaction rows.
+    Files without a date column are treated like the monthly exports (Month = file name).
+    Other CSVs in the folder (recipes, shipments) are skipped: those without an item-name
+    column or with neither a count nor a date column, and those whose headers are ambiguous.
+    """
+    item_ids = {}
+    daily_totals = None
+    monthly_totals = None
+
+    for file in sorted(os.listdir(dataset_folder)):
+        if not file.endswith(".csv"):
+            continue
+        file_path = os.path.join(dataset_folder, file)
+        header = pd.read_csv(file_path, nrows=0).columns
+        item_col = next((c for c in header if 'item' in c.lower() and 'name' in c.lower()), None)
+        if item_col is None:
+            continue
+        try:
+            count_col = _pick_column(header, *COUNT_COLUMNS)
+            date_col = _pick_column(header, *DATE_COLUMNS)
+        except ValueError as e:
+            logger.warning("Skipping %s: %s", file, e)
+            continue
+        if count_col is None and date_col is None:
+            continue
+        usecols = [c for c in (item_col, count_col, date_col) if c is not None]
+
+        for chunk in pd.read_csv(file_path, usecols=usecols, chunksize=chunksize):
+            chunk = chunk.dropna(subset=[item_col])
+            if chunk.empty:
+                continue
+
+            # Map names -> global item IDs (only the chunk's unique names hit the dict)
+            codes, uniques = pd.factorize(chunk[item_col].astype(str).str.strip())
+            for name in uniques:
+                item_ids.setdefault(name, len(item_ids))
+            ids = pd.Index(uniques).map(item_ids).to_numpy()[codes]
+
+            counts = (pd.to_numeric(chunk[count_col], errors='coerce').fillna(0).to_numpy()
+                      if count_col is not None else 1.0)
+
+            if date_col is not None:
+                days = _parse_dates(chunk[date_col]).dt.normalize()
+                months = days.dt.strftime("%Y-%m")
+            else:
+                days = pd.Series(pd.NaT, index=chunk.index)
+                months = pd.Series(file.replace(".csv", ""), index=chunk.index)
+
+            part = pd.DataFrame({"item_id": ids, "Date": days.to_numpy(), "Month": months.to_numpy(), "Sales Count": counts})
+
+            chunk_daily = part.dropna(subset=["Date"]).groupby(["item_id", "Date"])["Sales Count"].sum()
+            chunk_monthly = part.groupby(["item_id", "Month"])["Sales Count"].sum()
+            daily_totals = chunk_daily if daily_totals is None else daily_totals.add(chunk_daily, fill_value=0)
+            monthly_totals = chunk_monthly if monthly_totals is None else monthly_totals.add(chunk_monthly, fill_value=0)
+
+    item_names = pd.Series(list(item_ids.keys()), index=list(item_ids.values()))
+
+    def _to_frame(totals, key):
+        if totals is None or totals.empty:
+            return pd.DataFrame(columns=["Item Name", key, "Sales Count"])
+        out = totals.reset_index()
+        out.insert(0, "Item Name", item_names.reindex(out.pop("item_id")).to_numpy())
+        return out
+
+    return _to_frame(daily_totals, "Date"), _to_frame(monthly_totals, "Month")
@@ -0,0 +1,212 @@
+# predictive_analysis/forecast_models.py
+
+import logging
+
+import numpy as np
+import pandas as pd
+
+# The Data_Matrix workbooks cover May-October 2025 and carry month names only
+HISTORY_YEAR = 2025
+
+# Defaults used by forecasting_w_shipment.py
+CHANGEPOINT_PRIOR_SCALE = 0.01
+CLIP_FACTOR = 5.0
+
+# Ridge penalty on the calendar / exogenous regressors for the fast backends, relative to the
+# number of observations (1.0 = as much weight as the data itself)
+RIDGE = 1.0
+# Prophet prior scale on the same regressors; tight, since six months cannot support more
+# (Prophet's default of 10 lets them swallow the trend: backtest WAPE 22% -> 295%)
+REGRESSOR_PRIOR_SCALE = 0.02
+
+# Configurations compared by the backtest. "model" picks the backend; the rest are its settings.
+# "exog": True adds the feature_store matrix (holidays, terms, events, weather) as regressors.
+MODEL_CONFIGS = [
+    {"model": "prophet", "changepoint_prior_scale": 0.01, "clip_factor": 5.0},
+    {"model": "prophet", "changepoint_prior_scale": 0.05, "clip_factor": 5.0},
+    {"model": "prophet", "changepoint_prior_scale": 0.01, "clip_factor": 2.0},
+    {"model": "prophet", "changepoint_prior_scale": 0.01, "clip_factor": 5.0, "exog": True},
+    {"model": "holt", "alpha": 0.5, "beta": 0.1, "damping": 0.9, "clip_factor": 5.0},
+    {"model": "holt", "alpha": 0.8, "beta": 0.2, "damping": 0.9, "clip_factor": 5.0},
+    {"model": "holt", "alpha": 0.5, "beta": 0.1, "damping": 0.9, "clip_factor": 5.0, "exog": True},
+    {"model": "naive", "clip_factor": 5.0},
+]
+
+# Settings each backend needs besides the optional clip_factor / changepoint_prior_scale / exog
+MODEL_PARAMS = {"prophet": (), "holt": ("alpha", "beta", "damping"), "naive": ()}
+
+# What a fit can raise on valid settings and data: Stan's optimizer giving up, a singular solve
+FIT_ERRORS = (RuntimeError, np.linalg.LinAlgError)
+
+
+def config_name(config):
+    """Short, stable label for a configuration, e.g. 'prophet(cps=0.01, clip=5.0)'."""
+    short = {"changepoint_prior_scale": "cps", "clip_factor": "clip", "alpha": "a", "beta": "b", "damping": "phi"}
+    params = ", ".join(f"{short.get(k, k)}={v}" for k, v in config.items() if k != "model")
+    return f"{config['model']}({params})"
+
+def check_config(config):
+    """Raises ValueError for an unknown backend or a missing setting, before any fit runs."""
+    model = config.get("model")
+    if model not in MODEL_PARAMS:
+        raise ValueError(f"Unknown forecast model {model!r} in {config}; expected one of {list(MODEL_PARAMS)}")
+    missing = [p for p in MODEL_PARAMS[model] if p not in config]
+    if missing:
+        raise ValueError(f"{config_name(config)} is missing {', '.join(missing)}")
+
+def month_start_dates(months, year=HISTORY_YEAR):
+    """Month names ('May') or 'YYYY-MM' labels -> month-start timestamps."""
+    months = [str(m) for m in months]
+    if all(len(m) == 7 and m[4] == "-" for m in months):
+        return pd.to_datetime([m + "-01" for m in months])
+    return pd.to_datetime([f"{m} {year}" for m in months], format="%B %Y")
+
+def clip_history(y, clip_factor):
+    """Same outlier guard as forecasting_w_shipment.py: clip to [0, mean * CLIP_FACTOR]."""
+    y = np.asarray(y, dtype=float)
+    return np.clip(y, 0, y.mean() * clip_factor) if len(y) else y
+
+
+# --- REGRESSORS ---
+def split_features(features, ds, horizon, freq="MS"):
+    """(history rows, future rows) of a feature matrix indexed by period start, aligned to ds and the next `horizon` periods."""
+    future = pd.date_range(ds[-1], periods=horizon + 1, freq=freq)[1:]
+    return features.reindex(ds).fillna(0.0), features.reindex(future).fillna(0.0)
+
+def exog_effects(x_hist, x_future, y, ridge=RIDGE):
+    """
+    Regressor effects for many series at once: y is series x periods over the rows of x_hist.
+    One ridge solve on the standardized features serves every series,
+        B = (Z'Z + ridge * n I)^-1 Z' (Y - mean)
+    Returns (series x periods fitted effects, series x horizon future effects), centered on
+    each series' mean. Features constant over the history carry no information and are dropped.
+    """
+    x_hist, x_future = np.asarray(x_hist, dtype=float), np.asarray(x_future, dtype=float)
+    y = np.atleast_2d(np.asarray(y, dtype=float))
+    mu, sd = x_hist.mean(axis=0), x_hist.std(axis=0)
+    keep = sd > 0
+    if not keep.any():
+        return np.zeros_like(y), np.zeros((len(y), len(x_future)))
+    z_hist = (x_hist[:, keep] - mu[keep]) / sd[keep]
+    z_future = (x_future[:, keep] - mu[keep]) / sd[keep]
+    gram = z_hist.T @ z_hist + ridge * len(z_hist) * np.eye(keep.sum())
+    beta = np.linalg.solve(gram, z_hist.T @ (y - y.mean(axis=1, keepdims=True)).T)
+    return (z_hist @ beta).T, (z_future @ beta).T
+
+def _exog(config, features, ds, horizon, freq):
+    return split_features(features, ds, horizon, freq) if config.get("exog") and features is not None else None
+
+
+# --- BACKENDS ---
+def _holt(y, horizon, alpha, beta, damping, state=None):
+    """
+    Damped additive-trend exponential smoothing.
+    Returns (forecast, final (level, trend), one-step-ahead residuals). Passing a previous
+    fit's (level, trend) as `state` continues that fit over the new values `y` only.
+    """
+    if state is None:
+        level, trend = y[0], (y[1] - y[0]) if len(y) > 1 else 0.0
+        y = y[1:]
+    else:
+        level, trend = state
+    residuals = []
+    for value in y:
+        prev_level = level
+        residuals.append(value - (level + damping * trend))
+        level = alpha * value + (1 - alpha) * (level + damping * trend)
+        trend = beta * (level - prev_level) + (1 - beta) * damping * trend
+    steps = np.cumsum(damping ** np.arange(1, horizon + 1))
+    return level + steps * trend, (level, trend), np.asarray(residuals)
+
+def _prophet(ds, y, horizon, changepoint_prior_scale, freq="MS", n_samples=0, init=None, regressors=None):
+    """
+    Returns (forecast, samples or None, fitted params); samples are horizon x n_samples
+    predictive draws. `init` warm-starts the optimizer from a previous fit's params.
+    `regressors` is (history rows, future rows) from split_features.
+    """
+    from prophet import Prophet
+
+    logging.getLogger("cmdstanpy").setLevel(logging.WARNING)
+    model = Prophet(changepoint_prior_scale=changepoint_prior_scale, uncertainty_samples=max(n_samples, 0))
+    history = pd.DataFrame({"ds": ds, "y": y})
+    columns = []
+    if regressors is not None:
+        x_hist, x_future = regressors
+        columns = [c for c in x_hist.columns if x_hist[c].std() > 0]
+        for c in columns:
+            model.add_regressor(c, prior_scale=REGRESSOR_PRIOR_SCALE)
+        history = history.assign(**{c: x_hist[c].to_numpy() for c in columns})
+    if init is not None:
+        # The changepoint count grows with history; pad or trim the previous deltas to match
+        model.fit(history, init=_resize_deltas(init, model, len(y)))
+    else:
+        model.fit(history)
+    future = model.make_future_dataframe(periods=horizon, freq=freq).tail(horizon)
+    if columns:
+        future = future.assign(**{c: x_future[c].to_numpy() for c in columns})
+    forecast = model.predict(future)
+    samples = model.predictive_samples(future)["yhat"] if n_samples else None
+    return forecast["yhat"].to_numpy(), samples, prophet_params(model)
+
+def prophet_params(model):
+    """Fitted Prophet parameters in the form `Prophet.fit(init=...)` accepts."""
+    return {name: model.params[name][0][0] if name in ("k", "m", "sigma_obs") else model.params[name][0]
+            for name in ("k", "m", "sigma_obs", "delta", "beta")}
+
+def _resize_deltas(init, model, n_obs):
+    n_changepoints = model.n_changepoints
+    hist_size = int(np.floor(n_obs * model.changepoint_range))
+    if n_changepoints + 1 > hist_size:
+        n_changepoints = max(hist_size - 1, 0)
+    delta = np.asarray(init["delta"], dtype=float)[:n_changepoints]
+    delta = np.pad(delta, (0, n_changepoints - len(delta)))
+    # Prophet fits at least one (zero-prior) changepoint even when it has none
+    return {**init, "delta": delta if n_changepoints else np.zeros(1)}
+
+def fit_predict(config, ds, y, horizon, freq="MS", features=None):
+    """
+    Fits one configuration on (ds, y) and returns the next `horizon` point forecasts.
+    With config["exog"], `features` (feature_store matrix) supplies the regressors: Prophet
+    adds them to its model; holt and naive forecast what the regressors do not explain.
+    """
+    y = clip_history(y, config.get("clip_factor", CLIP_FACTOR))
+    model = config["model"]
+    exog = _exog(config, features, ds, horizon, freq)
+    if model == "prophet":
+        return _prophet(ds, y, horizon, config.get("changepoint_prior_scale", CHANGEPOINT_PRIOR_SCALE), freq,
+                        regressors=exog)[0]
+    hist_effect, future_effect = (e[0] for e in exog_effects(*exog, y)) if exog else (0.0, 0.0)
+    y = y - hist_effect
+    if model == "holt":
+        return _holt(y, horizon, config["alpha"], config["beta"], config["damping"])[0] + future_effect
+    if model == "naive":
+        return np.repeat(y[-1], horizon) + future_effect
+    raise ValueError(f"Unknown forecast model: {model}")
+
+def fit_predict_samples(config, ds, y, horizon, n_samples=500, freq="MS", seed=0, features=None, effects=None):
+    """
+    Like fit_predict, plus a horizon x n_samples array of predictive samples.
+    Prophet draws its own; the fast backends use Gaussian noise scaled by the one-step
+    residual spread and sqrt(steps ahead). `effects` passes this series' row of a batch
+    exog_effects() call, so the fast backends skip their own regression.
+    """
+    y = clip_history(y, config.get("clip_factor", CLIP_FACTOR))
+    model = config["model"]
+    exog = _exog(config, features, ds, horizon, freq)
+    if model == "prophet":
+        return _prophet(ds, y, horizon, config.get("changepoint_prior_scale", CHANGEPOINT_PRIOR_SCALE), freq, n_samples,
+                        regressors=exog)[:2]
+
+    if effects is None:
+        effects = tuple(e[0] for e in exog_effects(*exog, y)) if exog else (0.0, 0.0)
+    y = y - effects[0]
+    if model == "holt":
+        point, _, residuals = _holt(y, horizon, config["alpha"], config["beta"], config["damping"])
+    elif model == "naive":
+        point, residuals = np.repeat(y[-1], horizon), np.diff(y)
+    else:
+        raise ValueError(f"Unknown forecast model: {model}")
+    point = point + effects[1]
+    sigma = residuals.std() if len(residuals) > 1 else 0.0
+    noise = np.random.default_rng(seed).standard_normal((horizon, n_samples))
+    return point, point[:, None] + sigma * np.sqrt(np.arange(1, horizon + 1))[:, None] * noise
@@ -42,7 +42,7 @@ def run_forecasting_with_shipments():
         model = Prophet(changepoint_prior_scale=CHANGEPOINT_PRIOR_SCALE)
         model.fit(df)
 
-        future = model.make_future_dataframe(periods=FUTURE_MONTHS, freq="M")
+        future = model.make_future_dataframe(periods=FUTURE_MONTHS, freq="MS")
         forecast = model.predict(future)
 
         recent_shipments = shipments[shipments["Ingredient"].str.contains(ingredient, case=False, na=False)]
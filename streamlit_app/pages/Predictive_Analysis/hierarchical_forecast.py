@@ -0,0 +1,164 @@
+# predictive_analysis/hierarchical_forecast.py
+
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from pages.Predictive_Analysis.forecast_models import (
+    CLIP_FACTOR, clip_history, exog_effects, fit_predict_samples, month_start_dates, split_features)
+from shared_arrays import init_worker, published, split_frames, worker_data
+
+# Item-level model; every recipe item is forecast with it and ingredients are derived from items
+ITEM_CONFIG = {"model": "prophet", "changepoint_prior_scale": 0.01, "clip_factor": 5.0}
+HORIZON = 3
+N_SAMPLES = 500
+INTERVAL = (0.1, 0.9)  # same 80% band as Prophet's default interval_width
+
+
+def _item_task(config, row, horizon, n_samples):
+    shared = worker_data()
+    effects = (shared["effects"][0][row], shared["effects"][1][row]) if shared["effects"] is not None else None
+    return fit_predict_samples(config, shared["ds"], shared["values"][row], horizon, n_samples, seed=row,
+                               features=shared["features"], effects=effects)
+
+def forecast_items(history, config=ITEM_CONFIG, horizon=HORIZON, n_samples=N_SAMPLES, max_workers=None, incremental=False):
+    """
+    Forecasts every row of `history` (items x months) in one batch on a process pool, or with
+    `incremental` only the items whose history changed since the stored state (incremental.py).
+    With config["exog"] every item gets the same calendar / exogenous feature matrix; for the
+    fast backends the regressor effects of all items come from one ridge solve here. Sales,
+    features and effects are published once in shared memory; tasks only name a row.
+    Returns (future dates, items x horizon point forecasts, items x horizon x n_samples samples).
+    Sales cannot be negative, so forecasts and samples are floored at zero.
+    """
+    if incremental:
+        from pages.Predictive_Analysis.incremental import update_forecasts
+
+        future, point, samples, _ = update_forecasts(history, config, horizon, n_samples, max_workers=max_workers)
+        return future, np.maximum(point, 0.0), np.maximum(samples, 0.0)
+
+    ds = month_start_dates(history.columns)
+    future = pd.date_range(ds[-1], periods=horizon + 1, freq="MS")[1:]
+    values = history.to_numpy(dtype=float)
+    n = len(values)
+
+    features, effects = None, None
+    if config.get("exog"):
+        from feature_store import features_for
+
+        features = features_for(ds, horizon)
+        if config["model"] != "prophet":
+            clipped = np.stack([clip_history(v, config.get("clip_factor", CLIP_FACTOR)) for v in values])
+            effects = exog_effects(*split_features(features, ds, horizon), clipped)
+
+    skeleton, arrays = split_frames({"ds": ds, "values": values, "features": features, "effects": effects})
+    with published(arrays) as manifest, \
+            ProcessPoolExecutor(max_workers=max_workers or os.cpu_count(), initializer=init_worker,
+                                initargs=(manifest, skeleton)) as pool:
+        results = list(pool.map(_item_task, [config] * n, range(n), [horizon] * n, [n_samples] * n))
+
+    point = np.maximum(np.stack([p for p, _ in results]), 0.0)
+    samples = np.maximum(np.stack([s for _, s in results]), 0.0)
+    return future, point, samples
+
+def project(recipe_matrix, point, samples):
+    """
+    items x horizon forecasts and items x horizon x n samples -> ingredient space in one
+    matrix multiply: the point forecast rides along as sample 0.
+    """
+    n_items, horizon, n_samples = samples.shape
+    stacked = np.concatenate([point[:, :, None], samples], axis=2).reshape(n_items, -1)
+    projected = (recipe_matrix.T @ stacked).reshape(-1, horizon, n_samples + 1)
+    return projected[:, :, 0], projected[:, :, 1:]
+
+def hierarchical_forecast(sales=None, config=ITEM_CONFIG, horizon=HORIZON, n_samples=N_SAMPLES, max_workers=None, incremental=False):
+    """
+    Bottom-up ingredient forecast: item sales -> item forecasts -> recipe matrix.
+    Returns a long frame [ds, ingredient, yhat, yhat_lower, yhat_upper, period] in lbs (or count),
+    historical usage first, then the forecast months.
+    """
+    from data_loaders import load_monthly_sales
+    from recipes import load_recipe_matrix, sales_by_recipe_item
+
+    sales = load_monthly_sales() if sales is None else sales
+    items, ingredients, matrix = load_recipe_matrix()
+    item_history = pd.DataFrame(sales_by_recipe_item(sales, items), index=items, columns=sales.columns)
+
+    future, point, samples = forecast_items(item_history, config, horizon, n_samples, max_workers, incremental)
+    yhat, ingredient_samples = project(matrix, point, samples)
+    lower, upper = np.quantile(ingredient_samples, INTERVAL, axis=2)
+    history = matrix.T @ item_history.to_numpy()
+
+    n_hist = history.shape[1]
+    dates = np.concatenate([month_start_dates(sales.columns), future])
+    values = np.hstack([history, yhat])
+    return pd.DataFrame({
+        "ds": np.tile(dates, len(ingredients)),
+        "ingredient": np.repeat(ingredients, len(dates)),
+        "yhat": values.ravel(),
+        "yhat_lower": np.hstack([history, lower]).ravel(),
+        "yhat_upper": np.hstack([history, upper]).ravel(),
+        "period": np.tile(["Historical Proxy"] * n_hist + ["Future Forecast"] * horizon, len(ingredients)),
+    })
+
+def to_constraint_table(forecast, shipments):
+    """
+    Lays a hierarchical forecast out like ingredient_forecast_with_constraints.csv, with the
+    80% interval as Forecast_Lower / Forecast_Upper. Monthly supply is the shipment schedule's
+    'Total monthly shipment' (load_shipments), split between ingredients sharing a line by
+    their forecast share for the month.
+    """
+    from data_loaders import COUNT_INGREDIENTS, HISTORY_ACTION
+    from recipes import G_TO_LBS, SHIPMENT_INGREDIENT, split_line_supply
+
+    ship = shipments.assign(Ingredient=shipments["Ingredient"].astype(str).str.strip()).drop_duplicates("Ingredient").set_index("Ingredient")
+    line = forecast["ingredient"].map(SHIPMENT_INGREDIENT)
+    supply = split_line_supply(forecast["ingredient"], ship["Total monthly shipment"], forecast["yhat"], by=forecast["ds"])
+    unit = line.map(ship["Unit of shipment"]).fillna(
+        pd.Series(np.where(forecast["ingredient"].isin(COUNT_INGREDIENTS), "count", "lbs"), index=forecast.index))
+    to_raw = np.where(forecast["ingredient"].isin(COUNT_INGREDIENTS), 1.0, 1 / G_TO_LBS)
+
+    shortfall = supply - forecast["yhat"]
+    action = np.where(forecast["period"] == "Historical Proxy", HISTORY_ACTION,
+             np.where(supply.isna(), "No Shipment Schedule",
+             np.where(shortfall < 0, "⚠️ SHORTFALL: Order More", "✅ Sufficient Supply")))
+    return pd.DataFrame({
+        "Month_Label": forecast["ds"].dt.strftime("%b"),
+        "Date": forecast["ds"].dt.strftime("%Y-%m-%d"),
+        "Ingredient": forecast["ingredient"],
+        "Forecasted_Usage_Original_Unit": forecast["yhat"] * to_raw,
+        "Constraint_Unit": unit,
+        "Forecast_LBS_or_Count": forecast["yhat"],
+        "Forecast_Lower": forecast["yhat_lower"],
+        "Forecast_Upper": forecast["yhat_upper"],
+        "Monthly_Supply_Constraint": supply,
+        "Shortfall_Surplus": shortfall,
+        "Action_Required": action,
+    })
+
+
+if __name__ == "__main__":
+    # From streamlit_app/: python -m pages.Predictive_Analysis.hierarchical_forecast
+    from data_loaders import FORECAST_CSV, load_shipments
+
+    parser = argparse.ArgumentParser(description="Bottom-up ingredient forecast through the recipe matrix.")
+    parser.add_argument("--horizon", type=int, default=HORIZON)
+    parser.add_argument("--samples", type=int, default=N_SAMPLES)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--output", default=str(FORECAST_CSV))
+    parser.add_argument("--update", action="store_true", help="only refit items whose sales history changed")
+    parser.add_argument("--exog", action="store_true", help="add the calendar / exogenous features (feature_store.py) as regressors")
+    args = parser.parse_args()
+
+    if args.exog and args.update:
+        parser.error("--exog refits every item; it cannot be combined with --update")
+    config = {**ITEM_CONFIG, "exog": True} if args.exog else ITEM_CONFIG
+    forecast = hierarchical_forecast(config=config, horizon=args.horizon, n_samples=args.samples,
+                                     max_workers=args.workers, incremental=args.update)
+    table = to_constraint_table(forecast, load_shipments())
+    table.to_csv(args.output, index=False)
+    print(table[table["Action_Required"] != "Historical Data"].round(1).to_string(index=False))
+    print(f"Forecast written to {args.output}")
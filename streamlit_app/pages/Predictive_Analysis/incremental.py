@@ -0,0 +1,158 @@
+# predictive_analysis/incremental.py
+
+import argparse
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from data_loaders import STATE_DIR, read_state, state_lock, write_state
+from pages.Predictive_Analysis.forecast_models import CHANGEPOINT_PRIOR_SCALE, CLIP_FACTOR, _holt, _prophet, month_start_dates
+
+STATE_PATH = STATE_DIR / "forecast_state.pkl"
+
+# Every FULL_REFIT_EVERY updates all series are refit from scratch and compared with the updates
+FULL_REFIT_EVERY = 6
+REFIT_TOLERANCE = 0.05  # mean relative drift before an update is reported as diverging
+
+
+def _digest(y):
+    return hashlib.sha1(np.asarray(y, dtype=float).tobytes()).hexdigest()
+
+def _residual_stats(residuals, stats=(0, 0.0, 0.0)):
+    """Running (count, sum, sum of squares) so the residual spread updates in O(new points)."""
+    n, total, squares = stats
+    return n + len(residuals), total + residuals.sum(), squares + (residuals ** 2).sum()
+
+def _sigma(stats):
+    n, total, squares = stats
+    return np.sqrt(max(squares / n - (total / n) ** 2, 0.0)) if n > 1 else 0.0
+
+def fit_series(config, ds, y, horizon, n_samples, seed=0, previous=None):
+    """
+    Fits (or, given the `previous` state of the same series, updates) one series and returns
+    its new state: the model state, history length and digest, whether it was warm-started,
+    and the current forecast and samples. Holt and naive continue from their stored state over the new points only;
+    Prophet refits warm-started from the previous parameters.
+    """
+    y = np.asarray(y, dtype=float)
+    model = config["model"]
+    start = previous["n_obs"] if previous else 0
+    new = y[start:]
+
+    # Same outlier guard as clip_history, with the mean kept as a running sum
+    clip_sum = (previous["clip_sum"] if previous else 0.0) + new.sum()
+    clip_limit = clip_sum / len(y) * config.get("clip_factor", CLIP_FACTOR)
+    clipped = np.clip(new, 0, clip_limit)
+
+    state = {"n_obs": len(y), "digest": _digest(y), "clip_sum": clip_sum, "warm": previous is not None}
+    if model == "prophet":
+        history = np.concatenate([previous["clipped"], clipped]) if previous else clipped
+        point, samples, params = _prophet(
+            ds, history, horizon, config.get("changepoint_prior_scale", CHANGEPOINT_PRIOR_SCALE),
+            n_samples=n_samples, init=previous["params"] if previous else None)
+        state.update(clipped=history, params=params, point=point, samples=samples)
+        return state
+
+    if model == "holt":
+        point, level_trend, residuals = _holt(clipped, horizon, config["alpha"], config["beta"], config["damping"],
+                                              state=previous["level_trend"] if previous else None)
+        state["level_trend"] = level_trend
+    elif model == "naive":
+        last = np.concatenate([[previous["last"]], clipped]) if previous else clipped
+        point, residuals = np.repeat(last[-1], horizon), np.diff(last)
+        state["last"] = last[-1]
+    else:
+        raise ValueError(f"Unknown forecast model: {model}")
+
+    stats = _residual_stats(residuals, previous["residuals"] if previous else (0, 0.0, 0.0))
+    noise = np.random.default_rng(seed).standard_normal((horizon, n_samples))
+    samples = point[:, None] + _sigma(stats) * np.sqrt(np.arange(1, horizon + 1))[:, None] * noise
+    state.update(residuals=stats, point=point, samples=samples)
+    return state
+
+def _needs(previous, y):
+    """'fit' for new series or revised history, 'update' if it only grew, None if unchanged."""
+    if previous is None or len(y) < previous["n_obs"] or _digest(y[:previous["n_obs"]]) != previous["digest"]:
+        return "fit"
+    return "update" if len(y) > previous["n_obs"] else None
+
+def load_state(state_path=STATE_PATH):
+    return read_state(state_path)
+
+def update_forecasts(history, config, horizon, n_samples, state_path=STATE_PATH, full_refit=False, max_workers=None):
+    """
+    Forecasts every row of `history` (series x months), reusing the stored state: unchanged
+    series keep their forecast, grown series are updated, new or revised series are fit.
+    Without a stored state, or when the config or horizon changed, every series is fit once.
+    Otherwise a full refit runs when asked or every FULL_REFIT_EVERY updates: each series whose
+    forecast comes from warm-started updates is also fit from scratch, compared with its
+    incremental result ("Drift vs Full Refit") and replaced by the fresh fit.
+    Returns (future dates, series x horizon point forecasts, series x horizon x n_samples samples, report).
+    """
+    ds = month_start_dates(history.columns)
+    future = pd.date_range(ds[-1], periods=horizon + 1, freq="MS")[1:]
+    values = history.to_numpy(dtype=float)
+
+    with state_lock(state_path):
+        stored = load_state(state_path)
+        settings = {"config": config, "horizon": horizon, "n_samples": n_samples}
+        fresh = stored is None or stored["settings"] != settings
+        if fresh:
+            stored = {"settings": settings, "series": {}, "updates": 0}
+        full_refit = not fresh and (full_refit or stored["updates"] + 1 >= FULL_REFIT_EVERY)
+
+        previous = [stored["series"].get(s) for s in history.index]
+        actions = [_needs(p, values[i]) for i, p in enumerate(previous)]
+        tasks = [i for i, a in enumerate(actions) if a]
+        # Warm-started after this run: updated now, or updated before and unchanged since
+        refits = [i for i, (a, p) in enumerate(zip(actions, previous))
+                  if full_refit and (a == "update" or (a is None and p.get("warm", True)))]
+
+        with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count()) as pool:
+            updated = pool.map(fit_series, *zip(*[
+                (config, ds, values[i], horizon, n_samples, i, previous[i] if actions[i] == "update" else None)
+                for i in tasks])) if tasks else []
+            refitted = pool.map(fit_series, *zip(*[(config, ds, values[i], horizon, n_samples, i) for i in refits])) if refits else []
+            updated, refitted = dict(zip(tasks, updated)), dict(zip(refits, refitted))
+
+        states = [updated.get(i) or previous[i] for i in range(len(values))]
+        report = pd.DataFrame({"Series": history.index, "Action": [a or "unchanged" for a in actions]})
+        if full_refit:
+            drift = np.full(len(values), np.nan)
+            for i, fresh in refitted.items():
+                drift[i] = np.abs(states[i]["point"] - fresh["point"]).mean() / max(np.abs(fresh["point"]).mean(), 1e-9)
+                states[i] = fresh
+            report["Drift vs Full Refit"] = drift
+            report["Diverged"] = drift > REFIT_TOLERANCE
+
+        write_state(state_path, {
+            "settings": settings,
+            "series": dict(zip(history.index, states)),
+            "updates": 0 if fresh or full_refit else stored["updates"] + bool(tasks),
+        })
+
+    point = np.stack([s["point"] for s in states])
+    samples = np.stack([s["samples"] for s in states])
+    return future, point, samples, report
+
+
+if __name__ == "__main__":
+    # From streamlit_app/: python -m pages.Predictive_Analysis.incremental [--full-refit]
+    from data_loaders import load_monthly_sales
+    from pages.Predictive_Analysis.hierarchical_forecast import HORIZON, ITEM_CONFIG, N_SAMPLES
+    from recipes import load_recipe_matrix, sales_by_recipe_item
+
+    parser = argparse.ArgumentParser(description="Incremental update of the item forecasts.")
+    parser.add_argument("--full-refit", action="store_true")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    sales = load_monthly_sales()
+    items = load_recipe_matrix()[0]
+    history = pd.DataFrame(sales_by_recipe_item(sales, items), index=items, columns=sales.columns)
+    _, _, _, report = update_forecasts(history, ITEM_CONFIG, HORIZON, N_SAMPLES,
+                                       full_refit=args.full_refit, max_workers=args.workers)
+    print(report.round(4).to_string(index=False))
@@ -17,12 +17,22 @@ def run_forecast():
     grouped = df.groupby("Date")["Sales Count"].sum().reset_index()
     grouped.rename(columns={"Date": "ds", "Sales Count": "y"}, inplace=True)
 
+    # Calendar / exogenous regressors from the shared feature matrix (run from streamlit_app/)
+    from feature_store import features_for
+    from pages.Predictive_Analysis.forecast_models import REGRESSOR_PRIOR_SCALE, split_features
+
+    x_hist, x_future = split_features(features_for(grouped["ds"], 3), pd.DatetimeIndex(grouped["ds"]), 3)
+    regressors = [c for c in x_hist.columns if x_hist[c].std() > 0]
+
     # Prophet forecast
     model = Prophet(yearly_seasonality=True)
-    model.fit(grouped)
+    for c in regressors:
+        model.add_regressor(c, prior_scale=REGRESSOR_PRIOR_SCALE)
+    model.fit(grouped.assign(**{c: x_hist[c].to_numpy() for c in regressors}))
 
-    future = model.make_future_dataframe(periods=3, freq="M")
-    forecast = model.predict(future)
+    future = model.make_future_dataframe(periods=3, freq="MS")
+    features = pd.concat([x_hist, x_future]).reindex(future["ds"]).fillna(0.0)
+    forecast = model.predict(future.assign(**{c: features[c].to_numpy() for c in regressors}))
 
     result = forecast[["ds", "yhat", "yhat_lower", "yhat_upper"]]
     result.to_csv("ingredient_demand_forecast.csv", index=False)
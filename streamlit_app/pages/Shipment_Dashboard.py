@@ -3,6 +3,9 @@ import pandas as pd
 import numpy as np
 import altair as alt
 from pathlib import Path
+from data_loaders import data_version
+from recipes import load_usage_by_line
+from inventory_sim import REORDER_LEAD_DAYS, project_stock
 
 st.set_page_config(page_title="Mai Shan Yan Shipments", layout="wide")
 st.title("Ingredients Shipment Dashboard")
@@ -28,7 +31,7 @@ df["Total monthly shipment"] = df["quantityshipment"] * freq
 
 df["Total monthly shipment"] = df["Total monthly shipment"].fillna(0)
 
-tab_monthly= st.tabs(["📊 Monthly Shipments"])
+tab_monthly, tab_stock = st.tabs(["📊 Monthly Shipments", "📈 Stock Timeline"])
 
 freq_options = ["All", "Weekly", "Biweekly", "Monthly"]
 freq_selected = st.sidebar.selectbox(
@@ -87,4 +90,50 @@ chart = (
     )
     .properties(height=420)
 )
-st.altair_chart(chart, width='stretch')
\ No newline at end of file
+with tab_monthly:
+    st.altair_chart(chart, width='stretch')
+
+# ---------- Stock timeline (inventory simulation) ----------
+with tab_stock:
+    st.caption("Projected on-hand stock per day: scheduled deliveries minus average daily usage (item sales × recipes), with spoilage.")
+    usage = load_usage_by_line(version=data_version())
+    if usage is None:
+        st.info("No monthly sales workbooks could be read, so there is no usage to project stock from.")
+        st.stop()
+
+    c1, c2, c3 = st.columns(3)
+    start = c1.date_input("Start date", value=(pd.Timestamp.today() + pd.offsets.MonthBegin(1)).date())
+    horizon = c2.slider("Days to simulate", min_value=30, max_value=365, value=90)
+    lead_days = c3.slider("Reorder lead time (days)", min_value=1, max_value=14, value=REORDER_LEAD_DAYS)
+
+    stock, summary = project_stock(df, usage, pd.Timestamp(start), horizon, lead_days=lead_days)
+    names = summary["Ingredient"].tolist()
+    picked = st.multiselect("Ingredients", names, default=names[:4])
+
+    if picked:
+        shown = stock[stock["Ingredient"].isin(picked)]
+        lines = (
+            alt.Chart(shown)
+            .mark_line(strokeWidth=2)
+            .encode(
+                x=alt.X("Date:T", title="Date"),
+                y=alt.Y("On Hand:Q", title="Projected On Hand"),
+                color=alt.Color("Ingredient:N"),
+                tooltip=[
+                    alt.Tooltip("Ingredient:N"),
+                    alt.Tooltip("Date:T", format="%Y-%m-%d"),
+                    alt.Tooltip("On Hand:Q", format=",.1f"),
+                    alt.Tooltip("Spoiled:Q", format=",.1f"),
+                    alt.Tooltip("Shortfall:Q", format=",.1f"),
+                ],
+            )
+        )
+        reorder = (
+            alt.Chart(summary[summary["Ingredient"].isin(picked)])
+            .mark_rule(strokeDash=[5, 5])
+            .encode(y="Reorder Point:Q", color=alt.Color("Ingredient:N"))
+        )
+        st.altair_chart((lines + reorder).properties(height=420).interactive(), width='stretch')
+        st.caption("Dashed lines are reorder points (daily usage × lead time).")
+
+    st.dataframe(summary.round(1), width='stretch', hide_index=True)
\ No newline at end of file
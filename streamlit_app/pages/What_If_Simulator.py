@@ -0,0 +1,74 @@
+import time
+import streamlit as st
+import pandas as pd
+import numpy as np
+import altair as alt
+from what_if import load_what_if_model, baseline_sales, evaluate
+
+st.set_page_config(page_title="What-If Demand Simulator", layout="wide")
+st.title("What-If Demand Simulator")
+st.markdown("Scale menu item sales or add new servings and see the effect on monthly ingredient demand against the current shipment schedule.")
+
+model = load_what_if_model()
+
+# --- BASELINE ---
+st.sidebar.header("🧮 Scenario")
+baseline_choice = st.sidebar.selectbox("Baseline month", ["Average month"] + model["months"])
+base = baseline_sales(model, None if baseline_choice == "Average month" else baseline_choice)
+
+# --- ADJUSTMENTS ---
+adjusted = st.multiselect(
+    "**Menu items to adjust:**",
+    model["items"],
+    format_func=str.title,
+    default=["beef tossed ramen"] if "beef tossed ramen" in model["items"] else [],
+)
+
+scale = np.zeros(len(model["items"]))
+extra = np.zeros(len(model["items"]))
+for item in adjusted:
+    i = model["items"].index(item)
+    col1, col2 = st.columns([2, 1])
+    pct = col1.slider(f"{item.title()} — change in sales (%)", -100, 200, 20, step=5, key=f"pct_{item}")
+    add = col2.number_input(f"Extra servings / month", min_value=0, value=0, step=10, key=f"extra_{item}")
+    scale[i] = pct / 100.0
+    extra[i] = add
+
+start = time.perf_counter()
+base_demand, scenario_demand, balance = evaluate(model, base, scale, extra)
+elapsed_ms = (time.perf_counter() - start) * 1000
+
+# --- RESULTS ---
+result = pd.DataFrame({
+    "Ingredient": model["lines"],
+    "Unit": model["units"],
+    "Baseline Demand": base_demand,
+    "Scenario Demand": scenario_demand,
+    "Change": scenario_demand - base_demand,
+    "Monthly Supply": model["supply"],
+    "Shortfall / Surplus": balance,
+})
+result["Status"] = np.where(result["Shortfall / Surplus"] < 0, "⚠️ SHORTFALL", "✅ Covered")
+
+st.markdown("---")
+col1, col2, col3 = st.columns(3)
+col1.metric("Ingredients short", int((balance < 0).sum()), delta=int((balance < 0).sum() - (model["supply"] - base_demand < 0).sum()), delta_color="inverse")
+col2.metric("Largest shortfall", f"{result.loc[result['Shortfall / Surplus'].idxmin(), 'Ingredient']}" if (balance < 0).any() else "None")
+col3.metric("Scenario compute time", f"{elapsed_ms:.2f} ms")
+
+long = result.melt(id_vars=["Ingredient", "Unit"], value_vars=["Scenario Demand", "Monthly Supply"], var_name="Series", value_name="Quantity")
+chart = (
+    alt.Chart(long)
+    .mark_bar()
+    .encode(
+        x=alt.X("Ingredient:N", title="Ingredient", axis=alt.Axis(labelAngle=-45)),
+        xOffset="Series:N",
+        y=alt.Y("Quantity:Q", title="Per Month"),
+        color=alt.Color("Series:N", scale=alt.Scale(domain=["Scenario Demand", "Monthly Supply"], range=["#D41919", "#94a3b8"])),
+        tooltip=["Ingredient:N", "Unit:N", "Series:N", alt.Tooltip("Quantity:Q", format=",.1f")],
+    )
+    .properties(height=420)
+)
+st.altair_chart(chart, use_container_width=True)
+
+st.dataframe(result.round(1), use_container_width=True, hide_index=True)
@@ -0,0 +1,115 @@
+# procurement.py — order quantities for every shipment line and period from one batched MIP
+import numpy as np
+import pandas as pd
+import streamlit as st
+from scipy import sparse
+from scipy.optimize import Bounds, LinearConstraint, milp
+
+from data_loaders import COUNT_INGREDIENTS, FREQ_MAP, load_forecast_data, load_shipments
+from recipes import G_TO_LBS, usage_by_shipment_line
+
+# Objective weights: a unit short costs far more than a unit carried over
+SHORTFALL_COST = 10.0
+OVERSTOCK_COST = 1.0
+ORDER_COST = 0.01  # per pack, breaks ties towards fewer packs
+
+# Storage cap per shipment line (same unit as the shipment). Lines not listed are uncapped.
+STORAGE_CAPS = {}
+
+# Upper bound on packs per delivery, as a multiple of today's 'Number of shipments'
+MAX_PACKS_MULTIPLIER = 3
+
+
+def forecast_demand_by_line(forecast=None):
+    """Future-forecast demand as shipment lines x months, in shipment units (lbs or count)."""
+    forecast = load_forecast_data() if forecast is None else forecast
+    future = forecast[forecast["period"] == "Future Forecast"]
+    to_unit = np.where(future["ingredient"].isin(COUNT_INGREDIENTS), 1.0, G_TO_LBS)
+    demand = (future.assign(qty=future["yhat_raw_unit"] * to_unit)
+                    .pivot_table(index="ingredient", columns="ds", values="qty", aggfunc="sum"))
+    demand.columns = [c.strftime("%Y-%m") for c in demand.columns]
+    return usage_by_shipment_line(demand)
+
+def optimize_orders(demand, shipments, initial_stock=0.0, storage_caps=None, integer=True, time_limit=30):
+    """
+    Solves one MIP over all lines and periods (HiGHS via scipy.optimize.milp).
+
+    Per line i and period t, with pack size q_i:
+        stock[i,t] = stock[i,t-1] + q_i * packs[i,t] - demand[i,t] + short[i,t]
+        stock[i,t-1] + q_i * packs[i,t] <= cap_i
+        0 <= packs[i,t] <= deliveries_per_month_i * MAX_PACKS_MULTIPLIER * current packs per delivery
+    minimizing SHORTFALL_COST * short + OVERSTOCK_COST * stock + ORDER_COST * packs.
+    `stock` is the ending inventory carried into the next period; `short` is unmet demand.
+
+    Returns a long frame [Ingredient, Period, Unit, Demand, Packs, Packs per Delivery,
+    Order Qty, Ending Stock, Shortfall].
+    """
+    shipments = shipments.assign(Ingredient=shipments["Ingredient"].astype(str).str.strip()).drop_duplicates("Ingredient")
+    lines = [l for l in demand.index if l in set(shipments["Ingredient"])]
+    ship = shipments.set_index("Ingredient").loc[lines]
+    d = demand.loc[lines].to_numpy(dtype=float)
+    n_lines, n_periods = d.shape
+    size = n_lines * n_periods
+
+    q = ship["Quantity per shipment"].to_numpy(dtype=float)
+    per_month = ship["frequency"].astype(str).str.strip().str.lower().map(FREQ_MAP).fillna(1).to_numpy(dtype=float)
+    max_packs = per_month * ship["Number of shipments"].to_numpy(dtype=float) * MAX_PACKS_MULTIPLIER
+    caps = storage_caps if storage_caps is not None else STORAGE_CAPS
+    cap = np.array([caps.get(l, np.inf) for l in lines], dtype=float)
+    init = np.broadcast_to(np.asarray(initial_stock, dtype=float), (n_lines,))
+
+    # Variable blocks [packs | stock | short], each flattened line-major (i * n_periods + t)
+    idx = np.arange(size)
+    line_of = idx // n_periods
+    first = (idx % n_periods) == 0
+    eye = sparse.identity(size, format="csr")
+    prev = sparse.csr_matrix((np.ones((~first).sum()), (idx[~first], idx[~first] - 1)), shape=(size, size))
+    packs_q = sparse.diags(q[line_of])
+
+    # Balance: q*packs - stock + stock_prev + short = demand - init (first period)
+    balance = sparse.hstack([packs_q, -eye + prev, eye])
+    rhs = d.ravel() - np.where(first, init[line_of], 0.0)
+    constraints = [LinearConstraint(balance, rhs, rhs)]
+
+    # Storage: stock_prev + q*packs <= cap - init (first period)
+    capped = np.isfinite(cap[line_of])
+    if capped.any():
+        storage = sparse.hstack([packs_q, prev, sparse.csr_matrix((size, size))]).tocsr()[capped]
+        upper = (cap[line_of] - np.where(first, init[line_of], 0.0))[capped]
+        constraints.append(LinearConstraint(storage, -np.inf, upper))
+
+    cost = np.concatenate([np.full(size, ORDER_COST), np.full(size, OVERSTOCK_COST), np.full(size, SHORTFALL_COST)])
+    upper_bounds = np.concatenate([max_packs[line_of], np.full(2 * size, np.inf)])
+    integrality = np.concatenate([np.full(size, 1 if integer else 0), np.zeros(2 * size)])
+
+    res = milp(cost, constraints=constraints, bounds=Bounds(0, upper_bounds),
+               integrality=integrality, options={"time_limit": time_limit})
+    if res.x is None:
+        raise RuntimeError(f"Procurement model could not be solved: {res.message}")
+
+    packs, stock, short = res.x[:size], np.maximum(res.x[size:2 * size], 0.0), np.maximum(res.x[2 * size:], 0.0)
+    if integer:
+        packs = np.round(packs)
+    return pd.DataFrame({
+        "Ingredient": np.repeat(lines, n_periods),
+        "Period": np.tile(list(demand.columns), n_lines),
+        "Unit": np.repeat(ship["Unit of shipment"].to_numpy(), n_periods),
+        "Demand": d.ravel(),
+        "Packs": packs,
+        "Packs per Delivery": packs / per_month[line_of],
+        "Order Qty": packs * q[line_of],
+        "Ending Stock": stock,
+        "Shortfall": short,
+    })
+
+@st.cache_data(show_spinner="Optimizing orders...")
+def recommend_orders(initial_stock=0.0):
+    """Order plan for the current forecast and shipment schedule."""
+    return optimize_orders(forecast_demand_by_line(), load_shipments(), initial_stock)
+
+
+if __name__ == "__main__":
+    # python procurement.py (from streamlit_app/) -> procurement_plan.csv
+    plan = recommend_orders()
+    plan.to_csv("procurement_plan.csv", index=False)
+    print(plan.round(1).to_string(index=False))
@@ -0,0 +1,197 @@
+# recipes.py — items x ingredients recipe matrix and sales -> ingredient usage in matrix form
+import os
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+from scipy import sparse
+
+from data_loaders import COUNT_INGREDIENTS, DATA_DIR, INGREDIENTS_PATH, load_monthly_sales
+
+G_TO_LBS = 0.00220462
+
+# Nested recipes (bill of materials), one row per part: [Parent, Component, Quantity].
+# Component is another menu item or prep batch (Quantity in servings / batches) or an ingredient
+# column of the recipe CSV (Quantity in that column's unit, g or count). Parents need no row
+# in the recipe CSV, so combos, lunch specials and prep batches are defined here.
+BOM_PATH = DATA_DIR / "MSY Data - Components.csv"
+
+# Recipe column -> shipment schedule line ("MSY Data - Shipment.csv" Ingredient).
+# Units already agree after grams -> lbs; None means the ingredient is not on the schedule.
+SHIPMENT_INGREDIENT = {
+    'braised beef used (g)': 'Beef',
+    'Braised Chicken(g)': 'Chicken',
+    'Braised Pork(g)': None,
+    'Egg(count)': 'Egg',
+    'Rice(g)': 'Rice',
+    'Ramen (count)': 'Ramen',
+    'Rice Noodles(g)': 'Rice Noodles',
+    'chicken thigh (pcs)': None,
+    'Chicken Wings (pcs)': 'Chicken Wings',
+    'flour (g)': 'Flour',
+    'Pickle Cabbage': None,
+    'Green Onion': 'Green Onion',
+    'Cilantro': 'Cilantro',
+    'White onion': 'White Onion',
+    'Peas(g)': 'Peas + Carrot',
+    'Carrot(g)': 'Peas + Carrot',
+    'Boychoy(g)': 'Bokchoy',
+    'Tapioca Starch': 'Tapioca Starch',
+}
+
+
+def resolve_bom(items, ingredients, matrix, bom):
+    """
+    Flattens nested recipes into raw ingredients per serving.
+
+    With C the nodes x nodes "contains" matrix (C[p, c] servings of c in one p) and R the
+    nodes x ingredients direct amounts, the flattened recipe is the closure
+        F = (I + C + C^2 + ...) R
+    which ends after at most depth(BOM) terms. A product that is still non-zero after as
+    many terms as there are nodes means a cycle, reported with ValueError. So is a component
+    that has no recipe row, no parts of its own and is not an ingredient column: it would
+    otherwise count as zero ingredients.
+    Returns (nodes, F) with the recipe items first, then the parents and prep batches of the BOM.
+    """
+    bom = bom.assign(Parent=bom["Parent"].astype(str).str.strip().str.lower(),
+                     Component=bom["Component"].astype(str).str.strip(),
+                     Quantity=pd.to_numeric(bom["Quantity"], errors="coerce").fillna(0.0))
+    column = {c.lower(): j for j, c in enumerate(ingredients)}
+    raw = bom["Component"].str.lower().isin(column)
+    parts = bom[~raw].assign(Component=bom.loc[~raw, "Component"].str.lower())
+
+    known = set(items)
+    unknown = sorted(set(parts["Component"]) - known - set(bom["Parent"]))
+    if unknown:
+        raise ValueError(f"Recipe components with no recipe, parts or ingredient column: {', '.join(unknown)}")
+    nodes = [*items, *dict.fromkeys(x for x in [*bom["Parent"], *parts["Component"]] if x not in known)]
+    index = {}
+    for i, name in enumerate(nodes):
+        index.setdefault(name, i)
+    n = len(nodes)
+
+    # Direct amounts: the recipe rows, plus ingredients listed as BOM components (converted like the CSV)
+    ing_j = bom.loc[raw, "Component"].str.lower().map(column).to_numpy(dtype=int)
+    scale = np.where([ingredients[j] in COUNT_INGREDIENTS for j in ing_j], 1.0, G_TO_LBS)
+    extra = sparse.coo_matrix((bom.loc[raw, "Quantity"].to_numpy() * scale,
+                               (bom.loc[raw, "Parent"].map(index).to_numpy(dtype=int), ing_j)),
+                              shape=(n, len(ingredients)))
+    direct = sparse.vstack([sparse.csr_matrix(matrix), sparse.csr_matrix((n - len(items), len(ingredients)))]) + extra
+
+    contains = sparse.coo_matrix((parts["Quantity"].to_numpy(),
+                                  (parts["Parent"].map(index).to_numpy(dtype=int),
+                                   parts["Component"].map(index).to_numpy(dtype=int))),
+                                 shape=(n, n)).tocsr()
+    closure, term = sparse.identity(n, format="csr"), contains
+    for _ in range(n):
+        if term.nnz == 0:
+            break
+        closure = closure + term
+        term = (term @ contains).tocsr()
+        term.eliminate_zeros()
+    else:
+        if term.nnz:
+            looping = [nodes[i] for i in np.unique(term.nonzero()[0])]
+            raise ValueError(f"Recipe components form a cycle; items that reach it: {', '.join(looping)}")
+    return nodes, (closure @ direct).toarray()
+
+@st.cache_data
+def load_recipe_matrix(ingredients_path=INGREDIENTS_PATH, bom_path=BOM_PATH, version=None):
+    """
+    Returns (items, ingredients, matrix): lower-cased recipe item names, ingredient column
+    names and the items x ingredients per-serving amounts in lbs (or count). When the BOM file
+    exists, its parents and prep batches are added as items and every nested recipe is resolved
+    to raw ingredients here, once, so usage stays a single matrix product.
+    Pass data_version() as version where an edited recipe or components CSV must be picked up.
+    """
+    recipes = pd.read_csv(ingredients_path)
+    recipes.columns = [c.strip() for c in recipes.columns]
+    ingredients = list(recipes.columns[1:])
+
+    matrix = recipes[ingredients].apply(pd.to_numeric, errors='coerce').fillna(0.0).to_numpy(dtype=float, copy=True)
+    grams = np.array([c not in COUNT_INGREDIENTS for c in ingredients])
+    matrix[:, grams] *= G_TO_LBS
+
+    items = recipes['Item name'].astype(str).str.strip().str.lower().tolist()
+    if bom_path and os.path.exists(bom_path):
+        items, matrix = resolve_bom(items, ingredients, matrix, pd.read_csv(bom_path))
+    return items, ingredients, matrix
+
+def normalize_item_name(name):
+    """Same normalization Ingredient Insights applies before fuzzy matching."""
+    name = str(name).strip().lower()
+    if "fried chicken" in name:
+        return "Fried Wings"
+    if "cutlet" in name:
+        return "Chicken Cutlet"
+    return ''.join(c for c in name if c.isalpha() or c.isspace()).strip()
+
+@st.cache_data
+def match_items(names, items, min_score=0):
+    """
+    Recipe row index for every sales item name (fuzzy match, one lookup per unique name);
+    -1 when nothing matches with at least `min_score`.
+    """
+    from thefuzz import process
+
+    recipe_names = pd.Series(items)
+    lookup = {}
+    for name in set(names):
+        match = process.extractOne(normalize_item_name(name), recipe_names)
+        lookup[name] = items.index(match[0]) if match and match[1] >= min_score else -1
+    return np.array([lookup[n] for n in names], dtype=int)
+
+def sales_by_recipe_item(sales, items):
+    """Collapses an item x period sales frame onto the recipe items (unmatched rows dropped)."""
+    idx = match_items(tuple(sales.index), tuple(items))
+    keep = idx >= 0
+    out = np.zeros((len(items), sales.shape[1]))
+    np.add.at(out, idx[keep], sales.to_numpy(dtype=float)[keep])
+    return out
+
+def ingredient_usage(sales, ingredients_path=INGREDIENTS_PATH, version=None):
+    """Ingredients x periods usage for an item x period sales frame: one recipe-matrix product (version: see load_recipe_matrix)."""
+    items, ingredients, matrix = load_recipe_matrix(ingredients_path, version=version)
+    usage = matrix.T @ sales_by_recipe_item(sales, items)
+    return pd.DataFrame(usage, index=ingredients, columns=sales.columns)
+
+def usage_by_shipment_line(usage):
+    """Sums ingredient usage rows onto the shipment schedule lines they are delivered as."""
+    lines = usage.index.map(lambda c: SHIPMENT_INGREDIENT.get(c))
+    mapped = usage[lines.notna()]
+    return mapped.groupby(lines[lines.notna()]).sum()
+
+@st.cache_data(show_spinner=False)
+def load_usage_by_line(version=None):
+    """
+    Shipment lines x months usage from the monthly workbooks, or None when no workbook parses.
+    Pass data_version() as version; the workbooks are re-read only when it changes.
+    """
+    sales = load_monthly_sales.__wrapped__()
+    return None if sales is None else usage_by_shipment_line(ingredient_usage(sales, version=version))
+
+def split_line_supply(ingredients, line_supply, demand, by=None):
+    """
+    Supply per row of `ingredients` from the supply per shipment line. Ingredients delivered on
+    one line (Peas + Carrot) split it in proportion to their demand within each `by` group
+    (e.g. month), evenly when the line has no demand, so a shared line is counted once.
+    NaN for ingredients that are not on the schedule.
+    """
+    ingredients = pd.Series(ingredients)
+    line = ingredients.map(SHIPMENT_INGREDIENT)
+    demand = pd.Series(np.asarray(demand, dtype=float), index=ingredients.index).clip(lower=0)
+    keys = [line] if by is None else [line, pd.Series(np.asarray(by), index=ingredients.index)]
+    total = demand.groupby(keys).transform("sum")
+    count = demand.groupby(keys).transform("size")
+    share = (demand / total).where(total > 0, 1 / count)
+    return line.map(line_supply) * share
+
+def shipment_line_matrix(ingredients):
+    """(lines, ingredients x lines 0/1 matrix) so that usage @ matrix gives usage per shipment line."""
+    mapped = [SHIPMENT_INGREDIENT.get(c) for c in ingredients]
+    lines = sorted({l for l in mapped if l is not None})
+    matrix = np.zeros((len(ingredients), len(lines)))
+    for i, line in enumerate(mapped):
+        if line is not None:
+            matrix[i, lines.index(line)] = 1.0
+    return lines, matrix
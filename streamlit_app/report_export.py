@@ -0,0 +1,249 @@
+# report_export.py — bulk report pack (HTML or Excel) for every ingredient, item and month, rendered over a process pool
+import html
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from pathlib import Path
+
+import pandas as pd
+import plotly.io as pio
+from plotly.offline import get_plotlyjs
+
+import data_loaders as dl
+import margins
+import stores
+from data_loaders import COUNT_INGREDIENTS, MONTH_ORDER
+from safety_stock import reorder_table
+from shared_arrays import attach, join_frames, published, split_frames
+
+REPORTS_DIR = dl.APP_DIR / "reports"
+TOP_ITEMS_PER_MONTH = 15
+
+
+# --- DATASET (computed once, shared with every worker) ---
+def build_report_data(stores_dir=stores.STORES_DIR):
+    """
+    Everything the report shows: per-store aggregates (stores.aggregate_all_stores), their
+    chain roll-up, and the chain-level forecast, reorder points and item margins.
+    """
+    per_store = stores.aggregate_all_stores(stores.discover_stores(stores_dir))
+    views = {**per_store, stores.CHAIN_WIDE: stores.roll_up(per_store)} if len(per_store) > 1 else per_store
+    forecast = dl.load_forecast_data.__wrapped__()
+    item_margins = margins.load_margins.__wrapped__()
+    return {
+        "stores": views,
+        "chain": stores.CHAIN_WIDE if len(per_store) > 1 else next(iter(per_store)),
+        "forecast": forecast,
+        "reorder": reorder_table(forecast, dl.load_shipments.__wrapped__()),
+        "margins": {k: item_margins[k] for k in ("revenue", "margin", "has_costs")},
+    }
+
+_DATA = None
+
+def _init_worker(data, manifest=None):
+    # Each worker receives the dataset once, instead of with every task; with a manifest the
+    # numeric frames are views onto shared memory and only their labels were pickled
+    global _DATA
+    _DATA = data if manifest is None else join_frames(data, attach(manifest))
+
+
+# --- SECTIONS (run inside workers) ---
+def _unit(ingredient):
+    return "count" if ingredient in COUNT_INGREDIENTS else "lbs"
+
+def _months(frame):
+    return [m for m in MONTH_ORDER if m in frame.columns] + [m for m in frame.columns if m not in MONTH_ORDER]
+
+def _figure_html(traces, title, height=380, **layout):
+    # Plain dict figures skip plotly's per-property validation, which costs far more than the rendering
+    layout = {"title": {"text": title}, "height": height, "margin": {"l": 40, "r": 20, "t": 50, "b": 40},
+              "plot_bgcolor": "white", **layout}
+    return pio.to_html({"data": traces, "layout": layout}, full_html=False, include_plotlyjs=False, validate=False)
+
+def ingredient_section(store, ingredient):
+    """
+    Monthly usage bars for one store, followed by that store's usage forecast; at chain level
+    also the forecast with its interval and the reorder point.
+    """
+    view = _DATA["stores"][store]
+    usage = view["ingredient_usage"]
+    months = _months(usage)
+    values = usage.loc[ingredient, months].fillna(0) if ingredient in usage.index else pd.Series(0.0, index=months)
+    unit = _unit(ingredient)
+
+    bars = [{"type": "bar", "x": months, "y": values.tolist(), "marker": {"color": "darkred"},
+             "text": [f"{v:,.1f}" for v in values], "textposition": "auto", "name": "Usage"}]
+    table = values.rename("Usage").to_frame().T
+    store_forecast = view.get("ingredient_forecast")
+    if store != _DATA["chain"] and store_forecast is not None and ingredient in store_forecast.index:
+        ahead = store_forecast.loc[ingredient]
+        bars.append({"type": "bar", "x": ahead.index.tolist(), "y": ahead.tolist(), "marker": {"color": "#e8a0a0"},
+                     "text": [f"{v:,.1f}" for v in ahead], "textposition": "auto", "name": "Forecast"})
+        table = pd.concat([table, ahead.rename("Forecast").to_frame().T])
+    parts = [_figure_html(bars, f"{ingredient} usage by month ({store})", yaxis={"title": {"text": unit}})]
+
+    forecast = _DATA["forecast"]
+    rows = forecast[forecast["ingredient"] == ingredient]
+    if store == _DATA["chain"] and not rows.empty:
+        ds = rows["ds"].dt.strftime("%Y-%m-%d").tolist()
+        traces = []
+        if {"yhat_lower", "yhat_upper"}.issubset(rows.columns):
+            traces += [
+                {"type": "scatter", "x": ds, "y": rows["yhat_upper"].tolist(), "line": {"width": 0}, "showlegend": False, "hoverinfo": "skip"},
+                {"type": "scatter", "x": ds, "y": rows["yhat_lower"].tolist(), "fill": "tonexty", "line": {"width": 0},
+                 "fillcolor": "rgba(117,14,43,0.15)", "name": "80% interval"},
+            ]
+        traces.append({"type": "scatter", "x": ds, "y": rows["yhat"].tolist(), "mode": "lines+markers",
+                       "line": {"color": "#750e2b", "width": 3}, "name": "Forecast"})
+        if rows["supply"].notna().any():
+            traces.append({"type": "scatter", "x": ds, "y": rows["supply"].tolist(), "mode": "lines",
+                           "line": {"dash": "dash", "color": "#94a3b8"}, "name": "Supply"})
+        parts.append(_figure_html(traces, f"{ingredient} forecast vs supply", yaxis={"title": {"text": rows["unit"].iloc[0]}}))
+        if ingredient in _DATA["reorder"].index:
+            parts.append(_DATA["reorder"].loc[[ingredient]].to_html(float_format=lambda v: f"{v:,.1f}", classes="table"))
+        table = rows.set_index(rows["ds"].dt.strftime("%Y-%m"))[["period", "yhat", "yhat_lower", "yhat_upper", "supply", "shortfall"]]
+    return parts, table
+
+def item_section(store, item):
+    """Monthly servings for one item; at chain level also revenue and margin."""
+    sales = _DATA["stores"][store]["item_sales"]
+    months = _months(sales)
+    values = sales.loc[item, months] if item in sales.index else pd.Series(0.0, index=months)
+    bars = {"type": "bar", "x": months, "y": values.tolist(), "marker": {"color": "#2563eb"}}
+    parts = [_figure_html([bars], f"{item.title()} servings by month ({store})", 300, yaxis={"title": {"text": "Servings"}})]
+    table = values.rename("Servings").to_frame().T
+
+    m = _DATA["margins"]
+    if store == _DATA["chain"] and item in m["revenue"].index:
+        table = pd.concat([table, m["revenue"].loc[[item]].rename(index={item: "Revenue ($)"})])
+        if m["has_costs"]:
+            table = pd.concat([table, m["margin"].loc[[item]].rename(index={item: "Margin ($)"})])
+    return parts, table
+
+def month_section(store, month):
+    """The month's top items by margin (revenue when no cost file is present)."""
+    m = _DATA["margins"]
+    label = "Margin ($)" if m["has_costs"] else "Revenue ($)"
+    top = m["margin"][month].sort_values(ascending=False).head(TOP_ITEMS_PER_MONTH)
+    bars = {"type": "bar", "x": top.values[::-1].tolist(), "y": [i.title() for i in top.index[::-1]], "orientation": "h",
+            "marker": {"color": "#750e2b"}}
+    title = f"Top {TOP_ITEMS_PER_MONTH} items by {label.split(' ')[0].lower()} — {month}"
+    table = pd.DataFrame({label: top, "Revenue ($)": m["revenue"].loc[top.index, month]})
+    return [_figure_html([bars], title, 450, xaxis={"title": {"text": label}}, margin={"l": 180, "r": 20, "t": 50, "b": 40})], table
+
+SECTIONS = {"ingredient": ingredient_section, "item": item_section, "month": month_section}
+
+def render(task):
+    kind, store, key = task
+    parts, table = SECTIONS[kind](store, key)
+    return task, parts, table
+
+
+# --- TASKS & OUTPUT ---
+def report_tasks(data, items=True):
+    """(kind, store, key) for every ingredient of every store, every item, and every month at chain level."""
+    tasks = []
+    for store, view in data["stores"].items():
+        tasks += [("ingredient", store, i) for i in view["ingredient_usage"].index]
+        if items:
+            tasks += [("item", store, i) for i in view["item_sales"].index]
+    tasks += [("month", data["chain"], m) for m in data["margins"]["margin"].columns]
+    return tasks
+
+def render_all(data, tasks, max_workers=None):
+    """
+    Renders every task over a process pool. The dataset's numeric frames are published once in
+    shared memory, so memory stays flat as workers are added; the rest is pickled once per worker.
+    """
+    workers = max_workers or min(os.cpu_count() or 1, 8)
+    if workers == 1:
+        _init_worker(data)
+        return [render(t) for t in tasks]
+    skeleton, arrays = split_frames(data)
+    with published(arrays) as manifest, \
+            ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(skeleton, manifest)) as pool:
+        return list(pool.map(render, tasks, chunksize=max(1, len(tasks) // (workers * 4))))
+
+def _slug(text):
+    return re.sub(r"[^A-Za-z0-9]+", "_", text).strip("_")
+
+def write_html(results, data, out_dir):
+    """
+    One self-contained HTML file per store: plotly.js inlined once in the head (sections are
+    rendered in workers without it), a contents list, then a chart + table block per section.
+    """
+    plotly_js = get_plotlyjs()
+    paths = []
+    for store in data["stores"]:
+        blocks, contents = [], {"ingredient": [], "item": [], "month": []}
+        for (kind, s, key), parts, table in results:
+            if s != store:
+                continue
+            anchor = _slug(f"{kind}-{key}")
+            contents[kind].append(f'<a href="#{anchor}">{html.escape(str(key))}</a>')
+            blocks.append(f'<section id="{anchor}"><h2>{html.escape(kind.title())}: {html.escape(str(key))}</h2>'
+                          + "".join(parts) + table.to_html(float_format=lambda v: f"{v:,.2f}", na_rep="—", classes="table")
+                          + "</section>")
+        toc = "".join(f"<p><b>{k.title()}s:</b> {' · '.join(v)}</p>" for k, v in contents.items() if v)
+        page = (f"<!DOCTYPE html><html><head><meta charset='utf-8'><title>{html.escape(store)} report</title>"
+                f"<script type='text/javascript'>{plotly_js}</script><style>body{{font-family:sans-serif;margin:2em}}"
+                f".table{{border-collapse:collapse;font-size:13px}}.table td,.table th{{border:1px solid #ddd;padding:4px 8px}}</style>"
+                f"</head><body><h1>{html.escape(store)} — report {date.today():%Y-%m-%d}</h1>{toc}{''.join(blocks)}</body></html>")
+        path = Path(out_dir) / f"{_slug(store)}.html"
+        path.write_text(page, encoding="utf-8")
+        paths.append(path)
+    return paths
+
+def write_excel(results, data, out_dir):
+    """One workbook per store: a sheet per section kind with every table stacked, plus forecast and reorder sheets."""
+    paths = []
+    for store, view in data["stores"].items():
+        path = Path(out_dir) / f"{_slug(store)}.xlsx"
+        with pd.ExcelWriter(path, engine="openpyxl") as writer:
+            view["ingredient_usage"].to_excel(writer, sheet_name="Ingredient Usage")
+            view["item_sales"].to_excel(writer, sheet_name="Item Sales")
+            for kind in ("ingredient", "item", "month"):
+                tables = {key: table for (k, s, key), _, table in results if k == kind and s == store}
+                if tables:
+                    pd.concat(tables, names=[kind.title(), None]).to_excel(writer, sheet_name=f"{kind.title()} Detail")
+            if store == data["chain"]:
+                data["forecast"].to_excel(writer, sheet_name="Forecast", index=False)
+                data["reorder"].to_excel(writer, sheet_name="Reorder Points")
+        paths.append(path)
+    return paths
+
+def export_reports(fmt="html", out_dir=None, items=True, max_workers=None):
+    """Builds the dataset once, renders every section in parallel and writes the pack. Returns (paths, timings, number of sections)."""
+    out_dir = Path(out_dir or REPORTS_DIR / f"{date.today():%Y-%m-%d}")
+    out_dir.mkdir(parents=True, exist_ok=True)
+    timings = {}
+    start = time.perf_counter()
+    data = build_report_data()
+    timings["data"] = time.perf_counter() - start
+    tasks = report_tasks(data, items)
+    start = time.perf_counter()
+    results = render_all(data, tasks, max_workers)
+    timings["render"] = time.perf_counter() - start
+    start = time.perf_counter()
+    paths = (write_excel if fmt == "excel" else write_html)(results, data, out_dir)
+    timings["write"] = time.perf_counter() - start
+    return paths, timings, len(tasks)
+
+
+if __name__ == "__main__":
+    # python report_export.py [--format html|excel] [--out DIR] [--no-items] [--workers N]  (from streamlit_app/)
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Write the weekly report pack for every store, ingredient, item and month.")
+    parser.add_argument("--format", choices=["html", "excel"], default="html")
+    parser.add_argument("--out", default=None, help=f"output folder (default {REPORTS_DIR.name}/<today>)")
+    parser.add_argument("--no-items", action="store_true", help="ingredients and months only")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    paths, timings, n_sections = export_reports(args.format, args.out, not args.no_items, args.workers)
+    print(f"{n_sections} sections: data {timings['data']:.2f}s, render {timings['render']:.2f}s, write {timings['write']:.2f}s")
+    for path in paths:
+        print(path)
@@ -0,0 +1,100 @@
+# safety_stock.py — safety stock, reorder point and days of cover for every ingredient in one pass
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from data_loaders import load_forecast_data, load_shipments
+from inventory_sim import DELIVERY_INTERVAL_DAYS, REORDER_LEAD_DAYS
+from recipes import SHIPMENT_INGREDIENT, split_line_supply
+
+SERVICE_LEVEL = 0.95
+INTERVAL_WIDTH = 0.80  # width of the yhat_lower / yhat_upper band in the forecast file
+DAYS_PER_MONTH = 30.44
+
+
+def _review_days(ship, lines):
+    """Days between scheduled deliveries for each line (NaN for lines not on the schedule)."""
+    freq = pd.Series(lines).map(ship["frequency"].astype(str).str.strip().str.lower())
+    days = {f: DELIVERY_INTERVAL_DAYS.get(f) or DAYS_PER_MONTH for f in freq.dropna().unique()}
+    return freq.map(days).to_numpy(dtype=float)
+
+def _by_ingredient(stock, ingredients):
+    return (stock if stock is not None else pd.Series(dtype=float)).reindex(ingredients).to_numpy(dtype=float)
+
+def reorder_table(forecast, shipments, service_level=SERVICE_LEVEL, on_hand=None, on_order=None,
+                  lead_days=REORDER_LEAD_DAYS):
+    """
+    Computes the reorder table for all ingredients at once from the future forecast rows.
+
+    Deliveries follow the schedule, so stock is reviewed once per delivery (periodic review).
+    Per ingredient, over the forecast months:
+        daily demand   d    = mean(yhat) / DAYS_PER_MONTH
+        daily sigma    s    = mean((yhat_upper - yhat_lower) / (2 z_interval)) / sqrt(DAYS_PER_MONTH)
+        review period  R    = days between deliveries for the ingredient's shipment line
+        lead time      L    = days from placing an order to receiving it (lead_days)
+        safety stock   SS   = z_service * s * sqrt(R + L)
+        reorder point  ROP  = d * (R + L) + SS
+        days of cover       = the ingredient's share of one delivery / d
+    Without interval columns, the spread of the historical months stands in for sigma.
+    Ingredients sharing a line (Peas + Carrot) split its deliveries by their forecast demand.
+
+    on_hand / on_order are Series of current stock by ingredient; an ingredient is below its
+    reorder point when on hand plus on order is under ROP (NA without a stock count).
+    Returns a frame indexed by ingredient.
+    """
+    future = forecast[forecast["period"] == "Future Forecast"]
+    yhat = future.pivot_table(index="ingredient", columns="ds", values="yhat", aggfunc="sum")
+    ingredients = yhat.index
+    demand = yhat.to_numpy(dtype=float)
+
+    if {"yhat_lower", "yhat_upper"}.issubset(future.columns):
+        spread = (future.pivot_table(index="ingredient", columns="ds", values="yhat_upper", aggfunc="sum")
+                  - future.pivot_table(index="ingredient", columns="ds", values="yhat_lower", aggfunc="sum"))
+        z_interval = NormalDist().inv_cdf(0.5 + INTERVAL_WIDTH / 2)
+        monthly_sigma = (spread.loc[ingredients].to_numpy(dtype=float) / (2 * z_interval)).mean(axis=1)
+    else:
+        history = forecast[forecast["period"] == "Historical Proxy"]
+        monthly_sigma = history.groupby("ingredient")["yhat"].std().reindex(ingredients).to_numpy(dtype=float)
+
+    lines = [SHIPMENT_INGREDIENT.get(i) for i in ingredients]
+    ship = shipments.assign(Ingredient=shipments["Ingredient"].astype(str).str.strip()).drop_duplicates("Ingredient").set_index("Ingredient")
+    daily = demand.mean(axis=1) / DAYS_PER_MONTH
+    per_delivery = split_line_supply(pd.Series(ingredients), ship["Quantity per shipment"] * ship["Number of shipments"],
+                                     daily).to_numpy(dtype=float)
+    review = _review_days(ship, lines)
+    lead = np.where(np.isnan(review), np.nan, float(lead_days))
+
+    daily_sigma = monthly_sigma / np.sqrt(DAYS_PER_MONTH)
+    safety = NormalDist().inv_cdf(service_level) * daily_sigma * np.sqrt(review + lead)
+    reorder_point = daily * (review + lead) + safety
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cover = np.where(daily > 0, per_delivery / daily, np.inf)
+
+    position = _by_ingredient(on_hand, ingredients) + np.nan_to_num(_by_ingredient(on_order, ingredients))
+    below = pd.array(np.where(np.isnan(position) | np.isnan(reorder_point), pd.NA, position < reorder_point), dtype="boolean")
+
+    return pd.DataFrame({
+        "Shipment Line": lines,
+        "Daily Demand": daily,
+        "Daily Std Dev": daily_sigma,
+        "Review Period (days)": review,
+        "Lead Time (days)": lead,
+        "Safety Stock": safety,
+        "Reorder Point": reorder_point,
+        "Per Delivery": per_delivery,
+        "Days of Cover": cover,
+        "Stock Position": position,
+        "Below Reorder Point": below,
+    }, index=ingredients)
+
+@st.cache_data
+def load_reorder_table(service_level=SERVICE_LEVEL):
+    """Reorder table for the current forecast file and shipment schedule."""
+    return reorder_table(load_forecast_data(), load_shipments(), service_level)
+
+
+if __name__ == "__main__":
+    # python safety_stock.py (from streamlit_app/) -> chain-wide reorder report
+    print(load_reorder_table().round(2).to_string())
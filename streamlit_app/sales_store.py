@@ -0,0 +1,127 @@
+# sales_store.py — daily sales partitions on disk with out-of-core period aggregation
+import os
+import sys
+from pathlib import Path
+
+import pandas as pd
+import streamlit as st
+
+from data_loaders import DATA_DIR
+
+# One CSV per day: daily_sales/YYYY/MM/YYYY-MM-DD.csv with columns [Item Name, Sales Count]
+SALES_STORE_DIR = DATA_DIR / "daily_sales"
+
+GRANULARITIES = {"Daily": "D", "Weekly": "W", "Monthly": "M"}
+
+
+def _partition_path(store_dir, day):
+    return Path(store_dir) / f"{day:%Y}" / f"{day:%m}" / f"{day:%Y-%m-%d}.csv"
+
+def write_daily_partitions(daily, store_dir=SALES_STORE_DIR):
+    """
+    Writes [Item Name, Date, Sales Count] rows (e.g. from stream_previous_months) into one
+    partition file per day. Re-writing a day replaces it, so reloading an export is idempotent.
+    """
+    daily = daily.assign(Date=pd.to_datetime(daily["Date"]).dt.normalize())
+    written = 0
+    for day, part in daily.groupby("Date"):
+        path = _partition_path(store_dir, day)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        (part.groupby("Item Name", as_index=False)["Sales Count"].sum()
+             .to_csv(path, index=False))
+        written += 1
+    return written
+
+def list_partitions(start=None, end=None, store_dir=SALES_STORE_DIR):
+    """
+    Returns [(day, path)] for partitions in [start, end], pruned by directory/file name only.
+    Directories and files not named like YYYY/MM/YYYY-MM-DD.csv are ignored.
+    """
+    store_dir = Path(store_dir)
+    if not store_dir.exists():
+        return []
+    start = pd.Timestamp(start) if start is not None else None
+    end = pd.Timestamp(end) if end is not None else None
+
+    partitions = []
+    for year_dir in sorted(p for p in store_dir.iterdir() if p.is_dir() and p.name.isdigit()):
+        year = int(year_dir.name)
+        if (start is not None and year < start.year) or (end is not None and year > end.year):
+            continue
+        for month_dir in sorted(p for p in year_dir.iterdir() if p.is_dir() and p.name.isdigit() and 1 <= int(p.name) <= 12):
+            month_start = pd.Timestamp(year=year, month=int(month_dir.name), day=1)
+            if (start is not None and month_start + pd.offsets.MonthEnd(0) < start) or (end is not None and month_start > end):
+                continue
+            for f in sorted(month_dir.glob("*.csv")):
+                day = pd.to_datetime(f.stem, format="%Y-%m-%d", errors="coerce")
+                if pd.isna(day):
+                    continue
+                if (start is None or day >= start) and (end is None or day <= end):
+                    partitions.append((day, f))
+    return partitions
+
+def store_version(store_dir=SALES_STORE_DIR):
+    """Cheap change marker for caching: (partition count, newest mtime)."""
+    files = list(Path(store_dir).glob("*/*/*.csv")) if Path(store_dir).exists() else []
+    return len(files), max((os.path.getmtime(f) for f in files), default=0.0)
+
+def _period_label(day, freq):
+    if freq == "D":
+        return day.strftime("%Y-%m-%d")
+    if freq == "W":
+        return (day - pd.Timedelta(days=day.weekday())).strftime("%Y-%m-%d")  # week starting Monday
+    if freq == "M":
+        return day.strftime("%Y-%m")
+    return "Total"
+
+def aggregate_sales(freq="M", start=None, end=None, items=None, store_dir=SALES_STORE_DIR):
+    """
+    Item x period sales counts over the partitions in [start, end].
+
+    freq is "D", "W" (weeks starting Monday), "M", or None for one total over the whole range.
+    Partitions are read one at a time and folded into per-period sums, so memory holds one
+    day plus the result, never the full history. Date filters prune files before any read;
+    the `items` filter (lower-case names) is applied per partition.
+    """
+    items = {i.lower() for i in items} if items else None
+    period_sums = {}
+
+    for day, path in list_partitions(start, end, store_dir):
+        part = pd.read_csv(path)
+        names = part["Item Name"].astype(str).str.strip().str.lower()
+        counts = pd.to_numeric(part["Sales Count"], errors="coerce").fillna(0)
+        if items is not None:
+            keep = names.isin(items)
+            names, counts = names[keep], counts[keep]
+        day_sums = counts.groupby(names.to_numpy()).sum()
+
+        label = _period_label(day, freq)
+        period_sums[label] = day_sums if label not in period_sums else period_sums[label].add(day_sums, fill_value=0)
+
+    if not period_sums:
+        return pd.DataFrame()
+    return pd.DataFrame(period_sums).fillna(0)
+
+@st.cache_data(show_spinner=False)
+def load_sales_by_period(granularity="Monthly", start=None, end=None, store_dir=SALES_STORE_DIR, version=None):
+    """Cached aggregate_sales() for the pages; pass store_version() as version so new partitions refresh it."""
+    return aggregate_sales(GRANULARITIES[granularity], start, end, store_dir=store_dir)
+
+@st.cache_data(show_spinner=False)
+def load_usage_by_period(granularity="Monthly", start=None, end=None, store_dir=SALES_STORE_DIR, version=None):
+    """Ingredients x periods usage (lbs or count) from the partitions; empty when there are none. Pass store_version() as version."""
+    from recipes import ingredient_usage
+
+    sales = aggregate_sales(GRANULARITIES[granularity], start, end, store_dir=store_dir)
+    return ingredient_usage(sales) if not sales.empty else pd.DataFrame()
+
+
+if __name__ == "__main__":
+    # Build partitions from POS exports: python sales_store.py [folder with CSV exports, default data/]
+    from pages.Predictive_Analysis.combined_prev_months import stream_previous_months
+
+    source = sys.argv[1] if len(sys.argv) > 1 else DATA_DIR
+    daily, _ = stream_previous_months(source)
+    if daily.empty:
+        raise SystemExit(f"No dated sales rows in the CSVs of {source}; nothing to partition.")
+    print(f"Wrote {write_daily_partitions(daily)} daily partitions to {SALES_STORE_DIR}")
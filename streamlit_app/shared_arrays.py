@@ -0,0 +1,106 @@
+# shared_arrays.py — publish NumPy arrays (and numeric frames) once in shared memory; pool workers attach zero-copy
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+# Segments this process has attached to, kept open for as long as the views into them live
+_ATTACHED = {}
+_WORKER_DATA = None
+
+
+# --- PUBLISH / ATTACH ---
+@contextmanager
+def published(arrays):
+    """
+    Copies each {key: array} into its own shared-memory segment and yields the manifest
+    {key: (segment name, shape, dtype)} to hand to workers. Segments are removed on exit.
+    """
+    segments, manifest = [], {}
+    try:
+        for key, array in arrays.items():
+            array = np.ascontiguousarray(array)
+            shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            segments.append(shm)
+            np.ndarray(array.shape, array.dtype, buffer=shm.buf)[...] = array
+            manifest[key] = (shm.name, array.shape, array.dtype.str)
+        yield manifest
+    finally:
+        for shm in segments:
+            shm.close()
+            shm.unlink()
+
+def _open(name):
+    # Pool workers share the publisher's resource tracker, so attaching (which registers the
+    # segment again before 3.13) does not make the workers remove it when they exit
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # Python 3.13+
+    except TypeError:
+        return shared_memory.SharedMemory(name=name)
+
+def attach(manifest):
+    """Read-only views {key: array} onto published segments; no data is copied."""
+    views = {}
+    for key, (name, shape, dtype) in manifest.items():
+        if name not in _ATTACHED:
+            _ATTACHED[name] = _open(name)
+        view = np.ndarray(shape, np.dtype(dtype), buffer=_ATTACHED[name].buf)
+        view.flags.writeable = False
+        views[key] = view
+    return views
+
+def init_worker(manifest, skeleton=None):
+    """
+    Process-pool initializer: attaches the manifest and, given the skeleton from split_frames,
+    rebuilds the data around the views. Tasks read it with worker_data().
+    """
+    global _WORKER_DATA
+    views = attach(manifest)
+    _WORKER_DATA = views if skeleton is None else join_frames(skeleton, views)
+
+def worker_data():
+    return _WORKER_DATA
+
+
+# --- FRAMES ---
+def _numeric(obj):
+    if isinstance(obj, pd.DataFrame):
+        return obj.shape[1] > 0 and all(pd.api.types.is_numeric_dtype(t) for t in obj.dtypes) and len(set(obj.dtypes)) == 1
+    return isinstance(obj, pd.Series) and pd.api.types.is_numeric_dtype(obj.dtype)
+
+def split_frames(obj, arrays=None, path="data"):
+    """
+    Replaces every numeric array and single-dtype numeric DataFrame / Series inside nested
+    dicts, lists and tuples with a placeholder and collects its values. Returns
+    (skeleton, {key: array}); the skeleton keeps the labels and everything else (small,
+    pickled once per worker).
+    """
+    arrays = {} if arrays is None else arrays
+    if isinstance(obj, np.ndarray) and obj.dtype.kind in "biuf":
+        arrays[path] = obj
+        return {"__shared__": path}, arrays
+    if _numeric(obj):
+        arrays[path] = obj.to_numpy()
+        labels = {"columns": obj.columns} if isinstance(obj, pd.DataFrame) else {"name": obj.name}
+        return {"__shared__": path, "index": obj.index, **labels}, arrays
+    if isinstance(obj, dict):
+        return {k: split_frames(v, arrays, f"{path}/{k}")[0] for k, v in obj.items()}, arrays
+    if isinstance(obj, (list, tuple)):
+        return type(obj)(split_frames(v, arrays, f"{path}/{i}")[0] for i, v in enumerate(obj)), arrays
+    return obj, arrays
+
+def join_frames(skeleton, views):
+    """Inverse of split_frames over attached views: frames share the segments' memory."""
+    if isinstance(skeleton, dict) and "__shared__" in skeleton:
+        values = views[skeleton["__shared__"]]
+        if "index" not in skeleton:
+            return values
+        if "columns" in skeleton:
+            return pd.DataFrame(values, index=skeleton["index"], columns=skeleton["columns"], copy=False)
+        return pd.Series(values, index=skeleton["index"], name=skeleton["name"], copy=False)
+    if isinstance(skeleton, dict):
+        return {k: join_frames(v, views) for k, v in skeleton.items()}
+    if isinstance(skeleton, (list, tuple)):
+        return type(skeleton)(join_frames(v, views) for v in skeleton)
+    return skeleton
@@ -0,0 +1,139 @@
+# stores.py — per-location data folders, parallel per-store aggregation and chain roll-up
+import io
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+import streamlit as st
+
+import data_loaders as dl
+from pages.Predictive_Analysis.forecast_models import fit_predict, month_start_dates
+
+# data/stores/<Store Name>/ holds that location's *_Data_Matrix workbooks plus optional
+#   "MSY Data - Ingredient.csv"  recipe overrides (only the items that differ from the chain recipe)
+#   "MSY Data - Shipment.csv"    the store's own shipment schedule (replaces the chain schedule)
+STORES_DIR = dl.DATA_DIR / "stores"
+CHAIN_WIDE = "Chain-wide"
+
+# Per-store ingredient forecasts run inside the aggregation pass, once per ingredient and store,
+# so they use the fast damped-trend backend; the chain roll-up sums the store forecasts
+STORE_FORECAST_CONFIG = {"model": "holt", "alpha": 0.5, "beta": 0.1, "damping": 0.9, "clip_factor": 5.0}
+FORECAST_HORIZON = 3
+
+
+def discover_stores(stores_dir=STORES_DIR) -> dict[str, Path]:
+    """Return {store name -> data folder}; a single-location install is just {'Main': data/}."""
+    stores_dir = Path(stores_dir)
+    stores = {}
+    if stores_dir.exists():
+        stores = {p.name: p for p in sorted(stores_dir.iterdir()) if p.is_dir() and any(p.glob("*_Data_Matrix.*"))}
+    return stores or {"Main": dl.DATA_DIR}
+
+def store_recipes(store_dir, chain_path=dl.INGREDIENTS_PATH) -> pd.DataFrame:
+    """Chain recipe matrix with the store's override rows swapped in (matched on 'Item name')."""
+    recipes = pd.read_csv(chain_path)
+    recipes.columns = [c.strip() for c in recipes.columns]
+    override_path = Path(store_dir) / dl.INGREDIENTS_PATH.name
+    if Path(store_dir) == dl.DATA_DIR or not override_path.exists():
+        return recipes
+
+    overrides = pd.read_csv(override_path)
+    overrides.columns = [c.strip() for c in overrides.columns]
+    key = recipes["Item name"].str.strip().str.lower()
+    replaced = key.isin(overrides["Item name"].str.strip().str.lower())
+    return pd.concat([recipes[~replaced], overrides], ignore_index=True)
+
+def store_shipment_path(store_dir) -> Path:
+    path = Path(store_dir) / dl.SHIPMENT_PATH.name
+    return path if path.exists() else dl.SHIPMENT_PATH
+
+
+# --- PER-STORE AGGREGATES (run inside worker processes) ---
+def _category_income(store_dir) -> pd.DataFrame:
+    frames = [dl.load_data2_for_month.__wrapped__(path, month)
+              for month, path in dl.discover_month_files(store_dir).items()]
+    if not frames:
+        return pd.DataFrame()
+    d2 = pd.concat(frames, ignore_index=True)
+    months = list(dict.fromkeys(d2["Month"]))
+    return d2.pivot_table(index="Category", columns="Month", values="Amount", aggfunc="sum", fill_value=0.0)[months]
+
+def forecast_usage(usage, config=STORE_FORECAST_CONFIG, horizon=FORECAST_HORIZON) -> pd.DataFrame:
+    """Ingredients x next `horizon` months ('YYYY-MM') usage forecast from an ingredients x months usage frame."""
+    if usage is None or usage.empty:
+        return pd.DataFrame()
+    ds = month_start_dates(usage.columns)
+    future = pd.date_range(ds[-1], periods=horizon + 1, freq="MS")[1:]
+    point = [fit_predict(config, ds, row, horizon) for row in usage.fillna(0.0).to_numpy()]
+    return pd.DataFrame(point, index=usage.index, columns=future.strftime("%Y-%m")).clip(lower=0.0)
+
+def aggregate_store(store, store_dir) -> dict:
+    """All per-store aggregates, computed with the undecorated loaders (no Streamlit cache in workers)."""
+    start = time.perf_counter()
+    recipes_csv = io.StringIO(store_recipes(store_dir).to_csv(index=False))
+    shipments = dl.load_shipments.__wrapped__(store_shipment_path(store_dir))
+    sales = dl.load_monthly_sales.__wrapped__(store_dir)
+    usage = dl.ingredient_totals(sales, recipes_csv, dl.data_version())
+    return {
+        "store": store,
+        "ingredient_usage": usage,
+        "ingredient_forecast": forecast_usage(usage),
+        "item_sales": sales,
+        "category_income": _category_income(store_dir),
+        "monthly_supply": shipments.set_index("Ingredient")["Total monthly shipment"],
+        "seconds": time.perf_counter() - start,
+    }
+
+def aggregate_all_stores(stores=None, max_workers=None) -> dict[str, dict]:
+    """Runs aggregate_store for every location in parallel over a process pool."""
+    stores = stores or discover_stores()
+    if len(stores) == 1:
+        (name, path), = stores.items()
+        return {name: aggregate_store(name, path)}
+    with ProcessPoolExecutor(max_workers=max_workers or min(len(stores), 8)) as pool:
+        futures = [pool.submit(aggregate_store, name, path) for name, path in stores.items()]
+        results = [f.result() for f in futures]
+    return {r["store"]: r for r in results}
+
+def roll_up(per_store: dict[str, dict]) -> dict:
+    """Chain-wide view: every aggregate summed across stores (missing rows/months count as 0)."""
+    chain = {"store": CHAIN_WIDE}
+    for key in ("ingredient_usage", "ingredient_forecast", "item_sales", "category_income", "monthly_supply"):
+        frames = [r[key] for r in per_store.values() if r.get(key) is not None and len(r[key])]
+        if not frames:
+            chain[key] = None
+            continue
+        total = frames[0]
+        for frame in frames[1:]:
+            total = total.add(frame, fill_value=0)
+        if key == "ingredient_forecast":
+            total = total[sorted(total.columns)]  # 'YYYY-MM' labels
+        elif isinstance(total, pd.DataFrame):
+            total = total[sorted(total.columns, key=dl.month_key)]  # calendar order, not alphabetical
+        chain[key] = total.fillna(0)
+    return chain
+
+def stores_version(stores_dir=STORES_DIR):
+    """Cheap change marker for caching: (file count, total size, newest mtime) under the store folders."""
+    files = [p for p in Path(stores_dir).rglob("*") if p.is_file()] if Path(stores_dir).exists() else []
+    stats = [p.stat() for p in files]
+    return len(stats), sum(s.st_size for s in stats), max((s.st_mtime for s in stats), default=0.0)
+
+@st.cache_data(show_spinner="Aggregating stores...")
+def load_store_aggregates(stores_dir=STORES_DIR, version=None):
+    """{store name -> aggregates} plus the CHAIN_WIDE roll-up, for the pages; pass stores_version() as version so edited store files refresh it."""
+    per_store = aggregate_all_stores(discover_stores(stores_dir))
+    return {**per_store, CHAIN_WIDE: roll_up(per_store)}
+
+
+if __name__ == "__main__":
+    # Morning refresh / timing check: python stores.py (from streamlit_app/)
+    start = time.perf_counter()
+    per_store = aggregate_all_stores()
+    for name, result in per_store.items():
+        print(f"{name:<24}{result['seconds']:>8.2f}s")
+    chain = roll_up(per_store)
+    print(f"{CHAIN_WIDE:<24}{time.perf_counter() - start:>8.2f}s wall, {len(per_store)} store(s)")
+    print(chain["ingredient_usage"].round(1))
+    print(chain["ingredient_forecast"].round(1))
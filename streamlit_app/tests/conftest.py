@@ -0,0 +1,16 @@
+# conftest.py — run the tests from anywhere: app modules import each other from streamlit_app/
+import sys
+from pathlib import Path
+
+import pytest
+import streamlit as st
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+
+@pytest.fixture(autouse=True)
+def _fresh_caches():
+    # st.cache_data outlives a test; loaders called with the same arguments must not see another test's files
+    st.cache_data.clear()
+    st.cache_resource.clear()
+    yield
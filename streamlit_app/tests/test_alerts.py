@@ -0,0 +1,79 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+from alerts import INPUT_COLUMNS, alert_inputs, evaluate_rules, file_sink, fingerprints, run_alerts
+
+SHIPMENTS = pd.DataFrame({"Ingredient": ["Rice", "Beef"], "Quantity per shipment": [50, 100],
+                          "Number of shipments": [2, 1], "frequency": ["weekly", "weekly"]})
+
+
+def _forecast(rice_yhat=(150.0, 250.0), beef_yhat=(100.0, 100.0)):
+    # Supply is a month of weekly deliveries: Rice 400 g, Beef 400 g
+    ds = pd.to_datetime(["2025-11-01", "2025-12-01"])
+    frames = []
+    for ingredient, yhat in (("Rice(g)", rice_yhat), ("Beef(g)", beef_yhat)):
+        yhat = np.asarray(yhat)
+        frames.append(pd.DataFrame({"ds": ds, "ingredient": ingredient, "yhat": yhat, "unit": "g",
+                                    "period": "Future Forecast", "supply": 400.0, "shortfall": 400.0 - yhat}))
+    return pd.concat(frames, ignore_index=True)
+
+
+def _collect():
+    sent = []
+    return sent, sent.extend
+
+
+def test_alert_inputs_pick_the_worst_month():
+    inputs = alert_inputs(_forecast(), SHIPMENTS)
+    assert inputs.loc["Rice(g)", "Worst Month"] == "2025-12"
+    assert inputs.loc["Rice(g)", "Worst Shortfall/Surplus"] == 150.0
+    assert inputs.loc["Beef(g)", "Surplus Ratio"] == 4.0
+
+
+def test_empty_or_unconstrained_forecast_raises_no_alerts(tmp_path):
+    sent, sink = _collect()
+    for forecast in (pd.DataFrame(), _forecast().drop(columns="period"), _forecast().assign(supply=np.nan)):
+        assert list(alert_inputs(forecast, SHIPMENTS).columns) == INPUT_COLUMNS
+        assert run_alerts(sink, forecast, SHIPMENTS, state_path=tmp_path / "state.json") == ([], 0)
+    assert sent == []
+
+
+def test_rules_fire_on_their_thresholds():
+    inputs = alert_inputs(_forecast(rice_yhat=(150.0, 500.0)), SHIPMENTS)
+    keys = {a["key"] for a in evaluate_rules(inputs)}
+    assert keys == {"Shortfall|Rice(g)", "Excess stock|Beef(g)"}
+
+
+def test_fingerprints_change_only_with_the_row():
+    before = fingerprints(alert_inputs(_forecast(), SHIPMENTS))
+    after = fingerprints(alert_inputs(_forecast(rice_yhat=(150.0, 260.0)), SHIPMENTS))
+    assert before["Beef(g)"] == after["Beef(g)"]
+    assert before["Rice(g)"] != after["Rice(g)"]
+
+
+def test_alerts_fire_once_until_they_clear(tmp_path):
+    state = tmp_path / "state.json"
+    sent, sink = _collect()
+    short = _forecast(rice_yhat=(150.0, 500.0))
+
+    new, evaluated = run_alerts(sink, short, SHIPMENTS, state_path=state)
+    assert evaluated == 2 and {a["key"] for a in new} == {"Shortfall|Rice(g)", "Excess stock|Beef(g)"}
+
+    # Unchanged inputs: nothing evaluated, nothing re-sent
+    assert run_alerts(sink, short, SHIPMENTS, state_path=state) == ([], 0)
+    # Rice recovers, then falls short again: the alert fires a second time
+    assert run_alerts(sink, _forecast(), SHIPMENTS, state_path=state) == ([], 1)
+    new, _ = run_alerts(sink, short, SHIPMENTS, state_path=state)
+    assert [a["key"] for a in new] == ["Shortfall|Rice(g)"]
+    assert len(sent) == 3
+    assert set(json.loads(state.read_text())["active"]) == {"Shortfall|Rice(g)", "Excess stock|Beef(g)"}
+
+
+def test_file_sink_appends_json_lines(tmp_path):
+    path = tmp_path / "logs" / "alerts.log"
+    send = file_sink(str(path))
+    send([{"key": "a"}])
+    send([{"key": "b"}])
+    assert [json.loads(line)["key"] for line in path.read_text().splitlines()] == ["a", "b"]
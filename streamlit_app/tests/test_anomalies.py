@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+
+import anomalies
+from data_loaders import write_state
+from anomalies import feed, load_state, new_detector, observe, period_key, update_anomalies
+
+
+def test_rolling_statistics_match_the_window():
+    rng = np.random.default_rng(0)
+    values = rng.normal(100, 10, size=(12, 3))
+    detector = new_detector(window=4)
+    for t, row in enumerate(values):
+        observe(detector, pd.Period("2025-01", "M") + t, pd.Series(row, index=["a", "b", "c"]))
+    tail = values[-4:]
+    assert np.allclose(detector["mean"], tail.mean(axis=0))
+    assert np.allclose(detector["m2"] / 3, tail.var(axis=0, ddof=1))
+
+
+def test_spike_is_flagged_with_its_period():
+    detector = new_detector()
+    for month, x in zip(["May", "June", "July", "August"], [10.0, 11.0, 9.0, 10.0]):
+        assert observe(detector, month, pd.Series({"Egg": x})).empty
+    flags = observe(detector, "September", pd.Series({"Egg": 50.0}))
+    assert flags[["Series", "Period", "Direction"]].values.tolist() == [["Egg", "2025-09", "Spike"]]
+
+
+def test_period_keys_carry_the_year():
+    assert period_key("May") == pd.Period("2025-05", "M")
+    assert period_key("2026-05") == pd.Period("2026-05", "M")
+    assert period_key("2026-05-03") == pd.Period("2026-05-03", "D")
+    assert period_key("May") != period_key("2026-05")
+
+
+def test_feed_skips_seen_periods_but_scores_next_years_month():
+    frame = pd.DataFrame({m: [10.0 + i % 2] for i, m in enumerate(["May", "June", "July", "August"])}, index=["Egg"])
+    detector = new_detector()
+    feed(detector, frame)
+    feed(detector, frame)
+    assert detector["seen"].tolist() == [4]
+    flags = feed(detector, pd.DataFrame({"2026-05": [80.0]}, index=["Egg"]))
+    assert detector["seen"].tolist() == [5]
+    assert flags["Period"].tolist() == ["2026-05"]
+
+
+def test_state_round_trips_and_migrates_month_names(tmp_path):
+    path = tmp_path / "anomaly_state.pkl"
+    frame = pd.DataFrame({"May": [1.0], "June": [2.0]}, index=["Egg"])
+    update_anomalies({"Item": frame}, state_path=path)
+    assert load_state(path)["detectors"]["Item"]["periods"] == {pd.Period("2025-05", "M"), pd.Period("2025-06", "M")}
+
+    update_anomalies({"Item": frame}, state_path=path)
+    assert load_state(path)["detectors"]["Item"]["seen"].tolist() == [2]
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_old_state_with_month_names_is_migrated(tmp_path):
+    path = tmp_path / "anomaly_state.pkl"
+    detector = new_detector()
+    feed(detector, pd.DataFrame({"May": [1.0]}, index=["Egg"]))
+    detector["periods"] = {"May"}
+    write_state(path, {"detectors": {"Item": detector}, "flags": pd.DataFrame()})
+    assert load_state(path)["detectors"]["Item"]["periods"] == {pd.Period("2025-05", "M")}
+
+
+def test_new_data_version_scores_newly_landed_months(tmp_path, monkeypatch):
+    path = tmp_path / "anomaly_state.pkl"
+    months = {"Egg": [10.0, 11.0, 9.0, 10.0]}
+    frame = {"Item": pd.DataFrame(months, index=["May", "June", "July", "August"]).T}
+    monkeypatch.setattr(anomalies, "monthly_series", lambda: frame)
+    monkeypatch.setattr(anomalies, "update_anomalies", lambda series: update_anomalies(series, state_path=path))
+    assert anomalies.load_anomalies(version="v1").empty
+
+    frame["Item"] = frame["Item"].assign(September=[50.0])  # a workbook lands while the app runs
+    assert anomalies.load_anomalies(version="v1").empty  # same data version: cached
+    assert anomalies.load_anomalies(version="v2")["Period"].tolist() == ["2025-09"]
+    assert load_state(path)["detectors"]["Item"]["seen"].tolist() == [5]
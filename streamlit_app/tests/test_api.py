@@ -0,0 +1,96 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+from http.server import ThreadingHTTPServer
+
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+import api
+
+
+@pytest.fixture
+def server(monkeypatch):
+    calls = []
+    version = {"value": "v1"}
+
+    def numbers():
+        calls.append(1)
+        return pd.DataFrame({"n": range(25), "ds": pd.date_range("2025-05-01", periods=25)})
+
+    monkeypatch.setattr(api, "DATASETS", {"numbers": numbers})
+    monkeypatch.setattr(api, "data_version", lambda: version["value"])
+    monkeypatch.setattr(api, "_frames", {})
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), api.Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_port}", calls, version
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _get(url, headers=None):
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, headers=headers or {})) as response:
+            return response.status, response.headers, response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.headers, e.read()
+
+
+def test_pages_follow_the_next_link(server):
+    base, calls, _ = server
+    status, headers, body = _get(f"{base}/datasets/numbers?limit=10")
+    page = json.loads(body)
+    assert status == 200 and headers["X-Total-Count"] == "25"
+    assert [r["n"] for r in page["data"]] == list(range(10))
+    assert page["data"][0]["ds"].startswith("2025-05-01")
+
+    _, _, body = _get(base + json.loads(_get(base + page["next"])[2])["next"])
+    last = json.loads(body)
+    assert [r["n"] for r in last["data"]] == list(range(20, 25)) and last["next"] is None
+    assert len(calls) == 1  # one computation per data version
+
+
+def test_etag_revalidation_until_the_version_changes(server):
+    base, calls, version = server
+    _, headers, _ = _get(f"{base}/datasets/numbers")
+    tag = headers["ETag"]
+    assert _get(f"{base}/datasets/numbers", {"If-None-Match": tag})[0] == 304
+
+    version["value"] = "v2"
+    status, headers, _ = _get(f"{base}/datasets/numbers", {"If-None-Match": tag})
+    assert status == 200 and headers["ETag"] != tag and headers["X-Data-Version"] == "v2"
+    assert len(calls) == 2
+
+
+def test_arrow_format(server):
+    base, _, _ = server
+    status, headers, body = _get(f"{base}/datasets/numbers?offset=20", {"Accept": api.ARROW_MIME})
+    table = pa.ipc.open_stream(body).read_all()
+    assert headers["Content-Type"] == api.ARROW_MIME
+    assert table.column("n").to_pylist() == [20, 21, 22, 23, 24]
+
+
+def test_errors(server):
+    base, _, _ = server
+    assert _get(f"{base}/datasets/missing")[0] == 404
+    assert _get(f"{base}/nowhere")[0] == 404
+    assert _get(f"{base}/datasets/numbers?limit=ten")[0] == 400
+    status, _, body = _get(base)
+    assert status == 200 and json.loads(body)["datasets"] == {"numbers": "/datasets/numbers"}
+
+
+def test_ingredient_datasets_read_fresh_sales_not_the_page_caches(monkeypatch):
+    stale = pd.DataFrame({"May": [10.0]}, index=["beef ramen"])
+    fresh = stale.assign(June=[4.0])  # a June workbook landed after the pages cached May only
+
+    def load_monthly_sales(dataset_folder=None):
+        return stale
+    load_monthly_sales.__wrapped__ = lambda dataset_folder=None: fresh
+    monkeypatch.setattr(api.dl, "load_monthly_sales", load_monthly_sales)
+
+    totals = api.DATASETS["ingredient-totals"]().set_index("Ingredient")
+    assert totals.loc["Egg(count)", "June"] == pytest.approx(2.0)  # half an egg per beef ramen
+    usage = api.DATASETS["ingredient-usage"]()
+    assert usage[(usage["Ingredient"] == "Egg(count)") & (usage["Month"] == "June")]["Usage"].item() == pytest.approx(2.0)
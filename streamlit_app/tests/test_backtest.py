@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from pages.Predictive_Analysis import backtest
+from pages.Predictive_Analysis.backtest import rolling_origins, run_backtest, score
+
+NAIVE = {"model": "naive", "clip_factor": 5.0}
+HOLT = {"model": "holt", "alpha": 0.5, "beta": 0.1, "damping": 0.9, "clip_factor": 5.0}
+
+
+def test_rolling_origins_and_score():
+    assert rolling_origins(6, min_train=3, horizon=2) == [3, 4]
+    actual = np.array([[[10.0], [20.0], [np.nan]]])
+    predicted = np.array([[[12.0], [15.0], [1.0]]])
+    metrics = score(actual, predicted)
+    assert metrics["WAPE"][0] == pytest.approx(7 / 30 * 100)
+    assert metrics["MAPE"][0] == pytest.approx((0.2 + 0.25) / 2 * 100)
+    assert metrics["Bias"][0] == pytest.approx(-3 / 30 * 100)
+    assert metrics["Folds"][0] == 2
+
+
+def test_leaderboard_ranks_configs_per_series():
+    history = pd.DataFrame([[10, 10, 10, 10, 10, 10], [1, 2, 3, 4, 5, 6]], index=["flat", "trend"],
+                           columns=["May", "June", "July", "August", "September", "October"], dtype=float)
+    board = run_backtest(history, configs=[NAIVE, HOLT], max_workers=1)
+    assert len(board) == 4 and (board["Failed"] == 0).all() and (board["Folds"] == 3).all()
+    naive_trend = board[(board["Series"] == "trend") & board["Config"].str.startswith("naive")].iloc[0]
+    assert naive_trend["WAPE"] == pytest.approx(3 / 15 * 100)
+    assert board.groupby("Series")["Rank"].apply(list).to_dict() == {"flat": [1, 2], "trend": [1, 2]}
+
+
+def test_bad_config_fails_before_any_fit():
+    history = pd.DataFrame([[1.0] * 6], columns=[f"2025-0{m}" for m in range(1, 7)])
+    with pytest.raises(ValueError, match="missing alpha"):
+        run_backtest(history, configs=[{"model": "holt", "beta": 0.1, "damping": 0.9}])
+    with pytest.raises(ValueError, match="Unknown forecast model"):
+        run_backtest(history, configs=[{"model": "arima"}])
+
+
+def test_fit_errors_are_counted_and_other_errors_raise(monkeypatch):
+    ds = pd.date_range("2025-05-01", periods=6, freq="MS")
+    monkeypatch.setattr(backtest, "worker_data", lambda: {"ds": ds, "values": np.ones((1, 6)), "features": None})
+
+    def flaky(config, ds, y, horizon, features=None):
+        if len(y) == 4:
+            raise RuntimeError("Error during optimization!")
+        return np.ones(horizon)
+
+    monkeypatch.setattr(backtest, "fit_predict", flaky)
+    _, _, preds, failed = backtest._backtest_task("s", 0, NAIVE, [3, 4, 5], 1)
+    assert failed == 1 and np.isnan(preds[1]).all() and not np.isnan(preds[[0, 2]]).any()
+
+    monkeypatch.setattr(backtest, "fit_predict", lambda *a, **k: {}["missing key"])
+    with pytest.raises(KeyError):
+        backtest._backtest_task("s", 0, NAIVE, [3], 1)
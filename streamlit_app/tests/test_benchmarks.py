@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+import pytest
+import streamlit as st
+
+import data_loaders as dl
+from benchmarks.run import check, scaling_exponent, time_call
+from benchmarks.synthetic_data import generate_dataset, item_names, month_sequence
+
+
+def test_synthetic_dataset_loads_like_the_real_one(tmp_path):
+    data_dir = generate_dataset(tmp_path, n_months=3, n_items=70, n_ingredients=20, n_stores=2)
+    months = dl.discover_month_files(data_dir)
+    assert list(months) == ["May", "June", "July"]
+    sales = dl.load_monthly_sales.__wrapped__(data_dir)[["May", "June", "July"]]
+    assert len(sales) == 70
+    assert (data_dir / "stores" / "Store 2" / "July_Data_Matrix.xlsx").exists()
+
+    history = pd.read_csv(tmp_path / "cleaned_item_sales.csv")
+    assert history["Month"].unique().tolist() == ["2025-05", "2025-06", "2025-07"]
+    monthly = history.pivot_table(index="Item Name", columns="Month", values="Sales Count")
+    assert np.allclose(monthly.loc[sales.index.str.title()].to_numpy(), sales.to_numpy())
+
+
+def test_names_and_months():
+    assert item_names(66)[-2:] == ["Beef Ramen 2", "Chicken Ramen 2"]
+    assert month_sequence(3, start="November") == ["November", "December", "January"]
+    with pytest.raises(ValueError):
+        month_sequence(13)
+
+
+def test_scaling_exponent_and_regression_check():
+    linear = {50: 0.5, 100: 1.0, 200: 2.0}
+    quadratic = {50: 0.25, 100: 1.0, 200: 4.0}
+    assert scaling_exponent(linear) == pytest.approx(1.0)
+    assert scaling_exponent(quadratic) == pytest.approx(2.0)
+    assert check({"a": linear}, {"a": {"100": 1.0}}) == []
+    failures = check({"a": linear, "b": quadratic, "c": {50: "KeyError: 'x'"}}, {"a": {"100": 0.5}})
+    assert len(failures) == 3
+    assert failures[0].startswith("a at 100 items")
+
+
+def test_every_repeat_misses_the_nested_caches():
+    calls = []
+
+    @st.cache_data
+    def nested(folder):
+        calls.append(folder)
+
+    time_call(lambda: nested("data"), repeat=3)
+    assert len(calls) == 3
+    time_call(lambda: nested("data"), repeat=2, setup=None)
+    assert len(calls) == 3  # without the clear, repeats are cache hits
@@ -0,0 +1,86 @@
+import json
+import logging
+
+import numpy as np
+import pandas as pd
+import pytest
+import streamlit as st
+
+import cache_memory
+
+
+@st.cache_data
+def _cached_array(n):
+    return np.zeros(n)
+
+
+def test_cache_data_entries_use_the_stored_pickle_size():
+    _cached_array(1000)
+    rows = cache_memory.cache_entries()
+    row = rows[rows["Loader"].str.endswith("_cached_array")].iloc[0]
+    assert row["Kind"] == "data"
+    assert 8000 < row["Resident"] < 9000
+    assert "Deep" not in rows.columns
+
+
+@st.cache_data
+def _cached_names(n):
+    return pd.DataFrame({"name": pd.Series([f"item {i}" for i in range(n)], dtype=object)})
+
+
+def test_deep_size_is_measured_on_the_unpickled_value():
+    _cached_names(1000)
+    rows = cache_memory.cache_entries(deep=True)
+    row = rows[rows["Loader"].str.endswith("_cached_names")].iloc[0]
+    assert row["Deep"] == cache_memory.deep_size(_cached_names(1000))
+    assert row["Deep"] > row["Resident"]  # Python string objects outweigh their pickled bytes
+    report = cache_memory.memory_report(deep=True)
+    assert all("Per-rerun copies MB" in page for page in report["pages"].values())
+
+
+def test_missing_streamlit_internals_degrade_to_empty_listings(monkeypatch, caplog):
+    monkeypatch.setattr(cache_memory.cache_data_api, "_data_caches", object())
+    monkeypatch.setattr(cache_memory, "_internals_missing", False)
+    with caplog.at_level(logging.WARNING, logger="cache_memory"):
+        assert cache_memory.streamlit_internals() == ([], {})
+        cache_memory.streamlit_internals()
+    assert len(caplog.records) == 1
+    report = cache_memory.memory_report()
+    assert report["loaders"] == [] and report["sessions"] == {}
+
+
+def test_budgets_evict_largest_loaders_until_the_total_fits(monkeypatch):
+    cleared = []
+    loaders = {name: type("Loader", (), {"clear": staticmethod(lambda name=name: cleared.append(name))})
+               for name in ["a", "b", "c"]}
+    monkeypatch.setattr(cache_memory, "CACHED_LOADERS", loaders)
+    report = {"loaders": [{"Loader": "a", "Resident": 60.0}, {"Loader": "b", "Resident": 30.0},
+                          {"Loader": "c", "Resident": 20.0}]}
+    messages = cache_memory.check_budgets(report, {"total": 50, "c": 10}, action="evict")
+    assert cleared == ["c", "a"]
+    assert len(messages) == 4
+
+
+def test_report_is_written_as_json(tmp_path):
+    path = tmp_path / "memory_report.json"
+    report = cache_memory.check_memory(budgets={"total": 1e9}, path=path)
+    assert json.loads(path.read_text())["cache_total_mb"] == report["cache_total_mb"]
+
+
+def test_monitor_logs_a_failed_check_and_keeps_going(monkeypatch, caplog):
+    calls = []
+
+    def check_memory(*args):
+        calls.append(1)
+        raise OSError("disk full")
+
+    def sleep(seconds):
+        if len(calls) == 3:
+            raise KeyboardInterrupt
+
+    monkeypatch.setattr(cache_memory, "check_memory", check_memory)
+    monkeypatch.setattr(cache_memory.time, "sleep", sleep)
+    with caplog.at_level(logging.ERROR, logger="cache_memory"), pytest.raises(KeyboardInterrupt):
+        cache_memory.monitor(interval=0)
+    assert len(calls) == 3
+    assert [r.message for r in caplog.records] == ["Cache memory check failed"] * 3
@@ -0,0 +1,71 @@
+import os
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import pytest
+
+import charts
+from stores import stores_version
+
+
+@pytest.fixture(autouse=True)
+def _empty_chart_cache():
+    charts.clear_charts()
+    yield
+    charts.clear_charts()
+
+
+def test_lttb_keeps_the_ends_and_the_spike():
+    x = np.arange(1000)
+    y = np.zeros(1000)
+    y[437] = 50.0
+    picked = charts.lttb(x, y, 20)
+    assert len(picked) == 20 and picked[0] == 0 and picked[-1] == 999
+    assert 437 in picked
+    assert np.all(np.diff(picked) > 0)
+    assert charts.lttb(x[:10], y[:10], 20).tolist() == list(range(10))
+
+
+def test_downsample_per_group_and_by_column():
+    frame = pd.DataFrame({"ds": np.tile(pd.date_range("2025-01-01", periods=800), 2),
+                          "series": np.repeat(["a", "b"], 800), "y": np.arange(1600.0)})
+    reduced = charts.downsample(frame, "ds", "y", by="series", max_points=100)
+    assert reduced.groupby("series").size().tolist() == [100, 100]
+    assert len(charts.downsample(frame.head(50), "ds", "y", max_points=100)) == 50
+
+    wide = pd.DataFrame(np.random.default_rng(0).random((2, 900)))
+    cut = charts.downsample_columns(wide, max_points=200)
+    assert 3 <= cut.shape[1] <= 200 and cut.columns[0] == 0 and cut.columns[-1] == 899
+
+
+def test_charts_are_built_once_per_selection_and_version(monkeypatch):
+    builds = []
+
+    def build():
+        builds.append(1)
+        return go.Figure(go.Bar(y=[1, 2]))
+
+    monkeypatch.setattr(charts, "stores_version", lambda: (1, 10, 0.0))
+    first = charts.cached_chart("Page", ("a", ["x", "y"]), build)
+    assert charts.cached_chart("Page", ("a", ["x", "y"]), build) is first
+    charts.cached_chart("Page", ("b",), build)
+    assert len(builds) == 2
+
+    # A store workbook changed: same selection, new chart
+    monkeypatch.setattr(charts, "stores_version", lambda: (1, 12, 5.0))
+    charts.cached_chart("Page", ("a", ["x", "y"]), build)
+    assert len(builds) == 3
+    stats = charts.chart_cache_stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 3, 3)
+
+
+def test_stores_version_tracks_store_files(tmp_path):
+    assert stores_version(tmp_path / "missing") == (0, 0, 0.0)
+    workbook = tmp_path / "Store 1" / "May_Data_Matrix.xlsx"
+    workbook.parent.mkdir()
+    workbook.write_bytes(b"v1")
+    before = stores_version(tmp_path)
+    workbook.write_bytes(b"v2 longer")
+    os.utime(workbook, (1e9, 1e9))
+    assert stores_version(tmp_path) != before
@@ -0,0 +1,52 @@
+import pandas as pd
+import pytest
+
+from data_loaders import DATA_DIR
+from pages.Predictive_Analysis.combined_prev_months import COUNT_COLUMNS, DATE_COLUMNS, _pick_column, stream_previous_months
+
+
+def test_pick_column_prefers_exact_names_over_substrings():
+    header = ["Discount", "Item Name", "Account", "Sales Count", "Updated", "Date"]
+    assert _pick_column(header, *COUNT_COLUMNS) == "Sales Count"
+    assert _pick_column(header, *DATE_COLUMNS) == "Date"
+
+
+def test_pick_column_falls_back_to_whole_words():
+    assert _pick_column(["Discount", "Item Count"], *COUNT_COLUMNS) == "Item Count"
+    assert _pick_column(["Updated", "Order Time"], *DATE_COLUMNS) == "Order Time"
+    assert _pick_column(["Discount", "Account"], *COUNT_COLUMNS) is None
+    assert _pick_column(["Updated", "Timestamp tz"], *DATE_COLUMNS) is None
+
+
+def test_pick_column_rejects_ambiguous_headers():
+    with pytest.raises(ValueError, match="Ambiguous"):
+        _pick_column(["Item Count", "Refund Count"], *COUNT_COLUMNS)
+
+
+def test_stream_previous_months_aggregates_across_chunks(tmp_path):
+    pd.DataFrame({
+        "Item Name": ["Ramen", "Tea", "Ramen", None, "Tea"],
+        "Discount": [9, 9, 9, 9, 9],
+        "Sales Count": [1, 2, 3, 4, 5],
+        "Date": ["2025-05-01 10:00", "2025-05-01", "2025-05-02", "2025-05-02", "2025-06-01"],
+    }).to_csv(tmp_path / "pos.csv", index=False)
+
+    daily, monthly = stream_previous_months(tmp_path, chunksize=2)
+    monthly = monthly.set_index(["Item Name", "Month"])["Sales Count"]
+    assert monthly.to_dict() == {("Ramen", "2025-05"): 4, ("Tea", "2025-05"): 2, ("Tea", "2025-06"): 5}
+    assert daily["Sales Count"].sum() == 11
+
+
+def test_stream_previous_months_skips_non_sales_csvs_in_the_data_folder(caplog):
+    # data/ holds the recipe CSV ("Item name" plus Egg(count), Ramen (count), ...) next to the sales files
+    daily, monthly = stream_previous_months(DATA_DIR)
+    assert list(daily.columns) == ["Item Name", "Date", "Sales Count"]
+    assert list(monthly.columns) == ["Item Name", "Month", "Sales Count"]
+    assert "MSY Data - Ingredient.csv" in caplog.text
+
+
+def test_stream_previous_months_skips_csvs_without_counts_or_dates(tmp_path):
+    pd.DataFrame({"Item Name": ["Ramen"], "Rice(g)": [200]}).to_csv(tmp_path / "recipes.csv", index=False)
+    pd.DataFrame({"Item Name": ["Ramen"], "Sales Count": [3]}).to_csv(tmp_path / "May.csv", index=False)
+    _, monthly = stream_previous_months(tmp_path)
+    assert monthly.values.tolist() == [["Ramen", "May", 3]]
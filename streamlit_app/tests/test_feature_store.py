@@ -0,0 +1,37 @@
+import pandas as pd
+import pytest
+
+from feature_store import build_feature_matrix, daily_features
+
+
+@pytest.fixture
+def no_files(tmp_path):
+    return {"events_path": tmp_path / "no_events.csv", "weather_path": tmp_path / "no_weather.csv"}
+
+
+def test_calendar_counts_per_month(no_files):
+    matrix = build_feature_matrix("2025-07-15", "2025-08-02", "MS", **no_files)
+    assert list(matrix.index) == list(pd.to_datetime(["2025-07-01", "2025-08-01"]))
+    assert matrix.loc["2025-07-01"].to_dict() == {"holiday_days": 1.0, "weekend_days": 8.0, "class_days": 0.0, "summer_days": 31.0}
+    assert matrix.loc["2025-08-01"].to_dict() == {"holiday_days": 0.0, "weekend_days": 10.0, "class_days": 7.0, "summer_days": 12.0}
+
+
+def test_weeks_start_on_monday(no_files):
+    matrix = build_feature_matrix("2025-07-01", "2025-07-10", "W", **no_files)
+    assert list(matrix.index) == list(pd.to_datetime(["2025-06-30", "2025-07-07"]))
+    assert matrix["holiday_days"].tolist() == [1.0, 0.0]
+    assert matrix["weekend_days"].tolist() == [2.0, 2.0]
+
+
+def test_events_and_weather_files(tmp_path):
+    events, weather = tmp_path / "events.csv", tmp_path / "weather.csv"
+    events.write_text("Start,End,Event\n2025-08-30,,Game Day\n2025-08-22,2025-08-24,Ring Day\n")
+    weather.write_text("Date,Temp Max F\n2025-08-01,90\n2025-08-02,100\n")
+
+    days = daily_features("2025-08-01", "2025-08-03", events, weather)
+    assert days["weather_temp_max_f"].tolist() == [90.0, 100.0, 95.0]  # gap takes the mean
+
+    matrix = build_feature_matrix("2025-08-01", "2025-09-30", "MS", events, weather)
+    assert matrix["event_game_day"].tolist() == [1.0, 0.0]
+    assert matrix["event_ring_day"].tolist() == [3.0, 0.0]
+    assert matrix["weather_temp_max_f"].tolist() == pytest.approx([95.0, 95.0])
@@ -0,0 +1,33 @@
+import numpy as np
+import pandas as pd
+
+from pages.Predictive_Analysis.forecast_models import exog_effects, split_features
+
+
+def test_split_features_aligns_history_and_horizon():
+    features = pd.DataFrame({"holiday_days": [1.0, 0.0, 2.0]}, index=pd.date_range("2025-05-01", periods=3, freq="MS"))
+    hist, future = split_features(features, pd.date_range("2025-05-01", periods=2, freq="MS"), horizon=2)
+    assert hist["holiday_days"].tolist() == [1.0, 0.0]
+    assert list(future.index) == list(pd.to_datetime(["2025-07-01", "2025-08-01"]))
+    assert future["holiday_days"].tolist() == [2.0, 0.0]  # months past the matrix read 0
+
+
+def test_exog_effects_recover_a_linear_effect_per_series():
+    x = np.array([0.0, 1.0, 2.0, 3.0, 1.0, 0.0])
+    x_hist = np.column_stack([x, np.ones_like(x)])  # the constant column is dropped
+    x_future = np.array([[4.0, 1.0], [0.0, 1.0]])
+    y = np.vstack([3 + 2 * x, 5 - x])
+
+    fitted, future = exog_effects(x_hist, x_future, y, ridge=0.0)
+    np.testing.assert_allclose(fitted, y - y.mean(axis=1, keepdims=True))
+    np.testing.assert_allclose(future, [[2 * (4 - x.mean()), 2 * (0 - x.mean())], [-(4 - x.mean()), x.mean()]])
+
+    shrunk, _ = exog_effects(x_hist, x_future, y, ridge=1.0)
+    assert np.all(np.abs(shrunk) <= np.abs(fitted) + 1e-12)
+    assert np.abs(shrunk).sum() < np.abs(fitted).sum()
+
+
+def test_exog_effects_without_informative_features_are_zero():
+    fitted, future = exog_effects(np.ones((4, 2)), np.ones((3, 2)), [1.0, 2.0, 3.0, 4.0])
+    assert fitted.shape == (1, 4) and future.shape == (1, 3)
+    assert not fitted.any() and not future.any()
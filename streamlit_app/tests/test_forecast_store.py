@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+
+from data_loaders import build_forecast_store, ingredient_frame, ingredient_values, load_forecast_data, load_forecast_store
+
+
+def _forecast():
+    ds = pd.to_datetime(["2025-05-01", "2025-06-01", "2025-07-01"])
+    df = pd.DataFrame({
+        "ds": np.tile(ds, 2),
+        "ingredient": ["Egg"] * 3 + ["Beef"] * 3,
+        "yhat": [1.0, 2.0, 3.0, 10.0, 20.0, 30.0],
+        "period": ["Historical Proxy", "Historical Proxy", "Future Forecast"] * 2,
+    })
+    return df.sample(frac=1, random_state=0)  # rows in any order
+
+
+def test_store_groups_each_ingredient_in_date_order():
+    store = build_forecast_store(_forecast())
+    assert sorted(store["ingredients"]) == ["Beef", "Egg"]
+    assert ingredient_values(store, "Beef", "yhat").tolist() == [10.0, 20.0, 30.0]
+    assert ingredient_frame(store, "Egg", "Historical Proxy")["yhat"].tolist() == [1.0, 2.0]
+    assert ingredient_frame(store, "Egg", "Future Forecast")["ds"].tolist() == [pd.Timestamp("2025-07-01")]
+    assert np.shares_memory(ingredient_values(store, "Egg", "yhat"), store["columns"]["yhat"])
+
+
+def test_empty_forecast_gives_an_empty_store():
+    store = build_forecast_store(pd.DataFrame())
+    assert store["ingredients"] == [] and store["bounds"] == {}
+
+
+def test_forecast_csv_columns_are_renamed(tmp_path):
+    path = tmp_path / "forecast.csv"
+    pd.DataFrame({"Month_Label": ["May"], "Date": ["2025-05-01"], "Ingredient": ["Egg(count)"], "Forecast_LBS_or_Count": [5.0],
+                  "Monthly_Supply_Constraint": [7.0], "Shortfall_Surplus": [2.0]}).to_csv(path, index=False)
+    df = load_forecast_data(path)
+    assert list(df.columns) == ["ds", "ingredient", "yhat", "supply", "shortfall", "period"]
+    assert df["period"].tolist() == ["Historical Proxy"]
+
+
+def test_store_reloads_a_regenerated_csv_for_a_new_version(tmp_path):
+    path = tmp_path / "forecast.csv"
+    rows = {"Month_Label": ["May"], "Date": ["2025-05-01"], "Ingredient": ["Egg(count)"], "Forecast_LBS_or_Count": [5.0]}
+    pd.DataFrame(rows).to_csv(path, index=False)
+    assert load_forecast_store(path, version="a")["ingredients"] == ["Egg(count)"]
+    pd.DataFrame({**rows, "Ingredient": ["Rice(g)"]}).to_csv(path, index=False)
+    assert load_forecast_store(path, version="a")["ingredients"] == ["Egg(count)"]
+    assert load_forecast_store(path, version="b")["ingredients"] == ["Rice(g)"]
+
+
+def test_history_rows_follow_the_csv_marker(tmp_path):
+    path = tmp_path / "forecast.csv"
+    actions = ["Historical Data"] * 3 + ["✅ Sufficient Supply", "⚠️ SHORTFALL: Order More"]
+    pd.DataFrame({"Month_Label": ["m"] * 5, "Date": pd.date_range("2025-08-01", periods=5, freq="MS").strftime("%Y-%m-%d"),
+                  "Ingredient": ["Egg(count)"] * 5, "Forecast_LBS_or_Count": [1.0] * 5,
+                  "Action_Required": actions}).to_csv(path, index=False)
+    df = load_forecast_data(path)
+    assert df["period"].tolist() == ["Historical Proxy"] * 3 + ["Future Forecast"] * 2
@@ -0,0 +1,83 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from heavy_hitters import error_bound, feed_partitions, new_sketch, new_stream, top_k, update, update_heavy_hitters
+from sales_store import write_daily_partitions
+
+
+def _daily(rows):
+    return pd.DataFrame(rows, columns=["Item Name", "Date", "Sales Count"])
+
+
+def test_update_tracks_then_evicts_the_smallest_counter():
+    sketch = update(new_sketch(capacity=2), {"ramen": 5, "tea": 2, "void": 0})
+    assert sketch["counts"] == {"ramen": 5, "tea": 2} and sketch["total"] == 7
+
+    update(sketch, {"ramen": 1, "gyoza": 3})
+    assert sketch["counts"] == {"ramen": 6, "gyoza": 5}  # gyoza takes over tea's counter at 2 + 3
+    assert sketch["errors"] == {"ramen": 0.0, "gyoza": 2}
+    assert list(top_k(sketch, 1).index) == ["ramen"]
+    assert top_k(sketch).loc["gyoza", "Guaranteed"] == 3
+
+
+def test_estimates_stay_within_the_error_bound():
+    rng = np.random.default_rng(0)
+    items = [f"item{i}" for i in range(40)]
+    weights = rng.zipf(1.5, size=len(items)).astype(float)
+    sketch, true = new_sketch(capacity=8), {}
+    for _ in range(300):
+        item = items[rng.choice(len(items), p=weights / weights.sum())]
+        w = float(rng.integers(1, 5))
+        true[item] = true.get(item, 0) + w
+        update(sketch, {item: w})
+
+    bound = error_bound(sketch)
+    assert sketch["total"] == sum(true.values())
+    for item, count in sketch["counts"].items():
+        assert count - sketch["errors"][item] <= true[item] <= count
+        assert sketch["errors"][item] <= bound
+    assert all(item in sketch["counts"] for item, count in true.items() if count > bound)
+
+
+def test_feed_partitions_reads_only_new_days(tmp_path):
+    write_daily_partitions(_daily([("Ramen", "2025-06-02", 2), ("Tea", "2025-06-02", 1), ("Ramen", "2025-06-09", 4)]), tmp_path)
+    stream = feed_partitions(new_stream("W"), tmp_path)
+    assert stream["overall"]["counts"] == {"ramen": 6, "tea": 1}
+    assert list(stream["windows"]) == ["2025-06-02", "2025-06-09"]
+
+    write_daily_partitions(_daily([("Tea", "2025-06-10", 3)]), tmp_path)
+    stream = feed_partitions(stream, tmp_path)
+    assert stream["overall"]["counts"] == {"ramen": 6, "tea": 4}
+    assert stream["windows"]["2025-06-09"]["counts"] == {"ramen": 4, "tea": 3}
+
+
+def test_rewritten_partition_rebuilds_the_stream(tmp_path):
+    write_daily_partitions(_daily([("Ramen", "2025-06-02", 2), ("Ramen", "2025-06-03", 4)]), tmp_path)
+    stream = feed_partitions(new_stream("D"), tmp_path)
+    path = tmp_path / "2025" / "06" / "2025-06-02.csv"
+    write_daily_partitions(_daily([("Ramen", "2025-06-02", 7)]), tmp_path)
+    os.utime(path, (1, 1))
+    stream = feed_partitions(stream, tmp_path)
+    assert stream["overall"]["counts"] == {"ramen": 11}
+    assert stream["overall"]["total"] == 11
+
+
+def test_windows_are_capped(tmp_path):
+    write_daily_partitions(_daily([("Ramen", f"2025-06-0{d}", d) for d in range(1, 6)]), tmp_path)
+    stream = feed_partitions(new_stream("D", max_windows=2), tmp_path)
+    assert list(stream["windows"]) == ["2025-06-04", "2025-06-05"]
+    assert stream["overall"]["total"] == 15
+
+
+def test_update_heavy_hitters_persists_per_granularity(tmp_path):
+    store, state_path = tmp_path / "sales", tmp_path / "state" / "heavy_hitters_state.pkl"
+    write_daily_partitions(_daily([("Ramen", "2025-06-02", 2)]), store)
+    update_heavy_hitters("D", state_path, store)
+    update_heavy_hitters("M", state_path, store)
+    write_daily_partitions(_daily([("Ramen", "2025-06-03", 5)]), store)
+    stream = update_heavy_hitters("D", state_path, store)
+    assert stream["overall"]["counts"] == {"ramen": 7}
+    assert len(stream["seen"]) == 2
+    assert not list(state_path.parent.glob("*.tmp"))
@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from pages.Predictive_Analysis.hierarchical_forecast import project, to_constraint_table
+from data_loaders import load_forecast_data
+from recipes import split_line_supply
+
+SHIPMENTS = pd.DataFrame({"Ingredient": ["Peas + Carrot", "Egg "], "Unit of shipment": ["lbs", "eggs"],
+                          "Total monthly shipment": [480.0, 2400.0]})
+
+
+def test_shared_line_is_split_by_demand_share():
+    ingredients = pd.Series(["Peas(g)", "Carrot(g)", "Egg(count)", "Braised Pork(g)", "Peas(g)", "Carrot(g)"])
+    months = ["Nov", "Nov", "Nov", "Nov", "Dec", "Dec"]
+    supply = split_line_supply(ingredients, {"Peas + Carrot": 480.0, "Egg": 2400.0}, [300, 100, 50, 9, 0, 0], by=months)
+    assert supply[:3].tolist() == [360.0, 120.0, 2400.0]
+    assert np.isnan(supply[3])
+    assert supply[4:].tolist() == [240.0, 240.0]  # no demand: even split
+
+
+def test_constraint_table_counts_a_shared_line_once():
+    forecast = pd.DataFrame({
+        "ds": pd.to_datetime(["2025-11-01"] * 3),
+        "ingredient": ["Peas(g)", "Carrot(g)", "Egg(count)"],
+        "yhat": [300.0, 300.0, 100.0], "yhat_lower": [0.0] * 3, "yhat_upper": [0.0] * 3,
+        "period": ["Future Forecast"] * 3,
+    })
+    table = to_constraint_table(forecast, SHIPMENTS)
+    assert table["Monthly_Supply_Constraint"].tolist() == [240.0, 240.0, 2400.0]
+    assert table["Shortfall_Surplus"][:2].sum() == 480.0 - 600.0
+    assert table["Action_Required"].tolist()[:2] == ["⚠️ SHORTFALL: Order More"] * 2
+    assert table["Constraint_Unit"].tolist() == ["lbs", "lbs", "eggs"]
+    assert table["Forecasted_Usage_Original_Unit"][2] == 100.0
+
+
+def test_project_carries_point_and_samples_through_the_recipe():
+    recipe = np.array([[1.0, 0.0], [2.0, 1.0]])  # items x ingredients
+    point = np.array([[1.0, 2.0], [3.0, 4.0]])
+    samples = np.arange(2 * 2 * 3, dtype=float).reshape(2, 2, 3)
+    yhat, projected = project(recipe, point, samples)
+    assert yhat.tolist() == [[7.0, 10.0], [3.0, 4.0]]
+    assert projected[:, 1, 2].tolist() == pytest.approx([samples[0, 1, 2] + 2 * samples[1, 1, 2], samples[1, 1, 2]])
+
+
+def test_constraint_csv_keeps_its_history_split_when_reloaded(tmp_path):
+    periods = ["Historical Proxy"] * 8 + ["Future Forecast"] * 3  # not HISTORICAL_MONTHS
+    forecast = pd.DataFrame({
+        "ds": pd.date_range("2025-03-01", periods=11, freq="MS"), "ingredient": ["Egg(count)"] * 11,
+        "yhat": [100.0] * 11, "yhat_lower": [90.0] * 11, "yhat_upper": [110.0] * 11, "period": periods,
+    })
+    path = tmp_path / "forecast.csv"
+    to_constraint_table(forecast, SHIPMENTS).to_csv(path, index=False)
+    assert load_forecast_data(path)["period"].tolist() == periods
@@ -0,0 +1,90 @@
+from concurrent.futures import Executor
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pages.Predictive_Analysis import incremental
+
+HOLT = {"model": "holt", "alpha": 0.5, "beta": 0.1, "damping": 0.9, "clip_factor": 5.0}
+MONTHS = ["May", "June", "July", "August", "September", "October"]
+
+
+class InlineExecutor(Executor):
+    # Runs tasks in this process so the test can count fit_series calls
+    def __init__(self, max_workers=None):
+        pass
+
+    def map(self, fn, *iterables, **kwargs):
+        return list(map(fn, *iterables))
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    calls = []
+    fit_series = incremental.fit_series
+
+    def counting(config, ds, y, horizon, n_samples, seed=0, previous=None):
+        calls.append((seed, "update" if previous else "fit"))
+        return fit_series(config, ds, y, horizon, n_samples, seed, previous)
+
+    monkeypatch.setattr(incremental, "ProcessPoolExecutor", InlineExecutor)
+    monkeypatch.setattr(incremental, "fit_series", counting)
+    return calls
+
+
+def _history(n_months, n_series=3):
+    rng = np.random.default_rng(1)
+    return pd.DataFrame(rng.uniform(10, 20, (n_series, 6))[:, :n_months], index=[f"item {i}" for i in range(n_series)],
+                        columns=MONTHS[:n_months])
+
+
+def _run(history, state_path, **kwargs):
+    return incremental.update_forecasts(history, HOLT, 2, 10, state_path=state_path, **kwargs)
+
+
+def test_first_run_fits_every_series_once_even_with_full_refit(calls, tmp_path):
+    state = tmp_path / "state" / "forecast.pkl"
+    _, point, samples, report = _run(_history(4), state, full_refit=True)
+    assert sorted(calls) == [(0, "fit"), (1, "fit"), (2, "fit")]
+    assert point.shape == (3, 2) and samples.shape == (3, 2, 10)
+    assert "Drift vs Full Refit" not in report
+    assert state.exists() and not list(state.parent.glob("*.tmp"))
+
+    calls.clear()
+    _run(_history(4), state)
+    assert calls == []  # nothing changed
+
+    calls.clear()
+    _run(_history(4), state, full_refit=True)
+    assert calls == []  # nothing was warm-started, so a full refit has nothing to compare
+
+
+def test_full_refit_refits_only_warm_started_series(calls, tmp_path):
+    state = tmp_path / "forecast.pkl"
+    _run(_history(4), state)
+
+    calls.clear()
+    _run(_history(5), state)
+    assert sorted(calls) == [(0, "update"), (1, "update"), (2, "update")]
+
+    calls.clear()
+    revised = _history(6)
+    revised.loc["item 0", "May"] = 1.0  # item 0's past changed: fit from scratch, nothing to compare
+    report = _run(revised, state, full_refit=True)[3]
+    assert sorted(calls) == [(0, "fit"), (1, "fit"), (1, "update"), (2, "fit"), (2, "update")]
+    drift = report.set_index("Series")["Drift vs Full Refit"]
+    assert np.isnan(drift["item 0"]) and (drift[["item 1", "item 2"]] >= 0).all()
+
+    # The fresh fits replaced the updates, so the next full refit has nothing warm to redo
+    calls.clear()
+    _run(revised, state, full_refit=True)
+    assert calls == []
+
+
+def test_changed_settings_fit_every_series_once(calls, tmp_path):
+    state = tmp_path / "forecast.pkl"
+    _run(_history(4), state)
+    calls.clear()
+    incremental.update_forecasts(_history(5), {**HOLT, "alpha": 0.8}, 2, 10, state_path=state)
+    assert sorted(calls) == [(0, "fit"), (1, "fit"), (2, "fit")]
@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+
+from inventory_sim import delivery_schedule, project_stock, simulate_inventory
+
+
+def _reference(deliveries, usage, initial, life):
+    # Day-by-day FIFO lots: the loop the vectorized simulator replaces
+    n_lines, n_days = deliveries.shape
+    on_hand, spoiled, lost = (np.zeros((n_lines, n_days)) for _ in range(3))
+    for i in range(n_lines):
+        lots = [[0, initial[i]]]
+        for t in range(n_days):
+            lots.append([t, deliveries[i, t]])
+            need = usage[i, t]
+            for lot in lots:
+                take = min(lot[1], need)
+                lot[1] -= take
+                need -= take
+            lost[i, t] = need
+            if not np.isnan(life[i]):
+                spoiled[i, t] = sum(q for day, q in lots if t - day >= max(life[i], 1) - 1)
+                lots = [lot for lot in lots if t - lot[0] < max(life[i], 1) - 1]
+            on_hand[i, t] = sum(q for _, q in lots)
+    return on_hand, spoiled, lost
+
+
+def test_delivery_schedule_follows_frequency():
+    shipments = pd.DataFrame({"Quantity per shipment": [10, 5, 2], "Number of shipments": [1, 2, 1],
+                              "frequency": ["weekly", " Biweekly", "monthly"]})
+    days = pd.date_range("2025-05-30", periods=15)
+    schedule = delivery_schedule(shipments, days)
+    assert np.flatnonzero(schedule[0]).tolist() == [0, 7, 14]
+    assert schedule[1].sum() == 20 and np.flatnonzero(schedule[1]).tolist() == [0, 14]
+    assert days[np.flatnonzero(schedule[2])].day.tolist() == [1]
+
+
+def test_simulation_matches_fifo_reference():
+    rng = np.random.default_rng(0)
+    deliveries = np.where(rng.random((5, 40)) < 0.2, rng.uniform(5, 30, (5, 40)), 0.0)
+    usage = rng.uniform(0, 4, (5, 40))
+    initial = rng.uniform(0, 10, 5)
+    for life in (np.full(5, np.nan), np.array([np.nan, 1, 3, 7, 30])):
+        sim = simulate_inventory(deliveries, usage, initial, life)
+        on_hand, spoiled, lost = _reference(deliveries, usage, initial, life)
+        np.testing.assert_allclose(sim["on_hand"], on_hand, atol=1e-9)
+        np.testing.assert_allclose(sim["spoiled"], spoiled, atol=1e-9)
+        np.testing.assert_allclose(sim["shortfall"], lost, atol=1e-9)
+
+
+def test_project_stock_flags_days_below_reorder_point():
+    shipments = pd.DataFrame({"Ingredient": ["Beef"], "Unit of shipment": ["lbs"], "Quantity per shipment": [70],
+                              "Number of shipments": [1], "frequency": ["weekly"]})
+    usage = pd.DataFrame({"May": [30.44 * 10]}, index=["Beef"])  # 10 lbs a day
+    long, summary = project_stock(shipments, usage, "2025-06-02", n_days=14, shelf_life_days={})
+    assert summary.loc[0, "Reorder Point"] == 30.0
+    np.testing.assert_allclose(long["On Hand"].iloc[:7], [60, 50, 40, 30, 20, 10, 0], atol=1e-9)
+    assert summary.loc[0, "Days Below Reorder"] == 6
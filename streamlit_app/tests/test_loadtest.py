@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+from streamlit.proto.Element_pb2 import Element
+
+from benchmarks.loadtest import _widget_kind, _widget_state, summarize
+
+
+def _element(kind, **fields):
+    element = Element()
+    getattr(element, kind).MergeFrom(type(getattr(element, kind))(**fields))
+    return element
+
+
+def test_widget_states_are_valid_values():
+    rng = np.random.default_rng(0)
+    select = _element("selectbox", id="s", label="Select month", options=["May", "June"])
+    assert _widget_state("s", _widget_kind(select), select.selectbox, None, rng).string_value in {"May", "June"}
+    assert _widget_state("s", "selectbox", select.selectbox, "June", rng).string_value == "June"
+
+    months = _element("slider", id="r", label="Month Range", options=["May", "June", "July"], default=[0, 2])
+    assert _widget_kind(months) == "select_slider"
+    picked = list(_widget_state("r", "select_slider", months.slider, None, rng).string_array_value.data)
+    assert len(picked) == 2 and picked == sorted(picked, key=["May", "June", "July"].index)
+
+    days = _element("slider", id="d", label="Days", min=30, max=90, step=30, default=[60])
+    value = _widget_state("d", _widget_kind(days), days.slider, None, rng).double_array_value.data
+    assert len(value) == 1 and value[0] in {30.0, 60.0, 90.0}
+
+    check = _element("checkbox", id="c", label="Use all categories")
+    assert _widget_state("c", _widget_kind(check), check.checkbox, False, rng).HasField("bool_value")
+    assert _widget_kind(_element("markdown", body="x")) is None
+
+
+def test_summary_percentiles_skip_failed_runs():
+    runs = pd.DataFrame({
+        "page": ["pages/A.py"] * 3 + ["pages/B.py"],
+        "seconds": [1.0, 2.0, 30.0, np.nan],
+        "error": [None, None, "boom", "LookupError: x"],
+    })
+    summary = summarize(runs)
+    assert summary.loc["A", ["Runs", "Errors", "p50 (s)"]].tolist() == [3, 1, 1.5]
+    assert np.isnan(summary.loc["B", "p95 (s)"])
@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_loaders import load_ingredient_data, load_monthly_sales
+from margins import cost_matrix, ingredient_margin, item_revenue, margin_table, pattern_hits
+from recipes import G_TO_LBS
+
+
+def _costs(rows):
+    return pd.DataFrame(rows, columns=["Ingredient", "Unit", "Cost per Unit", "Effective From"]).assign(
+        **{"Effective From": lambda df: pd.to_datetime(df["Effective From"])})
+
+
+def test_cost_revisions_apply_from_their_month_in_recipe_units():
+    costs = _costs([["Beef(g)", "lb", 4.0, "2000-01-01"], ["Beef(g)", "kg", 11.0, "2025-07-01"],
+                    ["Egg(count)", "each", 0.25, "2000-01-01"]])
+    matrix = cost_matrix(costs, ["Beef(g)", "Egg(count)", "Rice(g)"], ["June", "July"])
+    assert matrix[0] == pytest.approx([4.0, 11.0 / (1000 * G_TO_LBS)])
+    assert matrix[1].tolist() == [0.25, 0.25]
+    assert matrix[2].tolist() == [0.0, 0.0]
+
+
+def test_cost_months_keep_the_year_of_dated_labels():
+    costs = _costs([["Beef(g)", "lb", 4.0, "2000-01-01"], ["Beef(g)", "lb", 5.0, "2026-01-01"]])
+    assert cost_matrix(costs, ["Beef(g)"], ["2025-12", "2026-01"])[0].tolist() == [4.0, 5.0]
+
+
+def test_mismatched_cost_unit_is_rejected():
+    with pytest.raises(ValueError, match="does not match"):
+        cost_matrix(_costs([["Egg(count)", "lb", 1.0, "2000-01-01"]]), ["Egg(count)"], ["May"])
+
+
+def test_pattern_hits_use_special_matches():
+    hits = pattern_hits(["fried chicken combo", "crunch chicken wings", "beef ramen"], ["fried wings", "beef ramen"])
+    assert hits.tolist() == [[1, 2, 0], [0, 0, 1]]
+
+
+def test_ingredient_margin_without_costs_matches_the_revenue_attribution():
+    margins = margin_table(item_revenue(), load_monthly_sales())
+    by_ingredient = ingredient_margin(margins)
+    revenue, totals = load_ingredient_data()
+    for month, values in revenue.items():
+        assert by_ingredient[month].to_dict() == pytest.approx(values)
+        assert margins["margin"][month].sum() == pytest.approx(totals[month])
+    assert np.allclose(margins["margin"], margins["revenue"])
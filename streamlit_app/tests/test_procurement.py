@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+
+from procurement import optimize_orders
+
+
+def _shipments():
+    return pd.DataFrame({"Ingredient": ["Beef ", "Egg"], "Quantity per shipment": [10.0, 30.0],
+                         "Number of shipments": [1, 1], "frequency": ["weekly", "monthly"],
+                         "Unit of shipment": ["lbs", "count"]})
+
+
+def _balance_holds(plan, initial=0.0):
+    for _, rows in plan.groupby("Ingredient", sort=False):
+        start = np.concatenate([[initial], rows["Ending Stock"].to_numpy()[:-1]])
+        np.testing.assert_allclose(start + rows["Order Qty"] - rows["Demand"] + rows["Shortfall"], rows["Ending Stock"], atol=1e-6)
+
+
+def test_orders_cover_demand_with_whole_packs():
+    demand = pd.DataFrame({"2025-11": [25.0, 60.0], "2025-12": [15.0, 0.0]}, index=["Beef", "Egg"])
+    plan = optimize_orders(demand, _shipments())
+    beef = plan[plan["Ingredient"] == "Beef"]
+    assert beef["Shortfall"].sum() < 1e-6
+    assert beef["Packs"].sum() == 4 and (beef["Packs"] % 1 == 0).all()
+    egg = plan[plan["Ingredient"] == "Egg"]
+    assert egg["Packs"].tolist() == [2, 0] and egg["Packs per Delivery"].tolist() == [2, 0]
+    _balance_holds(plan)
+
+
+def test_pack_limit_and_storage_cap_force_shortfalls():
+    demand = pd.DataFrame({"2025-11": [200.0]}, index=["Beef"])
+    plan = optimize_orders(demand, _shipments())  # at most 4 deliveries x 1 pack x 3
+    assert plan["Packs"].tolist() == [12] and plan["Shortfall"].tolist() == [80.0]
+
+    capped = optimize_orders(demand, _shipments(), initial_stock=5.0, storage_caps={"Beef": 45.0})
+    assert capped["Order Qty"].tolist() == [40.0]
+    _balance_holds(capped, initial=5.0)
@@ -0,0 +1,63 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import recipes
+from recipes import G_TO_LBS, resolve_bom
+
+ITEMS = ["ramen", "rice bowl"]
+INGREDIENTS = ["Egg(count)", "Rice(g)"]
+MATRIX = np.array([[1.0, 0.0], [0.0, 200 * G_TO_LBS]])
+
+
+def _bom(rows):
+    return pd.DataFrame(rows, columns=["Parent", "Component", "Quantity"])
+
+
+def test_nested_components_flatten_to_ingredients():
+    nodes, flat = resolve_bom(ITEMS, INGREDIENTS, MATRIX, _bom([
+        ("Lunch Combo", "Ramen", 1), ("Lunch Combo", "Rice Bowl", 0.5),
+        ("Egg Batch", "egg(count)", 2),
+        ("Family Set", "Lunch Combo", 2), ("Family Set", "Egg Batch", 1), ("Family Set", "Rice(g)", 100),
+    ]))
+    assert nodes == ["ramen", "rice bowl", "lunch combo", "egg batch", "family set"]
+    flat = pd.DataFrame(flat, index=nodes, columns=INGREDIENTS)
+    np.testing.assert_allclose(flat.loc[ITEMS].to_numpy(), MATRIX)
+    np.testing.assert_allclose(flat.loc["lunch combo"], [1.0, 100 * G_TO_LBS])
+    np.testing.assert_allclose(flat.loc["egg batch"], [2.0, 0.0])
+    np.testing.assert_allclose(flat.loc["family set"], [4.0, 300 * G_TO_LBS])
+
+
+def test_cycle_raises():
+    with pytest.raises(ValueError, match="cycle"):
+        resolve_bom(ITEMS, INGREDIENTS, MATRIX, _bom([
+            ("Combo A", "Combo B", 1), ("Combo B", "Combo A", 1), ("Combo B", "Ramen", 1),
+        ]))
+
+
+def test_unknown_component_raises():
+    with pytest.raises(ValueError, match="dumpling"):
+        resolve_bom(ITEMS, INGREDIENTS, MATRIX, _bom([("Lunch Combo", "Ramen", 1), ("Lunch Combo", "Dumpling", 6)]))
+
+
+def test_usage_by_line_is_none_without_workbooks_and_reloads_per_version(monkeypatch):
+    current = {"sales": None}
+    monkeypatch.setattr(recipes, "load_monthly_sales", SimpleNamespace(__wrapped__=lambda: current["sales"]))
+    assert recipes.load_usage_by_line(version="v1") is None
+
+    current["sales"] = pd.DataFrame({"May": [10.0]}, index=["beef ramen"])
+    assert recipes.load_usage_by_line(version="v1") is None  # cached for this version
+    usage = recipes.load_usage_by_line(version="v2")
+    assert usage.loc["Egg", "May"] == pytest.approx(5.0)  # half an egg per beef ramen
+
+
+def test_recipe_matrix_reloads_an_edited_csv_for_a_new_version(tmp_path):
+    path = tmp_path / "recipes.csv"
+    path.write_text("Item name,Egg(count)\nRamen,1\n")
+    sales = pd.DataFrame({"May": [4.0]}, index=["ramen"])
+    assert recipes.ingredient_usage(sales, path, version="a").loc["Egg(count)", "May"] == 4.0
+    path.write_text("Item name,Egg(count)\nRamen,2\n")
+    assert recipes.ingredient_usage(sales, path, version="a").loc["Egg(count)", "May"] == 4.0
+    assert recipes.ingredient_usage(sales, path, version="b").loc["Egg(count)", "May"] == 8.0
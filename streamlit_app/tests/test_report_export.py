@@ -0,0 +1,32 @@
+import pandas as pd
+from plotly.offline import get_plotlyjs
+
+import report_export
+
+
+def test_html_pack_is_self_contained(tmp_path):
+    paths, timings, n_sections = report_export.export_reports("html", tmp_path, items=False, max_workers=1)
+    page = paths[0].read_text(encoding="utf-8")
+    assert page.count(get_plotlyjs()) == 1
+    assert "<script src=" not in page
+    assert page.count("<section") == n_sections
+    assert page.index(get_plotlyjs()) < page.index("Plotly.newPlot")
+    assert set(timings) == {"data", "render", "write"}
+
+
+def test_tasks_cover_every_ingredient_item_and_month():
+    usage = pd.DataFrame({"May": [1.0, 2.0]}, index=["Egg", "Beef"])
+    sales = pd.DataFrame({"May": [3.0]}, index=["beef ramen"])
+    data = {"stores": {"A": {"ingredient_usage": usage, "item_sales": sales},
+                       "All": {"ingredient_usage": usage, "item_sales": sales}},
+            "chain": "All", "margins": {"margin": pd.DataFrame(columns=["May", "June"])}}
+    tasks = report_export.report_tasks(data)
+    assert len(tasks) == 2 * 3 + 2
+    assert tasks[-2:] == [("month", "All", "May"), ("month", "All", "June")]
+    assert not [t for t in report_export.report_tasks(data, items=False) if t[0] == "item"]
+
+
+def test_excel_pack_has_the_detail_sheets(tmp_path):
+    paths, _, _ = report_export.export_reports("excel", tmp_path, items=False, max_workers=1)
+    sheets = pd.ExcelFile(paths[0]).sheet_names
+    assert {"Ingredient Usage", "Item Sales", "Ingredient Detail", "Month Detail"} <= set(sheets)
@@ -0,0 +1,48 @@
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from safety_stock import DAYS_PER_MONTH, INTERVAL_WIDTH, reorder_table
+
+SHIPMENTS = pd.DataFrame({"Ingredient": ["Peas + Carrot", "Rice"], "Quantity per shipment": [40, 50],
+                          "Number of shipments": [3, 2], "frequency": ["weekly", "Biweekly"]})
+
+
+def _forecast(rows):
+    # rows: ingredient -> monthly yhat; the 80% band is +-10 around it
+    frames = []
+    for ingredient, yhat in rows.items():
+        ds = pd.date_range("2025-11-01", periods=len(yhat), freq="MS")
+        frames.append(pd.DataFrame({"ds": ds, "ingredient": ingredient, "yhat": yhat, "yhat_lower": np.subtract(yhat, 10),
+                                    "yhat_upper": np.add(yhat, 10), "period": "Future Forecast"}))
+    return pd.concat(frames, ignore_index=True)
+
+
+def test_periodic_review_reorder_point():
+    table = reorder_table(_forecast({"Rice(g)": [304.4, 304.4]}), SHIPMENTS, service_level=0.95, lead_days=3)
+    row = table.loc["Rice(g)"]
+    sigma = 10 / NormalDist().inv_cdf(0.5 + INTERVAL_WIDTH / 2) / np.sqrt(DAYS_PER_MONTH)
+    assert row["Review Period (days)"] == 14 and row["Lead Time (days)"] == 3
+    assert row["Daily Demand"] == pytest.approx(10.0)
+    assert row["Safety Stock"] == pytest.approx(NormalDist().inv_cdf(0.95) * sigma * np.sqrt(17))
+    assert row["Reorder Point"] == pytest.approx(170 + row["Safety Stock"])
+    assert row["Days of Cover"] == pytest.approx(10.0)
+
+
+def test_shared_line_deliveries_are_split_by_demand():
+    table = reorder_table(_forecast({"Peas(g)": [90.0], "Carrot(g)": [30.0], "Braised Pork(g)": [50.0]}), SHIPMENTS)
+    assert table.loc[["Peas(g)", "Carrot(g)"], "Per Delivery"].tolist() == [90.0, 30.0]
+    assert np.isnan(table.loc["Braised Pork(g)", "Reorder Point"])
+
+
+def test_below_reorder_point_compares_stock_position():
+    forecast = _forecast({"Rice(g)": [304.4], "Peas(g)": [30.44], "Carrot(g)": [30.44]})
+    table = reorder_table(forecast, SHIPMENTS, on_hand=pd.Series({"Rice(g)": 100.0, "Peas(g)": 500.0}),
+                          on_order=pd.Series({"Rice(g)": 100.0}))
+    rop = table["Reorder Point"]
+    assert table.loc["Rice(g)", "Stock Position"] == 200.0
+    assert bool(table.loc["Rice(g)", "Below Reorder Point"]) == (200.0 < rop["Rice(g)"])
+    assert not table.loc["Peas(g)", "Below Reorder Point"]
+    assert pd.isna(table.loc["Carrot(g)", "Below Reorder Point"])  # no stock count
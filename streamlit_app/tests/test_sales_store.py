@@ -0,0 +1,54 @@
+import pandas as pd
+
+from sales_store import aggregate_sales, list_partitions, load_usage_by_period, store_version, write_daily_partitions
+
+
+def _daily(rows):
+    return pd.DataFrame(rows, columns=["Item Name", "Date", "Sales Count"])
+
+
+def test_partitions_aggregate_by_period(tmp_path):
+    written = write_daily_partitions(_daily([
+        ("Ramen", "2025-05-30", 2), ("Ramen", "2025-05-30", 1), ("Tea", "2025-06-02", 4), ("Ramen", "2025-06-03", 5),
+    ]), tmp_path)
+    assert written == 3
+    assert (tmp_path / "2025" / "05" / "2025-05-30.csv").exists()
+
+    monthly = aggregate_sales("M", store_dir=tmp_path)
+    assert monthly.loc["ramen"].to_dict() == {"2025-05": 3, "2025-06": 5}
+    assert monthly.loc["tea"].to_dict() == {"2025-05": 0, "2025-06": 4}
+
+    weekly = aggregate_sales("W", store_dir=tmp_path)
+    assert list(weekly.columns) == ["2025-05-26", "2025-06-02"]  # weeks start on Monday
+    assert aggregate_sales(None, store_dir=tmp_path)["Total"].to_dict() == {"ramen": 8, "tea": 4}
+
+
+def test_date_and_item_filters(tmp_path):
+    write_daily_partitions(_daily([("Ramen", "2025-05-30", 2), ("Tea", "2025-06-02", 4), ("Ramen", "2025-06-03", 5)]), tmp_path)
+    assert [day.day for day, _ in list_partitions("2025-06-01", "2025-06-02", tmp_path)] == [2]
+    only_ramen = aggregate_sales("D", start="2025-06-01", items=["RAMEN"], store_dir=tmp_path)
+    assert only_ramen.loc["ramen"].to_dict() == {"2025-06-02": 0, "2025-06-03": 5}
+
+
+def test_rewriting_a_day_replaces_it(tmp_path):
+    write_daily_partitions(_daily([("Ramen", "2025-05-30", 2)]), tmp_path)
+    write_daily_partitions(_daily([("Ramen", "2025-05-30", 7)]), tmp_path)
+    assert aggregate_sales("M", store_dir=tmp_path).loc["ramen", "2025-05"] == 7
+    assert store_version(tmp_path)[0] == 1
+    assert aggregate_sales("M", store_dir=tmp_path / "missing").empty
+
+
+def test_stray_directories_and_files_are_ignored(tmp_path):
+    write_daily_partitions(_daily([("Ramen", "2025-05-30", 2)]), tmp_path)
+    (tmp_path / "exports").mkdir()
+    (tmp_path / "2025" / "backup").mkdir()
+    (tmp_path / "2025" / "05" / "notes.csv").write_text("Item Name,Sales Count\n")
+    assert [day.day for day, _ in list_partitions(store_dir=tmp_path)] == [30]
+
+
+def test_usage_by_period_goes_through_the_recipe_matrix(tmp_path):
+    write_daily_partitions(_daily([("Beef Ramen", "2025-06-02", 2), ("Beef Ramen", "2025-06-09", 3)]), tmp_path)
+    usage = load_usage_by_period("Weekly", store_dir=tmp_path)
+    assert list(usage.columns) == ["2025-06-02", "2025-06-09"]
+    assert usage.loc["Ramen (count)"].tolist() == [2.0, 3.0]  # one ramen per serving in the recipe CSV
+    assert load_usage_by_period("Daily", store_dir=tmp_path / "missing").empty
@@ -0,0 +1,65 @@
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from shared_arrays import init_worker, join_frames, published, split_frames, worker_data
+
+
+def _data():
+    return {
+        "sales": pd.DataFrame({"May": [1.0, 2.0], "June": [3.0, 4.0]}, index=["ramen", "tea"]),
+        "counts": pd.Series([5, 6], index=["a", "b"], name="n"),
+        "ds": pd.date_range("2025-05-01", periods=2, freq="MS"),
+        "mixed": pd.DataFrame({"name": ["x"], "qty": [1.0]}),
+        "rows": [np.arange(3.0), ("label", np.zeros(0, dtype=int))],
+    }
+
+def _assert_same(joined, data):
+    pd.testing.assert_frame_equal(joined["sales"], data["sales"])
+    pd.testing.assert_series_equal(joined["counts"], data["counts"])
+    pd.testing.assert_index_equal(joined["ds"], data["ds"])
+    pd.testing.assert_frame_equal(joined["mixed"], data["mixed"])
+    np.testing.assert_array_equal(joined["rows"][0], data["rows"][0])
+    assert joined["rows"][1][0] == "label" and joined["rows"][1][1].shape == (0,)
+
+def _segment_exists(name):
+    try:
+        shared_memory.SharedMemory(name=name).close()
+    except FileNotFoundError:
+        return False
+    return True
+
+def _read_in_worker(_):
+    data = worker_data()
+    _assert_same(data, _data())
+    return data["sales"].to_numpy().flags.writeable, float(data["sales"].to_numpy().sum())
+
+
+def test_split_and_join_round_trip():
+    data = _data()
+    skeleton, arrays = split_frames(data)
+    assert sorted(arrays) == ["data/counts", "data/rows/0", "data/rows/1/1", "data/sales"]
+    assert skeleton["mixed"] is data["mixed"] and skeleton["ds"] is data["ds"]  # not numeric frames: kept as they are
+    _assert_same(join_frames(skeleton, arrays), data)
+
+
+def test_workers_read_published_frames_and_segments_are_removed():
+    skeleton, arrays = split_frames(_data())
+    with published(arrays) as manifest:
+        names = [name for name, _, _ in manifest.values()]
+        assert all(_segment_exists(name) for name in names)
+        with ProcessPoolExecutor(max_workers=2, initializer=init_worker, initargs=(manifest, skeleton)) as pool:
+            results = list(pool.map(_read_in_worker, range(4)))
+    assert results == [(False, 10.0)] * 4  # read-only views onto the segments
+    assert not any(_segment_exists(name) for name in names)
+
+
+def test_segments_are_removed_when_the_body_raises():
+    with pytest.raises(RuntimeError):
+        with published({"x": np.ones(4)}) as manifest:
+            name = manifest["x"][0]
+            raise RuntimeError("task failed")
+    assert not _segment_exists(name)
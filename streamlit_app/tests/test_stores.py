@@ -0,0 +1,55 @@
+import pandas as pd
+
+import data_loaders as dl
+import stores
+
+
+def test_single_location_install_is_main(tmp_path):
+    assert stores.discover_stores(tmp_path / "missing") == {"Main": dl.DATA_DIR}
+    (tmp_path / "Empty").mkdir()
+    (tmp_path / "College Station").mkdir()
+    (tmp_path / "College Station" / "May_Data_Matrix.xlsx").touch()
+    assert list(stores.discover_stores(tmp_path)) == ["College Station"]
+
+
+def test_store_recipes_swap_in_override_rows(tmp_path):
+    chain = pd.DataFrame({"Item name": ["Beef Ramen", "Tea"], "Beef(g)": [100, 0]})
+    chain_path = tmp_path / "chain.csv"
+    chain.to_csv(chain_path, index=False)
+    pd.DataFrame({"Item name": [" beef ramen"], "Beef(g)": [150]}).to_csv(tmp_path / dl.INGREDIENTS_PATH.name, index=False)
+
+    recipes = stores.store_recipes(tmp_path, chain_path).set_index("Item name")["Beef(g)"]
+    assert recipes.to_dict() == {"Tea": 0, " beef ramen": 150}
+    assert stores.store_shipment_path(tmp_path) == dl.SHIPMENT_PATH
+
+
+def test_roll_up_sums_stores_in_calendar_order():
+    a = {"store": "A", "ingredient_usage": pd.DataFrame({"June": [1.0], "May": [2.0]}, index=["Beef"]),
+         "item_sales": None, "category_income": pd.DataFrame(),
+         "monthly_supply": pd.Series({"Beef": 10.0})}
+    b = {"store": "B", "ingredient_usage": pd.DataFrame({"May": [3.0]}, index=["Egg"]),
+         "item_sales": None, "category_income": pd.DataFrame(),
+         "monthly_supply": pd.Series({"Beef": 5.0, "Egg": 1.0})}
+    chain = stores.roll_up({"A": a, "B": b})
+    assert chain["store"] == stores.CHAIN_WIDE
+    assert list(chain["ingredient_usage"].columns) == ["May", "June"]
+    assert chain["ingredient_usage"].loc["Egg"].to_dict() == {"May": 3.0, "June": 0.0}
+    assert chain["monthly_supply"].to_dict() == {"Beef": 15.0, "Egg": 1.0}
+    assert chain["item_sales"] is None and chain["category_income"] is None
+
+
+def test_forecast_usage_continues_each_ingredient():
+    usage = pd.DataFrame({"September": [10.0, 0.0], "October": [12.0, 0.0]}, index=["Beef", "Egg"])
+    forecast = stores.forecast_usage(usage, horizon=3)
+    assert list(forecast.columns) == ["2025-11", "2025-12", "2026-01"]
+    assert (forecast.loc["Beef"] > 12.0).all()  # upward trend carries on, damped
+    assert forecast.loc["Egg"].tolist() == [0.0, 0.0, 0.0]
+    assert stores.forecast_usage(pd.DataFrame()).empty
+
+
+def test_roll_up_sums_store_forecasts():
+    def view(values):
+        return {"ingredient_usage": None, "item_sales": None, "category_income": None, "monthly_supply": None,
+                "ingredient_forecast": pd.DataFrame(values, index=["Beef"])}
+    chain = stores.roll_up({"A": view({"2026-01": [1.0], "2025-12": [2.0]}), "B": view({"2025-12": [3.0]})})
+    assert chain["ingredient_forecast"].loc["Beef"].to_dict() == {"2025-12": 5.0, "2026-01": 1.0}
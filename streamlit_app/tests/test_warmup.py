@@ -0,0 +1,38 @@
+import threading
+
+import data_loaders as dl
+import warmup
+
+
+def test_warm_up_times_every_page_and_reports_errors():
+    def broken():
+        raise ValueError("bad file")
+
+    timings = warmup.warm_up({"ok": lambda: None, "broken": broken})
+    assert timings["ok"][1] is None
+    assert timings["broken"][1] == "ValueError: bad file"
+    assert all(seconds >= 0 for seconds, _ in timings.values())
+
+
+def test_server_start_is_a_no_op_without_a_running_server(monkeypatch):
+    monkeypatch.setattr(dl, "_server_started", False)
+    assert dl.on_server_start(job=lambda: None) is None
+    assert dl._server_started is False
+
+
+def test_server_start_runs_the_job_once_per_process(monkeypatch):
+    from streamlit import runtime
+
+    monkeypatch.setattr(runtime, "exists", lambda: True)
+    monkeypatch.setattr(dl, "_server_started", False)
+    calls = []
+    done = threading.Event()
+
+    def job():
+        calls.append(1)
+        done.set()
+
+    thread = dl.on_server_start(job=job)
+    assert dl.on_server_start(job=job) is None
+    thread.join(5)
+    assert done.is_set() and calls == [1]
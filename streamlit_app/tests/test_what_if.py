@@ -0,0 +1,31 @@
+import numpy as np
+
+from recipes import shipment_line_matrix
+from what_if import baseline_sales, evaluate
+
+
+def _model():
+    # 2 items x 3 lines; one serving of item 0 uses 0.5 of line 0 and 1 of line 2
+    return {"months": ["May", "June"], "sales": np.array([[10.0, 20.0], [4.0, 0.0]]),
+            "sensitivity": np.array([[0.5, 0.0, 1.0], [0.0, 2.0, 0.0]]), "supply": np.array([20.0, 5.0, 100.0])}
+
+
+def test_baseline_is_one_month_or_the_average_month():
+    model = _model()
+    assert baseline_sales(model, "June").tolist() == [20.0, 0.0]
+    assert baseline_sales(model).tolist() == [15.0, 2.0]
+
+
+def test_scenario_is_scaled_sales_plus_extra_servings():
+    model = _model()
+    base, scenario, gap = evaluate(model, baseline_sales(model, "May"), scale=np.array([0.5, 0.0]), extra=np.array([0.0, 1.0]))
+    assert base.tolist() == [5.0, 8.0, 10.0]
+    assert scenario.tolist() == [7.5, 10.0, 15.0]
+    assert gap.tolist() == [12.5, -5.0, 85.0]
+    assert evaluate(model, baseline_sales(model, "May"))[1].tolist() == base.tolist()
+
+
+def test_shipment_lines_sum_their_ingredients():
+    lines, to_lines = shipment_line_matrix(["Peas(g)", "Carrot(g)", "Braised Pork(g)", "Egg(count)"])
+    assert lines == ["Egg", "Peas + Carrot"]
+    assert (np.array([[1.0, 2.0, 3.0, 4.0]]) @ to_lines).tolist() == [[4.0, 3.0]]
@@ -0,0 +1,86 @@
+# warmup.py — precompute every page dataset so the first visitor hits warm caches (started by data_loaders.on_server_start)
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import anomalies
+import data_loaders as dl
+import margins
+import recipes
+import safety_stock
+import stores
+import what_if
+
+
+def _warm_monthly_category_income():
+    for month, path in dl.discover_month_files().items():
+        dl.load_data1_for_month(path, month)
+        dl.load_data2_for_month(path, month)
+
+def _warm_optimization_by_item():
+    margins.load_margins()
+
+def _warm_forecasting():
+    dl.load_forecast_store(version=dl.data_version())
+    safety_stock.load_reorder_table(safety_stock.SERVICE_LEVEL)
+
+def _warm_shipment_dashboard():
+    recipes.load_usage_by_line(version=dl.data_version())
+
+def _warm_anomalies():
+    anomalies.load_anomalies(version=dl.data_version())
+
+def _warm_stores():
+    if len(stores.discover_stores()) > 1:
+        stores.load_store_aggregates(version=stores.stores_version())
+
+
+# Page -> loader call, using the exact arguments each page passes so the cache keys match
+WARM_UP_TASKS = {
+    "Ingredient_Insights": dl.load_ingredient_totals,
+    "Menu_Items_Trend": dl.load_monthly_sales,
+    "Monthly_Category_Income": _warm_monthly_category_income,
+    "Optimization_By_Item": _warm_optimization_by_item,
+    "Network": dl.build_network_html,
+    "Shipment_Dashboard": _warm_shipment_dashboard,
+    "Forecasting_Ingredient_Analysis": _warm_forecasting,
+    "What_If_Simulator": what_if.load_what_if_model,
+    "Stores (chain roll-up)": _warm_stores,
+    "Anomalies": _warm_anomalies,
+}
+
+
+def _timed(task):
+    start = time.perf_counter()
+    try:
+        task()
+        error = None
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    return time.perf_counter() - start, error
+
+def warm_up(tasks=None, max_workers=None):
+    """
+    Runs all page loaders concurrently and returns {page: (seconds, error or None)}.
+
+    Threads (not processes) are used on purpose: st.cache_data lives in this
+    process, so the loaders have to run here for the pages to see the results.
+    """
+    tasks = tasks or WARM_UP_TASKS
+    with ThreadPoolExecutor(max_workers=max_workers or len(tasks), thread_name_prefix="warmup") as pool:
+        futures = {page: pool.submit(_timed, task) for page, task in tasks.items()}
+        return {page: future.result() for page, future in futures.items()}
+
+def format_report(timings):
+    lines = [f"{'Page':<34}{'Seconds':>9}  Status"]
+    for page, (seconds, error) in timings.items():
+        lines.append(f"{page:<34}{seconds:>9.2f}  {error or 'ok'}")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    # Pre-deploy check: python warmup.py (from streamlit_app/)
+    start = time.perf_counter()
+    timings = warm_up()
+    print(format_report(timings))
+    print(f"Total wall time: {time.perf_counter() - start:.2f}s")
+    raise SystemExit(1 if any(error for _, error in timings.values()) else 0)
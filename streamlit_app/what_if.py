@@ -0,0 +1,52 @@
+# what_if.py — precomputed item -> shipment line sensitivities for the What-If simulator
+import numpy as np
+import streamlit as st
+
+from data_loaders import load_monthly_sales, load_shipments
+from recipes import load_recipe_matrix, match_items, shipment_line_matrix
+
+
+@st.cache_data
+def load_what_if_model():
+    """
+    Everything the simulator needs, computed once:
+      sensitivity  menu items x shipment lines, usage per serving (lbs/count)
+      sales        menu items x months, baseline sales counts
+      supply       monthly supply per shipment line
+    Ingredient demand is linear in item sales, so a scenario is one vector-matrix product.
+    """
+    sales = load_monthly_sales()
+    items, ingredients, recipe = load_recipe_matrix()
+    idx = match_items(tuple(sales.index), tuple(items))
+    per_item = np.where((idx >= 0)[:, None], recipe[np.maximum(idx, 0)], 0.0)
+
+    lines, to_lines = shipment_line_matrix(ingredients)
+    shipments = load_shipments()
+    shipments["Ingredient"] = shipments["Ingredient"].astype(str).str.strip()
+    supply = shipments.groupby("Ingredient")["Total monthly shipment"].sum().reindex(lines).fillna(0.0)
+    units = shipments.groupby("Ingredient")["Unit of shipment"].first().reindex(lines).fillna("")
+
+    return {
+        "items": list(sales.index),
+        "months": list(sales.columns),
+        "sales": sales.to_numpy(dtype=float),
+        "lines": lines,
+        "units": units.tolist(),
+        "sensitivity": per_item @ to_lines,
+        "supply": supply.to_numpy(dtype=float),
+    }
+
+def baseline_sales(model, month=None):
+    """Baseline sales vector: one month's counts, or the average month when month is None."""
+    if month is None:
+        return model["sales"].mean(axis=1)
+    return model["sales"][:, model["months"].index(month)]
+
+def evaluate(model, base, scale=None, extra=None):
+    """
+    Scenario demand per shipment line for base sales x (1 + scale) + extra servings.
+    Returns (baseline demand, scenario demand, supply - scenario demand).
+    """
+    scenario = base * (1.0 + (scale if scale is not None else 0.0)) + (extra if extra is not None else 0.0)
+    stacked = np.vstack([base, scenario]) @ model["sensitivity"]
+    return stacked[0], stacked[1], model["supply"] - stacked[1]